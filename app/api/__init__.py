@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 
 from .jobs.router import router as jobs_router
+from .metrics.router import router as metrics_router
+from .pacing.router import router as pacing_router
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(jobs_router)
+api_router.include_router(pacing_router)
@@ -1,9 +1,17 @@
+from functools import lru_cache
 from typing import Annotated
 
 from celery import Celery
 from fastapi import Depends
 
 from app.celery_app.celery_app import celery_app
+from app.core import load
+from app.services import (
+    CancelFlags,
+    CheckpointStore,
+    PacingController,
+    ProgressReporter,
+)
 
 
 def get_celery_app() -> Celery:
@@ -12,3 +20,43 @@ def get_celery_app() -> Celery:
 
 
 CeleryDep = Annotated[Celery, Depends(get_celery_app)]
+
+
+@lru_cache
+def get_checkpoint_store() -> CheckpointStore:
+    """Get task checkpoint store dependency"""
+    return CheckpointStore(load())
+
+
+CheckpointStoreDep = Annotated[CheckpointStore, Depends(get_checkpoint_store)]
+
+
+@lru_cache
+def get_pacing_controller() -> PacingController:
+    """Get adaptive pacing controller dependency"""
+    return PacingController(load())
+
+
+PacingControllerDep = Annotated[
+    PacingController, Depends(get_pacing_controller)
+]
+
+
+@lru_cache
+def get_cancel_flags() -> CancelFlags:
+    """Get task cancel flags dependency"""
+    return CancelFlags(load())
+
+
+CancelFlagsDep = Annotated[CancelFlags, Depends(get_cancel_flags)]
+
+
+@lru_cache
+def get_progress_reporter() -> ProgressReporter:
+    """Get task progress reporter dependency"""
+    return ProgressReporter(load())
+
+
+ProgressReporterDep = Annotated[
+    ProgressReporter, Depends(get_progress_reporter)
+]
@@ -15,3 +15,27 @@ class TaskAlreadyCancelledException(HTTPException):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Task {task_id} already cancelled or finished",
         )
+
+
+class CheckpointNotFoundException(HTTPException):
+    def __init__(self, task_id: str):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No checkpoint to resume task {task_id} from",
+        )
+
+
+class TaskStillRunningException(HTTPException):
+    def __init__(self, task_id: str):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Task {task_id} is still running",
+        )
+
+
+class ProgressEventsDisabledException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Progress events are disabled, poll the task status",
+        )
@@ -1,12 +1,33 @@
+import asyncio
+import json
+from typing import Annotated, Any, AsyncIterator
+
+from celery import Celery, states
 from celery.result import AsyncResult
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, BackgroundTasks, Header, Request
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
-from ...celery_app.tasks.parsing_tasks import process_job_application
-from ...custom_types import JobParserStage
+from ...celery_app.tasks.parsing_tasks import (
+    process_job_application,
+    resume_job_application,
+)
+from ...custom_types import JobParserStage, JobSearchStatus
 from ...models import EmailAuth, PhoneAuth
-from ..dependencies import CeleryDep
-from .exceptions import TaskNotFoundException
+from ...services import CancelFlags
+from ...utils.tracing import start_trace, trace_headers
+from ..dependencies import (
+    CancelFlagsDep,
+    CeleryDep,
+    CheckpointStoreDep,
+    ProgressReporterDep,
+)
+from .exceptions import (
+    CheckpointNotFoundException,
+    ProgressEventsDisabledException,
+    TaskNotFoundException,
+    TaskStillRunningException,
+)
 from .schemas import (
     ErrorResponse,
     JobCancelResponse,
@@ -55,12 +76,17 @@ async def submit_job_email(
     # Create credentials for Celery
     credentials = EmailAuth(email=data.email, password=data.password)
 
-    # Send task
-    task = process_job_application.delay(  # type:ignore
-        credentials=credentials.model_dump_json(),
-        search_query=data.search_query,
-        max_applications=data.max_applications,
-    )
+    # Send task, the worker continues the trace from its headers
+    with start_trace("submit", auth_type="email") as trace:
+        task = process_job_application.apply_async(  # type:ignore
+            kwargs={
+                "credentials": credentials.model_dump_json(),
+                "search_query": data.search_query,
+                "max_applications": data.max_applications,
+            },
+            headers=trace_headers(),
+        )
+        trace.set(task_id=task.id)
 
     logger.bind(task_id=task.id).info("Task sent to queue")
 
@@ -69,6 +95,7 @@ async def submit_job_email(
         check_status_url=str(
             request.url_for("get_job_status", task_id=task.id)
         ),
+        trace_id=trace.trace_id if trace.sampled else None,
     )
 
 
@@ -111,12 +138,17 @@ async def submit_job_phone(
         phone=data.phone, country=data.country, password=data.password
     )
 
-    # Send task
-    task = process_job_application.delay(  # type: ignore
-        credentials=credentials.model_dump_json(),
-        search_query=data.search_query,
-        max_applications=data.max_applications,
-    )
+    # Send task, the worker continues the trace from its headers
+    with start_trace("submit", auth_type="phone") as trace:
+        task = process_job_application.apply_async(  # type: ignore
+            kwargs={
+                "credentials": credentials.model_dump_json(),
+                "search_query": data.search_query,
+                "max_applications": data.max_applications,
+            },
+            headers=trace_headers(),
+        )
+        trace.set(task_id=task.id)
 
     logger.bind(task_id=task.id).info("Task sent to queue")
 
@@ -125,6 +157,7 @@ async def submit_job_phone(
         check_status_url=str(
             request.url_for("get_job_status", task_id=task.id)
         ),
+        trace_id=trace.trace_id if trace.sampled else None,
     )
 
 
@@ -143,14 +176,19 @@ async def get_job_status(task_id: str, celery: CeleryDep):
 
     **States:**
     - **PENDING**: Task in queue
-    - **PROGRESS**: Executing (contains progress, stage, applied, total)
+    - **PROGRESS**: Executing (contains progress, stage, applied, total,
+      processed, skipped)
     - **SUCCESS**: Completed successfully
     - **FAILURE**: Execution error
 
     **Returns:**
     - Current status and execution progress
     """
+    return _read_status(task_id, celery)
 
+
+def _read_status(task_id: str, celery: Celery) -> JobStatusResponse:
+    """Status of a task from the result backend, the lookup is blocking"""
     result = AsyncResult(task_id, app=celery)
 
     # Base response
@@ -166,12 +204,16 @@ async def get_job_status(task_id: str, celery: CeleryDep):
         response.stage = info.get("stage")
         response.applied = info.get("applied")
         response.total = info.get("total")
+        response.processed = info.get("processed")
+        response.skipped = info.get("skipped")
 
     elif result.state == "SUCCESS":
         response.result = result.result
         response.progress = result.result.get("progress")
         response.applied = result.result.get("applied")
         response.total = result.result.get("total")
+        response.processed = len(result.result.get("vacancies", []))
+        response.skipped = result.result.get("skipped")
         response.stage = JobParserStage.COMPLETE
 
     elif result.state == "FAILURE":
@@ -180,6 +222,98 @@ async def get_job_status(task_id: str, celery: CeleryDep):
     return response
 
 
+@router.get(
+    "/{task_id}/events",
+    response_class=StreamingResponse,
+    summary="Stream task progress",
+    responses={
+        200: {
+            "description": "Server-sent events of the task progress",
+            "content": {"text/event-stream": {}},
+        },
+        404: {"model": ErrorResponse, "description": "Task not found"},
+        503: {"model": ErrorResponse, "description": "Events disabled"},
+    },
+)
+async def stream_job_events(
+    task_id: str,
+    celery: CeleryDep,
+    progress: ProgressReporterDep,
+    last_event_id: Annotated[int, Header()] = 0,
+):
+    """
+    Streams the progress of the task as server-sent events.
+
+    **Events:**
+    - **progress**: Fields changed since the previous event (progress,
+      stage, applied, total, processed, skipped) and the outcomes of the
+      vacancies processed in between
+    - **done**: Final status, applied and total counts and message, the
+      stream ends after it
+
+    Each event has the ID of its sequence number. A reconnecting client
+    sending it in Last-Event-ID gets the events it missed replayed.
+
+    The backend reports an unknown task as pending forever, so a pending
+    task is not found, clients poll the status of a queued task until it
+    starts.
+    """
+    if not progress.publishes:
+        raise ProgressEventsDisabledException()
+
+    # The result backend client is blocking, keep it off the loop
+    status = await asyncio.to_thread(_read_status, task_id, celery)
+    if status.state == states.PENDING:
+        raise TaskNotFoundException(task_id)
+
+    async def stream() -> AsyncIterator[str]:
+        if status.state in states.READY_STATES:
+            yield _sse_event(_final_event(status))
+            return
+
+        # A finished task ends the stream with its published done event
+        async for delta in progress.events(task_id, last_event_id):
+            if delta is not None:
+                yield _sse_event(delta)
+                continue
+
+            # A terminated or crashed task publishes no final event, the
+            # backend is only checked when no delta came for a keepalive
+            latest = await asyncio.to_thread(_read_status, task_id, celery)
+            if latest.state in states.READY_STATES:
+                yield _sse_event(_final_event(latest))
+                return
+            yield ": keepalive\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _final_event(status: JobStatusResponse) -> dict[str, Any]:
+    """Final event of a task from its stored state"""
+    result = status.result or {}
+    return {
+        "done": True,
+        "status": result.get("status", JobSearchStatus.ERROR),
+        "applied": status.applied,
+        "total": status.total,
+        "message": result.get("message")
+        or status.error
+        or f"Task {status.state.lower()}",
+    }
+
+
+def _sse_event(delta: dict[str, Any]) -> str:
+    event = "done" if delta.get("done") else "progress"
+    lines = [f"event: {event}", f"data: {json.dumps(delta, default=str)}"]
+    if "seq" in delta:
+        lines.insert(0, f"id: {delta['seq']}")
+    return "\n".join(lines) + "\n\n"
+
+
 @router.post(
     "/{task_id}/cancel",
     response_model=JobCancelResponse,
@@ -189,14 +323,21 @@ async def get_job_status(task_id: str, celery: CeleryDep):
         404: {"model": ErrorResponse, "description": "Task not found"},
     },
 )
-async def cancel_job(task_id: str, celery: CeleryDep):
+async def cancel_job(
+    task_id: str,
+    celery: CeleryDep,
+    cancel_flags: CancelFlagsDep,
+    background_tasks: BackgroundTasks,
+):
     """
     Cancels task execution.
 
-    **Warning:**
-    - If the task is already running, it will be forcibly stopped (SIGKILL)
-    - Browser will be closed
-    - Partial results will be lost
+    **Behavior:**
+    - A queued task is dropped before it starts
+    - A running task stops within a second and keeps its partial
+      results, the worker and its browser keep running
+    - A task that does not stop within the grace period is terminated,
+      it returns the partial results of its last checkpoint
 
     **Returns:**
     - Cancellation confirmation
@@ -217,9 +358,104 @@ async def cancel_job(task_id: str, celery: CeleryDep):
             task_id=task_id, message="Already finished", status="finished"
         )
 
+    # Workers skip a revoked task that has not started yet
+    celery.control.revoke(task_id)
+
+    if await cancel_flags.request(task_id):
+        background_tasks.add_task(
+            _terminate_if_running, celery, cancel_flags, task_id
+        )
+        logger.bind(task_id=task_id).warning("Task cancel requested")
+        return JobCancelResponse(
+            task_id=task_id,
+            status="cancelling",
+            message="Task is stopping, partial results are kept",
+        )
+
     # Cancel task
     celery.control.revoke(task_id, terminate=True)
 
     logger.bind(task_id=task_id).warning("Task cancelled")
 
     return JobCancelResponse(task_id=task_id)
+
+
+async def _terminate_if_running(
+    celery: Celery, cancel_flags: CancelFlags, task_id: str
+) -> None:
+    """Terminate a cancelled task that did not stop within the grace period.
+
+    revoke(terminate=True) signals the pool process, which the threads
+    pool does not have and which runs other tasks there. The cancel flag
+    is set to terminate instead, the worker then cancels the asyncio task
+    of the task wherever it waits.
+    """
+    grace_period = cancel_flags.grace_period
+    await asyncio.sleep(grace_period)
+
+    # The result backend client is blocking, keep it off the loop
+    state = await asyncio.to_thread(
+        lambda: AsyncResult(task_id, app=celery).state
+    )
+    if state not in ("STARTED", "PROGRESS"):
+        return
+    await cancel_flags.request(task_id, terminate=True)
+    logger.bind(task_id=task_id, grace_period=grace_period).warning(
+        "Task did not stop in time, terminating it"
+    )
+
+
+@router.post(
+    "/{task_id}/resume",
+    response_model=JobSubmitResponse,
+    status_code=201,
+    summary="Resume interrupted task",
+    responses={
+        201: {"description": "Resume task successfully submitted"},
+        404: {"model": ErrorResponse, "description": "No checkpoint"},
+        409: {"model": ErrorResponse, "description": "Task is running"},
+    },
+)
+async def resume_job(
+    task_id: str,
+    request: Request,
+    celery: CeleryDep,
+    checkpoints: CheckpointStoreDep,
+):
+    """
+    Resumes a task that ended with a captcha, an error or was interrupted.
+
+    The new task continues from the last checkpoint of the given task:
+    - The saved search results are opened without a new search
+    - Collected vacancies that were not processed are applied to first
+    - Processed vacancies are kept in the result and not repeated
+
+    **Returns:**
+    - task_id of the new task for tracking progress
+    - URL for checking status
+    """
+
+    result = AsyncResult(task_id, app=celery)
+    if result.state in ("STARTED", "PROGRESS"):
+        raise TaskStillRunningException(task_id)
+
+    if not await checkpoints.exists(task_id):
+        raise CheckpointNotFoundException(task_id)
+
+    with start_trace("resume", checkpoint_id=task_id) as trace:
+        task = resume_job_application.apply_async(  # type: ignore
+            kwargs={"checkpoint_id": task_id}, headers=trace_headers()
+        )
+        trace.set(task_id=task.id)
+
+    logger.bind(task_id=task.id, checkpoint_id=task_id).info(
+        "Resume task sent to queue"
+    )
+
+    return JobSubmitResponse(
+        task_id=task.id,
+        check_status_url=str(
+            request.url_for("get_job_status", task_id=task.id)
+        ),
+        trace_id=trace.trace_id if trace.sampled else None,
+    )
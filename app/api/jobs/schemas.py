@@ -24,6 +24,7 @@ class JobSubmitResponse(BaseModel):
     task_id: str
     status: Literal["submitted"] = "submitted"
     check_status_url: str
+    trace_id: str | None = None
 
     class Config:
         json_schema_extra = {
@@ -42,6 +43,8 @@ class JobStatusResponse(BaseModel):
     stage: JobParserStage | None = None
     applied: int | None = None
     total: int | None = None
+    processed: int | None = None
+    skipped: int | None = None
     error: str | None = None
     result: dict | None = None
 
@@ -54,13 +57,14 @@ class JobStatusResponse(BaseModel):
                 "stage": "apply",
                 "applied": 91,
                 "total": 200,
+                "processed": 120,
             }
         }
 
 
 class JobCancelResponse(BaseModel):
     task_id: str
-    status: Literal["cancelled", "finished"] = "cancelled"
+    status: Literal["cancelled", "cancelling", "finished"] = "cancelled"
     message: str = "Task cancelled"
 
     class Config:
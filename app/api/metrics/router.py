@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from ...utils.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", summary="Prometheus metrics")
+async def get_metrics():
+    """
+    Exposes the metrics in the Prometheus text format.
+
+    With PROMETHEUS_MULTIPROC_DIR set the metrics of all processes
+    writing to that directory are merged, including Celery workers
+    on the same host.
+    """
+
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,33 @@
+from fastapi import APIRouter
+
+from ..dependencies import PacingControllerDep
+from .schemas import PacingStatusResponse
+
+router = APIRouter(prefix="/pacing", tags=["pacing"])
+
+
+@router.get(
+    "",
+    response_model=PacingStatusResponse,
+    summary="Get adaptive pacing state",
+    responses={200: {"description": "Pacing state of accounts and IPs"}},
+)
+async def get_pacing(controller: PacingControllerDep):
+    """
+    Shows the delays between applications the pacing controller learned.
+
+    Each account and egress IP has its own state:
+    - **delay**: Current delay between applications (in seconds)
+    - **requests_per_minute**: Throughput the delay sustains
+    - **successes**, **captchas**, **timeouts**, **errors**: Outcomes in
+      the sliding window the controller adapts on
+    - **mean_latency**: Mean duration of successful applications
+
+    **Returns:**
+    - States of all accounts and IPs seen recently
+    """
+
+    if not controller.enabled:
+        return PacingStatusResponse(enabled=False)
+
+    return PacingStatusResponse(enabled=True, states=await controller.states())
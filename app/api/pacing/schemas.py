@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+
+from ...models import PacingState
+
+
+class PacingStatusResponse(BaseModel):
+    enabled: bool
+    states: list[PacingState] = []
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "enabled": True,
+                "states": [
+                    {
+                        "scope": "egress",
+                        "key": "worker-1",
+                        "delay": 2.4,
+                        "successes": 48,
+                        "captchas": 1,
+                        "timeouts": 1,
+                        "errors": 0,
+                        "mean_latency": 3.12,
+                        "updated_at": 1760000000.0,
+                        "requests_per_minute": 25.0,
+                    }
+                ],
+            }
+        }
@@ -1,13 +1,24 @@
 import asyncio
+import os
 
 from celery import Celery
 from celery.signals import (
+    worker_init,
     worker_process_init,
     worker_process_shutdown,
+    worker_ready,
+    worker_shutdown,
 )
 from loguru import logger
 
 from ..core import load
+from ..utils.metrics import (
+    MULTIPROC_DIR,
+    clear_multiprocess_dir,
+    mark_process_dead,
+    start_exporter,
+)
+from .supervisor import SLOT_ENV, MemoryGuard
 from .worker_context import WorkerContext
 
 config = load()
@@ -22,6 +33,81 @@ celery_app = Celery(
 
 celery_app.config_from_object("app.celery_app.celery_config:CeleryConfig")
 
+memory_guard: MemoryGuard | None = None
+
+
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    """Serve the metrics of all worker processes from the main one"""
+    # The supervisor serves the metrics of all supervised workers
+    if not config.metrics.enabled or SLOT_ENV in os.environ:
+        return
+    if not MULTIPROC_DIR:
+        logger.warning(
+            "PROMETHEUS_MULTIPROC_DIR is not set, "
+            "metrics of the pool processes are not exported"
+        )
+    clear_multiprocess_dir()
+    start_exporter(config.metrics.worker_port)
+    logger.bind(port=config.metrics.worker_port).info(
+        "Metrics exporter started"
+    )
+
+
+@worker_init.connect
+def init_concurrent_worker(sender=None, **kwargs):
+    """Start the shared event loop and browser of the threads pool"""
+    if not _uses_threads(sender):
+        return
+    WorkerContext.start_concurrent()
+    logger.bind(max_tasks=config.worker.max_tasks).info(
+        "Worker runs tasks concurrently on one event loop"
+    )
+    if config.worker.max_tasks < (sender.concurrency or 1):
+        logger.bind(
+            concurrency=sender.concurrency,
+            max_tasks=config.worker.max_tasks,
+        ).warning("Tasks over the limit wait in their pool threads")
+
+
+@worker_ready.connect
+def start_memory_guard(**kwargs):
+    """Watch the browser memory of a worker run by the supervisor"""
+    global memory_guard
+    slot = os.environ.get(SLOT_ENV)
+    if slot is None:
+        return
+    memory_guard = MemoryGuard(config.worker, slot)
+    memory_guard.start()
+    logger.bind(
+        slot=slot, budget_mb=config.worker.browser_memory_mb
+    ).info("Browser memory guard started")
+
+
+@worker_shutdown.connect
+def stop_memory_guard(**kwargs):
+    """Stop the memory guard and drop the gauges of the worker"""
+    if memory_guard:
+        memory_guard.stop()
+        mark_process_dead()
+
+
+@worker_shutdown.connect
+def shutdown_concurrent_worker(**kwargs):
+    """Close the browser and stop the event loop of the threads pool"""
+    context = WorkerContext._instance
+    if context and context.loop:
+        try:
+            context.stop_concurrent()
+        except Exception as e:
+            logger.error(f"Error during worker shutdown: {e}")
+
+
+def _uses_threads(worker) -> bool:
+    pool = getattr(worker, "pool_cls", None)
+    name = pool if isinstance(pool, str) else getattr(pool, "__module__", "")
+    return "thread" in str(name)
+
 
 @worker_process_init.connect
 def init_worker(**kwargs):
@@ -35,6 +121,7 @@ def init_worker(**kwargs):
 @worker_process_shutdown.connect
 def shutdown_worker(**kwargs):
     """Called once at the end of each worker process"""
+    mark_process_dead()
     context = WorkerContext._instance
     if context:
         try:
@@ -36,6 +36,10 @@ class CeleryConfig:
             "queue": "hh_parsing_queue",
             "routing_key": "parsing",
         },
+        "resume_job_application": {
+            "queue": "hh_parsing_queue",
+            "routing_key": "parsing",
+        },
     }
 
     # Task Execution
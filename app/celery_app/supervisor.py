@@ -0,0 +1,220 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import psutil
+from loguru import logger
+
+from ..core import Config, Worker, load
+from ..utils.metrics import (
+    BROWSER_RSS,
+    clear_multiprocess_dir,
+    start_exporter,
+)
+from ..utils.processes import browser_rss
+
+# Environment variable with the slot of a supervised worker
+SLOT_ENV = "HH_WORKER_SLOT"
+
+_MB = 1024 * 1024
+
+
+def plan_slots(settings: Worker) -> list[list[int]]:
+    """Work out how many browser-owning workers the host can hold.
+
+    The memory available now, less the reserved part, is divided by the
+    RSS budget of one worker, and the count is capped by the CPUs this
+    process may run on and by max_processes.
+
+    Args:
+        settings (Worker): The worker configuration.
+    Returns:
+        list[list[int]]: CPUs of each worker slot.
+    """
+    cpus = _allowed_cpus()
+    usable = psutil.virtual_memory().available - (
+        settings.reserved_memory_mb * _MB
+    )
+    count = min(
+        usable // (settings.browser_memory_mb * _MB),
+        len(cpus),
+        settings.max_processes or len(cpus),
+    )
+    count = max(1, int(count))
+
+    size, extra = divmod(len(cpus), count)
+    slots: list[list[int]] = []
+    start = 0
+    for slot in range(count):
+        end = start + size + (1 if slot < extra else 0)
+        slots.append(cpus[start:end])
+        start = end
+    return slots
+
+
+class MemoryGuard:
+    """Stops a supervised worker whose browser goes over its RSS budget.
+
+    The worker gets SIGTERM, so it stops taking tasks, finishes the
+    running ones and exits, and the supervisor starts a fresh one in
+    its slot.
+    """
+
+    def __init__(self, settings: Worker, slot: str) -> None:
+        self._settings = settings
+        self._slot = slot
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Check the browser RSS periodically in a thread."""
+        threading.Thread(
+            target=self._run, name="memory-guard", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        budget = self._settings.browser_memory_mb * _MB
+        pid = os.getpid()
+        while not self._stopped.wait(self._settings.memory_check_interval):
+            try:
+                rss = browser_rss(pid)
+            except psutil.Error as exc:
+                logger.warning(f"Failed to measure browser memory: {exc}")
+                continue
+
+            BROWSER_RSS.labels(slot=self._slot).set(rss)
+            if rss > budget:
+                logger.bind(
+                    slot=self._slot,
+                    rss_mb=rss // _MB,
+                    budget_mb=self._settings.browser_memory_mb,
+                ).warning("Browser is over its memory budget, stopping")
+                os.kill(pid, signal.SIGTERM)
+                return
+
+
+class Supervisor:
+    """Runs one Celery worker per slot, each pinned to its CPUs.
+
+    A worker that exits is restarted in its slot. SIGTERM or SIGINT is
+    passed to the workers as a warm shutdown and the supervisor exits
+    once they have finished their tasks.
+    """
+
+    def __init__(self, config: Config, celery_args: list[str]) -> None:
+        self._config = config
+        self._settings = config.worker
+        self._celery_args = celery_args
+        self._stopping = threading.Event()
+        self._workers: dict[int, subprocess.Popen] = {}
+
+    def run(self) -> int:
+        """Start the workers and keep them running until stopped.
+        Returns:
+            int: Exit code of the supervisor.
+        """
+        slots = plan_slots(self._settings)
+        logger.bind(
+            workers=len(slots),
+            cpus=slots,
+            budget_mb=self._settings.browser_memory_mb,
+        ).info("Starting supervised workers")
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        # Workers do not serve metrics themselves when supervised
+        if self._config.metrics.enabled:
+            clear_multiprocess_dir()
+            start_exporter(self._config.metrics.worker_port)
+
+        for slot, cpus in enumerate(slots):
+            self._workers[slot] = self._spawn(slot, cpus)
+
+        restart_at: dict[int, float] = {}
+        while not self._stopping.wait(1):
+            for slot, process in self._workers.items():
+                if process.poll() is None:
+                    continue
+                if slot not in restart_at:
+                    logger.bind(slot=slot, code=process.returncode).warning(
+                        "Worker exited, restarting"
+                    )
+                    restart_at[slot] = (
+                        time.monotonic() + self._settings.restart_delay
+                    )
+                elif time.monotonic() >= restart_at[slot]:
+                    del restart_at[slot]
+                    self._workers[slot] = self._spawn(slot, slots[slot])
+
+        logger.info("Stopping supervised workers...")
+        for process in self._workers.values():
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+        for process in self._workers.values():
+            process.wait()
+        logger.success("Supervised workers stopped")
+        return 0
+
+    def _spawn(self, slot: int, cpus: list[int]) -> subprocess.Popen:
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "celery",
+                "-A",
+                "app.celery_app.celery_app",
+                "worker",
+                f"--hostname=slot{slot}@%h",
+                "--concurrency=1",
+                *self._celery_args,
+            ],
+            env={**os.environ, SLOT_ENV: str(slot)},
+        )
+        # The pool process and its browser inherit the affinity
+        try:
+            psutil.Process(process.pid).cpu_affinity(cpus)
+        except (AttributeError, psutil.Error) as exc:
+            logger.warning(f"Failed to pin worker {slot} to CPUs: {exc}")
+        logger.bind(slot=slot, pid=process.pid, cpus=cpus).info(
+            "Worker started"
+        )
+        return process
+
+    def _stop(self, signum, frame) -> None:
+        self._stopping.set()
+
+
+def _allowed_cpus() -> list[int]:
+    try:
+        return sorted(psutil.Process().cpu_affinity())
+    except (AttributeError, psutil.Error):
+        return list(range(psutil.cpu_count() or 1))
+
+
+def _main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run Celery workers sized by the browser memory budget, "
+        "other arguments are passed to each worker"
+    )
+    parser.add_argument(
+        "--plan", action="store_true", help="Print the slots and exit"
+    )
+    args, celery_args = parser.parse_known_args()
+
+    config = load()
+    if args.plan:
+        for slot, cpus in enumerate(plan_slots(config.worker)):
+            print(f"slot{slot}: CPUs {cpus}")
+        return
+    sys.exit(Supervisor(config, celery_args).run())
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,3 +1,3 @@
-from .parsing_tasks import process_job_application
+from .parsing_tasks import process_job_application, resume_job_application
 
-__all__ = ["process_job_application"]
+__all__ = ["process_job_application", "resume_job_application"]
@@ -1,14 +1,25 @@
 import asyncio
+from contextlib import nullcontext
+from typing import Callable, Coroutine
 
 from celery import Task
 from loguru import logger
 from pydantic import TypeAdapter
 
-from ...custom_types import JobParserStage
-from ...models import AuthCredentials, JobSearchResult
+from ...custom_types import JobParserStage, JobSearchStatus
+from ...exceptions import BrowserStalledError
+from ...models import AuthCredentials, JobCheckpoint, JobSearchResult
 from ...services import process_job_search
+from ...services.cancellation import TaskCancellation
+from ...services.capture import TaskCapture
+from ...utils.tracing import (
+    SENT_AT_HEADER,
+    TRACEPARENT_HEADER,
+    record_span,
+    start_trace,
+)
 from ..celery_app import celery_app
-from ..worker_context import get_worker_context
+from ..worker_context import WorkerContext, get_worker_context
 
 
 class CallbackTask(Task):
@@ -33,60 +44,235 @@ def process_job_application(
         search_query: Search query
         max_applications: Maximum applications
     """
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(
-        _process_async(self, credentials, search_query, max_applications)
+    # Parse credentials from JSON str
+    adapter = TypeAdapter(AuthCredentials)
+    checkpoint = JobCheckpoint(
+        task_id=self.request.id,
+        credentials=adapter.validate_json(credentials),
+        search_query=search_query,
+        max_applications=max_applications,
     )
 
+    return _run_traced(self, _process_async(self, checkpoint))
 
-async def _process_async(
-    task,
-    credentials: str,
-    search_query: str,
-    max_applications: int,
+
+@celery_app.task(
+    bind=True, base=CallbackTask, name="resume_job_application", pydantic=True
+)
+def resume_job_application(self, checkpoint_id: str) -> JobSearchResult:
+    """
+    Celery task resuming an interrupted application task from its checkpoint
+
+    Args:
+        checkpoint_id: ID of the task that saved the checkpoint
+    """
+    return _run_traced(
+        self, _resume_async(self, self.request.id, checkpoint_id)
+    )
+
+
+def _run_traced(task, coroutine: Coroutine) -> JobSearchResult:
+    """Run the task coroutine in the trace started by the API"""
+    headers = task.request.headers or {}
+    traceparent = task.request.get(TRACEPARENT_HEADER) or headers.get(
+        TRACEPARENT_HEADER
+    )
+    sent_at = task.request.get(SENT_AT_HEADER) or headers.get(SENT_AT_HEADER)
+
+    with start_trace(
+        "task", traceparent, task_id=task.request.id, task_name=task.name
+    ) as root:
+        if sent_at:
+            record_span("queue wait", float(sent_at), root.start)
+        with logger.contextualize(trace_id=root.trace_id):
+            result = get_worker_context().run(coroutine)
+        root.set(status=result.status, applied=result.applied)
+        return result
+
+
+async def _resume_async(
+    task, task_id: str, checkpoint_id: str
 ) -> JobSearchResult:
-    """Asynchronous task processing"""
+    """Load a checkpoint and continue it under the current task ID"""
+    context = get_worker_context()
+    store = context.checkpoint_store
+    checkpoint = await store.load(checkpoint_id) if store else None
+    if checkpoint is None:
+        return JobSearchResult(
+            status=JobSearchStatus.ERROR,
+            applied=0,
+            message=f"No checkpoint found for task {checkpoint_id}",
+        )
 
-    # Parse credentials from JSON str
-    adapter = TypeAdapter(AuthCredentials)
-    creds = adapter.validate_json(credentials)
+    logger.bind(
+        checkpoint_id=checkpoint_id,
+        stage=checkpoint.stage,
+        processed=len(checkpoint.vacancies),
+    ).info("Resuming task from checkpoint")
+
+    # Move the checkpoint to this task before the old one is dropped
+    checkpoint.task_id = task_id
+    if store and await store.save(checkpoint):
+        await store.delete(checkpoint_id)
+
+    return await _process_async(task, checkpoint)
+
+
+async def _process_async(task, checkpoint: JobCheckpoint) -> JobSearchResult:
+    """Asynchronous task processing
+
+    The coroutine may run on the event loop shared by concurrent tasks,
+    where task.request is not the request of this task, so its ID is
+    taken from the checkpoint.
+    """
+    task_id = checkpoint.task_id
 
     # Get context
     context = get_worker_context()
 
-    # Callback for updating progress
-    def progress_callback(
-        stage: JobParserStage, progress: float, **kwargs
-    ) -> None:
-        task.update_state(
-            state="PROGRESS",
-            meta={"stage": stage, "progress": progress, **kwargs},
+    # Playwright trace and HAR of this task, if it is captured
+    capture = (
+        context.capture_recorder.begin(task_id)
+        if context.capture_recorder
+        else None
+    )
+
+    if not context.progress_reporter:
+        raise RuntimeError("Worker progress reporter is not initialized")
+
+    # Progress is coalesced and written off the task by the reporter
+    async with context.progress_reporter.report(task, task_id) as progress:
+
+        def progress_callback(
+            stage: JobParserStage, progress_value: float, **kwargs
+        ) -> None:
+            if capture:
+                capture.stage(stage)
+            progress.update(stage, progress_value, **kwargs)
+
+        result = await _run_in_browser(
+            context, checkpoint, capture, progress_callback
+        )
+        progress.finish(
+            status=result.status,
+            applied=result.applied,
+            total=result.total,
+            message=result.message,
         )
 
+    logger.bind(
+        result_applied=result.applied,
+        result_total=result.total,
+        result_status=result.status,
+        artifacts=result.artifacts,
+    ).success("Celery HHJob Completed")
+
+    return result
+
+
+async def _run_in_browser(
+    context: WorkerContext,
+    checkpoint: JobCheckpoint,
+    capture: TaskCapture | None,
+    progress_callback: Callable,
+) -> JobSearchResult:
+    """Run the job search in a browser context of the worker"""
+    task_id = checkpoint.task_id
+    creds = checkpoint.credentials
+    search_query = checkpoint.search_query
+    max_applications = checkpoint.max_applications
+
     # Create browser context for this task
     if not context.browser_manager:
         raise RuntimeError("Worker browser is not initialized")
-    async with context.browser_manager.context() as page:
-        logger.bind(
-            search_query=search_query, max_applications=max_applications
-        ).info("Celery HHJob starting processing")
-
-        # Launch main workflow
-        if not context.config:
-            raise RuntimeError("Worker config is not initialized")
-        result = await process_job_search(
-            page=page,
-            config=context.config,
-            credentials=creds,
-            search_query=search_query,
-            max_applications=max_applications,
-            progress_callback=progress_callback,
-        )
+    if not context.config:
+        raise RuntimeError("Worker config is not initialized")
 
-        logger.bind(
-            result_applied=result.applied,
-            result_total=result.total,
-            result_status=result.status,
-        ).success("Celery HHJob Completed")
+    # Restore a saved login session of this account, if any
+    storage_state = (
+        await context.session_cache.load(creds)
+        if context.session_cache
+        else None
+    )
 
-        return result
+    # Rate limits and pacing follow the egress the context uses
+    proxy_server = context.config.network.proxy_server
+    proxy = {"server": proxy_server} if proxy_server else None
+
+    # The flag is watched for the whole run, so a terminated task stops
+    # even while it opens or closes its context
+    cancellation: TaskCancellation | None = None
+    cancel_watch = (
+        context.cancel_flags.watch(task_id)
+        if context.cancel_flags
+        else nullcontext()
+    )
+    try:
+        async with (
+            cancel_watch as cancellation,
+            context.browser_manager.context(
+                proxy=proxy, storage_state=storage_state, capture=capture
+            ) as page,
+        ):
+            logger.bind(
+                search_query=search_query, max_applications=max_applications
+            ).info("Celery HHJob starting processing")
+
+            # Launch main workflow
+            result = await process_job_search(
+                page=page,
+                config=context.config,
+                credentials=creds,
+                search_query=search_query,
+                max_applications=max_applications,
+                progress_callback=progress_callback,
+                session_cache=context.session_cache,
+                applied_index=context.applied_index,
+                serp_cache=context.serp_cache,
+                checkpoint=checkpoint,
+                checkpoint_store=context.checkpoint_store,
+                rate_governor=context.rate_governor,
+                pacing_controller=context.pacing_controller,
+                cancellation=cancellation,
+                proxy=proxy,
+            )
+
+            # The watchdog closed the context of a hung browser call
+            if context.browser_manager.stalled(page):
+                result.status = JobSearchStatus.STALLED
+                result.message = (
+                    "Browser stopped responding, the task was aborted"
+                )
+
+            # Do not hand a context that hit a captcha or an error to next task
+            if result.status in (
+                JobSearchStatus.CAPTCHA_REQUIRED,
+                JobSearchStatus.ERROR,
+                JobSearchStatus.STALLED,
+            ):
+                context.browser_manager.mark_failed(page)
+                if capture:
+                    capture.fail(result.status)
+    except BrowserStalledError as exc:
+        # The watchdog cancelled a task whose context did not close, its
+        # progress was saved to the checkpoint when it was cancelled
+        store = context.checkpoint_store
+        result = checkpoint.partial_result(JobSearchStatus.STALLED, str(exc))
+        result.resumable = bool(store and await store.exists(task_id))
+    except asyncio.CancelledError:
+        if not (cancellation and cancellation.terminated):
+            raise
+        # Terminated after the grace period outside of the workflow
+        task = asyncio.current_task()
+        if task:
+            task.uncancel()
+        store = context.checkpoint_store
+        result = checkpoint.partial_result(
+            JobSearchStatus.CANCELLED, "Task did not stop in time"
+        )
+        result.resumable = bool(store and await store.exists(task_id))
+
+    # Artifacts are complete once the context is closed
+    if capture:
+        result.artifacts = capture.artifacts
+    return result
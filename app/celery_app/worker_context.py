@@ -1,9 +1,25 @@
-from typing import Optional
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
 
 from loguru import logger
 
 from ..core import Config, load
-from ..services import BrowserManager
+from ..utils.tracing import configure_tracing
+from ..services import (
+    AppliedIndex,
+    BrowserManager,
+    CancelFlags,
+    CaptureRecorder,
+    CheckpointStore,
+    PacingController,
+    ProgressReporter,
+    RateGovernor,
+    SerpCache,
+    SessionCache,
+)
+
+T = TypeVar("T")
 
 
 class WorkerContext:
@@ -14,6 +30,20 @@ class WorkerContext:
     def __init__(self) -> None:
         self.browser_manager: BrowserManager | None = None
         self.config: Config | None = None
+        self.session_cache: SessionCache | None = None
+        self.applied_index: AppliedIndex | None = None
+        self.serp_cache: SerpCache | None = None
+        self.checkpoint_store: CheckpointStore | None = None
+        self.rate_governor: RateGovernor | None = None
+        self.pacing_controller: PacingController | None = None
+        self.capture_recorder: CaptureRecorder | None = None
+        self.cancel_flags: CancelFlags | None = None
+        self.progress_reporter: ProgressReporter | None = None
+
+        # Long-lived event loop shared by the tasks of the threads pool
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._slots: asyncio.Semaphore | None = None
 
     @classmethod
     async def init(cls) -> "WorkerContext":
@@ -22,13 +52,105 @@ class WorkerContext:
             await cls._instance._setup()
         return cls._instance
 
+    @classmethod
+    def start_concurrent(cls) -> "WorkerContext":
+        """Set up the context on an event loop running in its own thread.
+
+        Tasks of the threads pool hand their coroutines to this loop with
+        run(), so they share the browser and run concurrently up to the
+        worker.max_tasks limit.
+
+        Returns:
+            WorkerContext: The context.
+        """
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name="worker-loop", daemon=True
+        )
+        thread.start()
+        try:
+            context = asyncio.run_coroutine_threadsafe(
+                cls.init(), loop
+            ).result()
+        except BaseException:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            raise
+        context.loop = loop
+        context._loop_thread = thread
+
+        config = context.config
+        if config and config.pool.enabled:
+            if config.pool.size < config.worker.max_tasks:
+                logger.bind(
+                    pool_size=config.pool.size,
+                    max_tasks=config.worker.max_tasks,
+                ).warning("Context pool is smaller than the task limit")
+        return context
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run a task coroutine to completion.
+
+        With the shared event loop the calling thread is blocked until the
+        coroutine, started on the loop, finishes. A task crashing only
+        fails its own future.
+
+        Args:
+            coroutine (Coroutine): The task coroutine.
+        Returns:
+            T: The result of the coroutine.
+        """
+        if self.loop is None:
+            return asyncio.get_event_loop().run_until_complete(coroutine)
+        return asyncio.run_coroutine_threadsafe(
+            self._limited(coroutine), self.loop
+        ).result()
+
+    def stop_concurrent(self) -> None:
+        """Clean up the context and stop the shared event loop."""
+        loop, thread = self.loop, self._loop_thread
+        if loop is None or thread is None:
+            return
+        timeout = self.config.worker.shutdown_timeout if self.config else None
+        try:
+            asyncio.run_coroutine_threadsafe(self.cleanup(), loop).result(
+                timeout
+            )
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not loop.is_running():
+                loop.close()
+            self.loop = None
+            self._loop_thread = None
+
+    async def _limited(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        if self._slots is None:
+            return await coroutine
+        async with self._slots:
+            return await coroutine
+
     async def _setup(self):
         try:
             self.config = load()
             logger.info("Config successfully loaded")
+            configure_tracing(self.config.tracing)
+            self._slots = asyncio.Semaphore(self.config.worker.max_tasks)
+
+            self.session_cache = SessionCache(self.config)
+            self.applied_index = AppliedIndex(self.config)
+            self.serp_cache = SerpCache(self.config)
+            self.checkpoint_store = CheckpointStore(self.config)
+            self.rate_governor = RateGovernor(self.config)
+            self.pacing_controller = PacingController(self.config)
+            self.capture_recorder = CaptureRecorder(self.config)
+            self.cancel_flags = CancelFlags(self.config)
+            self.progress_reporter = ProgressReporter(self.config)
 
             self.browser_manager = BrowserManager(self.config)
             await self.browser_manager.start()
+            await self.browser_manager.fill_pool()
 
             logger.success("WorkerContext successfully loaded")
 
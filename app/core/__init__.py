@@ -1,6 +1,29 @@
 from .config import Config, load
 from .env import EnvironmentSettings
-from .settings import Logs, Network, Parsing, Retries, Selectors, Timeouts
+from .settings import (
+    Blocking,
+    Cancellation,
+    Capture,
+    Checkpoints,
+    BlockingProfile,
+    Filters,
+    History,
+    Logs,
+    Metrics,
+    Network,
+    Pacing,
+    Parsing,
+    Pool,
+    Progress,
+    Retries,
+    SearchCache,
+    Selectors,
+    Sessions,
+    Timeouts,
+    Tracing,
+    Watchdog,
+    Worker,
+)
 
 __all__ = [
     "Config",
@@ -11,5 +34,21 @@ __all__ = [
     "Timeouts",
     "Retries",
     "Network",
+    "Pacing",
     "Parsing",
+    "Sessions",
+    "History",
+    "Filters",
+    "SearchCache",
+    "Checkpoints",
+    "Cancellation",
+    "Progress",
+    "Worker",
+    "Pool",
+    "Watchdog",
+    "Metrics",
+    "Tracing",
+    "Capture",
+    "Blocking",
+    "BlockingProfile",
 ]
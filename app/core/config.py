@@ -7,7 +7,29 @@ from pydantic_settings import (
 
 from .env import EnvironmentSettings
 from .logging_settings import LoggerSettings
-from .settings import Logs, Network, Parsing, Retries, Selectors, Timeouts
+from .settings import (
+    Blocking,
+    Cancellation,
+    Capture,
+    Checkpoints,
+    Filters,
+    History,
+    Logs,
+    Metrics,
+    Network,
+    Pacing,
+    Parsing,
+    Pool,
+    Progress,
+    Retries,
+    SearchCache,
+    Selectors,
+    Sessions,
+    Timeouts,
+    Tracing,
+    Watchdog,
+    Worker,
+)
 
 
 class Config(BaseSettings):
@@ -18,8 +40,23 @@ class Config(BaseSettings):
     selectors: Selectors = Field(default_factory=Selectors)  # type:ignore
     timeouts: Timeouts = Field(default_factory=Timeouts)
     network: Network = Field(default_factory=Network)
+    pacing: Pacing = Field(default_factory=Pacing)
     retries: Retries = Field(default_factory=Retries)
     parsing: Parsing = Field(default_factory=Parsing)
+    sessions: Sessions = Field(default_factory=Sessions)
+    history: History = Field(default_factory=History)
+    checkpoints: Checkpoints = Field(default_factory=Checkpoints)
+    cancellation: Cancellation = Field(default_factory=Cancellation)
+    progress: Progress = Field(default_factory=Progress)
+    filters: Filters = Field(default_factory=Filters)
+    search_cache: SearchCache = Field(default_factory=SearchCache)
+    worker: Worker = Field(default_factory=Worker)
+    pool: Pool = Field(default_factory=Pool)
+    watchdog: Watchdog = Field(default_factory=Watchdog)
+    metrics: Metrics = Field(default_factory=Metrics)
+    tracing: Tracing = Field(default_factory=Tracing)
+    capture: Capture = Field(default_factory=Capture)
+    blocking: Blocking = Field(default_factory=Blocking)
 
 
 config = Config()
@@ -24,6 +24,8 @@ class EnvironmentSettings(BaseSettings):
     celery_result_backend: str = Field(default="redis://localhost:6379/2")
     celery_cache: str = Field(default="redis://localhost:6379/3")
 
+    session_encryption_key: str | None = Field(default=None)
+
     cors_allow_origins: Sequence[str] = Field(default=["*"])
     cors_allow_credentials: bool = Field(default=True)
 
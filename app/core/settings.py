@@ -1,4 +1,9 @@
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from loguru import logger
+from pydantic import BaseModel, Field, model_validator
+
+from ..custom_types import ApplyOutcome, JobParserStage
 
 
 class Logs(BaseModel):
@@ -63,6 +68,26 @@ class Selectors(BaseModel):
         default="a[data-qa='serp-item__title']",
         description="Links to vacancies in the results",
     )
+    vacancy_card: str = Field(
+        default="[data-qa~='vacancy-serp__vacancy']",
+        description="Vacancy card in the results",
+    )
+    vacancy_card_employer: str = Field(
+        default="[data-qa='vacancy-serp__vacancy-employer']",
+        description="Employer name on a vacancy card",
+    )
+    vacancy_card_salary: str = Field(
+        default="[data-qa='vacancy-serp__vacancy-compensation']",
+        description="Salary on a vacancy card",
+    )
+    vacancy_card_response: str = Field(
+        default="[data-qa='vacancy-serp__vacancy_response']",
+        description="Response button on a vacancy card",
+    )
+    vacancies_found: str = Field(
+        default="[data-qa='vacancies-search-header']",
+        description="Header with the total number of found vacancies",
+    )
 
     # Vacancy Application
     vacancy_response: str = Field(
@@ -77,7 +102,7 @@ class Selectors(BaseModel):
         description="Popup with additional information when responding to a vacancy",
     )
     additional_info_close: str = Field(
-        "[data-qa='additional-data-collector__popup-close`]"
+        "[data-qa='additional-data-collector__popup-close']"
     )
     vacancy_applied: str = Field(
         "Вы откликнулись", description="Text indicating successful application"
@@ -136,16 +161,139 @@ class Timeouts(BaseModel):
 class Network(BaseModel):
     """Network configuration"""
 
-    sleep_between_actions: int = Field(
-        default=2, description="Sleep time between actions (in seconds)"
+    action_delay_min: float = Field(
+        default=0.3,
+        description="Minimum human-like delay between actions (in seconds)",
+    )
+    action_delay_max: float = Field(
+        default=0.8,
+        description="Maximum human-like delay between actions (in seconds)",
+    )
+    sleep_between_actions: float | None = Field(
+        default=None,
+        description="Deprecated, sets both action delay bounds (in seconds)",
     )
     sleep_between_requests_min: float = Field(
         default=0.5,
-        description="Minimum sleep time between requests (in seconds)",
+        description="Minimum sleep between requests without adaptive pacing",
     )
     sleep_between_requests_max: float = Field(
         default=2,
-        description="Maximum sleep time between requests (in seconds)",
+        description="Maximum sleep between requests without adaptive pacing",
+    )
+    rate_limit_enabled: bool = Field(
+        default=True,
+        description="Pace hh.ru requests of all workers through Redis",
+    )
+    global_rate: float = Field(
+        default=3.0,
+        ge=0,
+        description="Requests per second of all workers, 0 for no limit",
+    )
+    global_burst: int = Field(
+        default=10, ge=1, description="Burst size of the global limit"
+    )
+    account_rate: float = Field(
+        default=0.5,
+        ge=0,
+        description="Requests per second of one account, 0 for no limit",
+    )
+    account_burst: int = Field(
+        default=3, ge=1, description="Burst size of the account limit"
+    )
+    egress_rate: float = Field(
+        default=1.0,
+        ge=0,
+        description="Requests per second of one proxy or IP, 0 for no limit",
+    )
+    egress_burst: int = Field(
+        default=5, ge=1, description="Burst size of the proxy or IP limit"
+    )
+    proxy_server: str | None = Field(
+        default=None,
+        description="Proxy of the task contexts, e.g. http://host:3128",
+    )
+    egress_id: str | None = Field(
+        default=None,
+        description="Name of the egress IP of this host, hostname if unset",
+    )
+    rate_limit_max_wait: int = Field(
+        default=120,
+        description="Maximum wait for a request slot (in seconds)",
+    )
+
+    @model_validator(mode="after")
+    def _apply_sleep_between_actions(self) -> "Network":
+        """Map the fixed pause of older configs onto the delay bounds"""
+        if self.sleep_between_actions is None:
+            return self
+        logger.warning(
+            "network.sleep_between_actions is deprecated, "
+            "use network.action_delay_min and network.action_delay_max"
+        )
+        if "action_delay_min" not in self.model_fields_set:
+            self.action_delay_min = self.sleep_between_actions
+        if "action_delay_max" not in self.model_fields_set:
+            self.action_delay_max = self.sleep_between_actions
+        return self
+
+
+class Pacing(BaseModel):
+    """Adaptive pacing of applications configuration"""
+
+    enabled: bool = Field(
+        default=True,
+        description="Learn delays between applications from their outcomes",
+    )
+    initial_delay: float = Field(
+        default=1.25,
+        gt=0,
+        description="Delay of an account or IP seen for the first time",
+    )
+    min_delay: float = Field(
+        default=0.5, gt=0, description="Lower bound of the delay (in seconds)"
+    )
+    max_delay: float = Field(
+        default=120, gt=0, description="Upper bound of the delay (in seconds)"
+    )
+    window_size: int = Field(
+        default=50,
+        ge=1,
+        description="Number of recent outcomes the controller looks at",
+    )
+    rate_step: float = Field(
+        default=0.02,
+        gt=0,
+        description="Requests per second added per success in a clean window",
+    )
+    captcha_factor: float = Field(
+        default=3.0,
+        ge=1,
+        description="Multiplier of the delay after a captcha",
+    )
+    timeout_factor: float = Field(
+        default=1.5,
+        ge=1,
+        description="Multiplier of the delay after a timeout",
+    )
+    error_factor: float = Field(
+        default=1.2,
+        ge=1,
+        description="Multiplier of the delay after a failed application",
+    )
+    latency_limit: float = Field(
+        default=10,
+        description="Mean latency above which the delay is not reduced",
+    )
+    jitter: float = Field(
+        default=0.3,
+        ge=0,
+        lt=1,
+        description="Random spread of each delay as a share of it",
+    )
+    ttl: int = Field(
+        default=7 * 24 * 3600,
+        description="Lifetime of the state after its last update (in seconds)",
     )
 
 
@@ -156,3 +304,476 @@ class Parsing(BaseModel):
         default="https://hh.ru/account/login",
         description="URL for the login page",
     )
+    hh_base_url: str = Field(
+        default="https://hh.ru/",
+        description="URL of the main page, opened after a session restore",
+    )
+    hh_session_check_url: str = Field(
+        default="https://hh.ru/applicant/resumes",
+        description="Page that is only available to an authorized applicant",
+    )
+    search_backend: Literal["browser", "http"] = Field(
+        default="browser",
+        description="How result pages after the first one are loaded, http falls back to browser",
+    )
+    apply_backend: Literal["browser", "http"] = Field(
+        default="browser",
+        description="How responses are sent, http falls back to browser",
+    )
+    hh_resumes_url: str = Field(
+        default="https://hh.ru/applicant/resumes",
+        description="Page listing the applicant resumes",
+    )
+    hh_response_url: str = Field(
+        default="https://hh.ru/applicant/vacancy_response/popup",
+        description="Endpoint the response form is submitted to",
+    )
+    hh_response_errors: dict[str, ApplyOutcome] = Field(
+        default={
+            "test-required": ApplyOutcome.QUESTIONS_REQUIRED,
+            "letter-required": ApplyOutcome.LETTER_REQUIRED,
+            "already-applied": ApplyOutcome.ALREADY_APPLIED,
+            "negotiations-limit-exceeded": ApplyOutcome.FAILED,
+            "vacancy-archived": ApplyOutcome.FAILED,
+        },
+        description="Outcomes of the error codes of the response endpoint",
+    )
+    pagination_tabs: int = Field(
+        default=3,
+        ge=1,
+        description="Number of search result pages loaded in parallel",
+    )
+    apply_tabs: int = Field(
+        default=3,
+        ge=1,
+        description="Number of pages applying to vacancies in parallel",
+    )
+    pipeline_queue_size: int = Field(
+        default=10,
+        ge=1,
+        description="Vacancy URLs buffered before pagination pauses",
+    )
+
+
+class Sessions(BaseModel):
+    """Login session cache configuration"""
+
+    enabled: bool = Field(
+        default=True,
+        description="Reuse saved browser sessions instead of logging in",
+    )
+    backend: Literal["redis", "file"] = Field(
+        default="redis", description="Where encrypted sessions are stored"
+    )
+    ttl: int = Field(
+        default=7 * 24 * 3600,
+        description="Lifetime of a saved session (in seconds)",
+    )
+    directory: str = Field(
+        default="sessions",
+        description="Directory for sessions when the file backend is used",
+    )
+
+
+class Checkpoints(BaseModel):
+    """Task checkpoints configuration"""
+
+    enabled: bool = Field(
+        default=True,
+        description="Save task state to Redis so it can be resumed",
+    )
+    every: int = Field(
+        default=10,
+        ge=1,
+        description="Save a checkpoint after this many processed vacancies",
+    )
+    ttl: int = Field(
+        default=3 * 24 * 3600,
+        description="Lifetime of a checkpoint (in seconds)",
+    )
+
+
+class Cancellation(BaseModel):
+    """Cooperative task cancellation configuration"""
+
+    enabled: bool = Field(
+        default=True,
+        description="Stop cancelled tasks cooperatively with their partial "
+        "results, keeping the worker and its browser running",
+    )
+    poll_interval: float = Field(
+        default=0.5,
+        gt=0,
+        description="Interval of the cancel flag checks of a running task "
+        "(in seconds)",
+    )
+    grace_period: int = Field(
+        default=30,
+        ge=1,
+        description="Time a cancelled task has to stop in before its asyncio "
+        "task is cancelled (in seconds)",
+    )
+    ttl: int = Field(
+        default=3600, description="Lifetime of a cancel flag (in seconds)"
+    )
+
+
+class Progress(BaseModel):
+    """Task progress reporting configuration"""
+
+    interval: float = Field(
+        default=1.0,
+        ge=0,
+        description="Minimum time between two progress writes of a task, "
+        "updates in between are coalesced (in seconds). Stage changes and "
+        "the final state are written at once",
+    )
+    publish: bool = Field(
+        default=True,
+        description="Publish progress deltas on the Redis channel of the task",
+    )
+    history_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Published deltas of a task kept to replay them to "
+        "reconnecting event streams",
+    )
+    ttl: int = Field(
+        default=3600,
+        description="Lifetime of the kept deltas after the last one "
+        "(in seconds)",
+    )
+    keepalive: float = Field(
+        default=15,
+        gt=0,
+        description="Interval of the comments keeping an idle event stream "
+        "open (in seconds)",
+    )
+
+
+class History(BaseModel):
+    """Applied vacancies index configuration"""
+
+    enabled: bool = Field(
+        default=True,
+        description="Skip vacancies already processed for the account",
+    )
+    ttl: int = Field(
+        default=180 * 24 * 3600,
+        description="Index lifetime after its last update (in seconds)",
+    )
+    skip_outcomes: list[ApplyOutcome] = Field(
+        default=[
+            ApplyOutcome.APPLIED,
+            ApplyOutcome.ALREADY_APPLIED,
+            ApplyOutcome.QUESTIONS_REQUIRED,
+        ],
+        description="Outcomes of the previous runs that are not retried",
+    )
+
+
+class Filters(BaseModel):
+    """Vacancy filters applied to the search result cards"""
+
+    skip_responded: bool = Field(
+        default=True, description="Skip vacancies marked as responded"
+    )
+    skip_without_response_button: bool = Field(
+        default=True,
+        description="Skip vacancies without a response button on the card",
+    )
+    require_salary: bool = Field(
+        default=False, description="Skip vacancies without a salary"
+    )
+    excluded_employers: list[str] = Field(
+        default=[],
+        description="Skip employers whose name contains any of these",
+    )
+
+
+class SearchCache(BaseModel):
+    """Shared search results cache configuration"""
+
+    enabled: bool = Field(
+        default=True,
+        description="Share parsed search results pages between tasks",
+    )
+    ttl: int = Field(
+        default=600, description="Lifetime of a cached page (in seconds)"
+    )
+    lock_ttl: int = Field(
+        default=60,
+        description="Lifetime of the lock of a page being loaded (in seconds)",
+    )
+    wait_timeout: int = Field(
+        default=30,
+        description="Maximum wait for a page loaded elsewhere (in seconds)",
+    )
+    ignored_params: list[str] = Field(
+        default=["from", "hhtmFrom", "hhtmFromLabel", "search_session_id"],
+        description="Search URL params that do not change the results",
+    )
+
+
+class Metrics(BaseModel):
+    """Prometheus metrics configuration"""
+
+    enabled: bool = Field(
+        default=True, description="Expose metrics of the API and the worker"
+    )
+    worker_port: int = Field(
+        default=9100, description="Port of the metrics exporter of the worker"
+    )
+
+
+class Tracing(BaseModel):
+    """Tracing of job tasks configuration"""
+
+    enabled: bool = Field(
+        default=True, description="Record spans of the sampled tasks"
+    )
+    sample_rate: float = Field(
+        default=0.1,
+        ge=0,
+        le=1,
+        description="Share of submitted tasks that are traced",
+    )
+    exporter: Literal["file", "log", "memory"] = Field(
+        default="file", description="Where finished spans are sent"
+    )
+    file_path: str = Field(
+        default="traces/spans.jsonl",
+        description="JSON lines file of the file exporter",
+    )
+    memory_size: int = Field(
+        default=10000,
+        ge=1,
+        description="Number of spans kept by the memory exporter",
+    )
+
+
+class Capture(BaseModel):
+    """Playwright trace and HAR capture of job tasks configuration"""
+
+    enabled: bool = Field(
+        default=True, description="Keep browser artifacts of the tasks"
+    )
+    sample_rate: float = Field(
+        default=0.01,
+        ge=0,
+        le=1,
+        description="Share of tasks recorded with a full trace and a HAR",
+    )
+    on_failure: bool = Field(
+        default=True,
+        description="Record a trace of the actions of every task, kept "
+        "when it fails or exceeds a stage budget",
+    )
+    stage_budgets: dict[JobParserStage, float] = Field(
+        default={
+            JobParserStage.AUTH: 60,
+            JobParserStage.SEARCH: 120,
+            JobParserStage.PARSING: 600,
+            JobParserStage.APPLY: 1800,
+        },
+        description="Latency budget of each stage (in seconds)",
+    )
+    directory: str = Field(
+        default="artifacts", description="Directory of the kept artifacts"
+    )
+    max_total_mb: int = Field(
+        default=500,
+        ge=1,
+        description="Size of the directory after which the oldest "
+        "artifacts are removed (in MB)",
+    )
+    har_content: Literal["omit", "embed"] = Field(
+        default="omit", description="Whether bodies are saved in the HAR"
+    )
+
+
+class Worker(BaseModel):
+    """Celery worker process configuration"""
+
+    max_tasks: int = Field(
+        default=2,
+        ge=1,
+        description="Tasks run at once by one worker process started "
+        "with the threads pool, on its shared browser",
+    )
+    shutdown_timeout: int = Field(
+        default=60,
+        description="Timeout for closing the browser of a process with "
+        "the threads pool (in seconds)",
+    )
+    browser_memory_mb: int = Field(
+        default=1536,
+        ge=256,
+        description="RSS budget of one supervised worker with its browser "
+        "(in MB)",
+    )
+    reserved_memory_mb: int = Field(
+        default=1024,
+        ge=0,
+        description="Memory the supervisor leaves to the system (in MB)",
+    )
+    max_processes: int | None = Field(
+        default=None,
+        ge=1,
+        description="Upper limit of supervised workers, CPUs by default",
+    )
+    memory_check_interval: int = Field(
+        default=30,
+        ge=1,
+        description="Interval of the browser RSS checks (in seconds)",
+    )
+    restart_delay: int = Field(
+        default=5,
+        description="Delay before a stopped worker is restarted "
+        "(in seconds)",
+    )
+
+
+class Watchdog(BaseModel):
+    """Browser health watchdog configuration"""
+
+    enabled: bool = Field(
+        default=True, description="Watch the browser and running tasks"
+    )
+    max_rss_mb: int = Field(
+        default=1024,
+        ge=128,
+        description="Browser RSS after which it is restarted between "
+        "tasks (in MB)",
+    )
+    max_contexts: int = Field(
+        default=20,
+        ge=1,
+        description="Open contexts after which the browser is restarted "
+        "between tasks",
+    )
+    max_tasks: int = Field(
+        default=200,
+        ge=1,
+        description="Tasks after which the browser is restarted",
+    )
+    check_interval: float = Field(
+        default=2, gt=0, description="Interval of the checks (in seconds)"
+    )
+    idle_timeout: float = Field(
+        default=15,
+        gt=0,
+        description="Time without finished browser operations after which "
+        "the page of a task is probed (in seconds)",
+    )
+    probe_timeout: float = Field(
+        default=5,
+        gt=0,
+        description="Time a probed page has to respond in before its task "
+        "is aborted as stalled (in seconds)",
+    )
+    close_timeout: float = Field(
+        default=10,
+        gt=0,
+        description="Timeout for closing a stalled context or browser "
+        "(in seconds)",
+    )
+
+
+class Pool(BaseModel):
+    """Browser context pool configuration"""
+
+    enabled: bool = Field(
+        default=True, description="Reuse pre-created browser contexts"
+    )
+    size: int = Field(
+        default=2, ge=1, description="Maximum number of pooled contexts"
+    )
+    max_uses: int = Field(
+        default=20,
+        ge=1,
+        description="Number of tasks after which a context is recreated",
+    )
+    acquire_timeout: int = Field(
+        default=60,
+        description="Timeout for waiting for a free context (in seconds)",
+    )
+
+
+class BlockingProfile(BaseModel):
+    """Request blocking rules for one type of page"""
+
+    name: str = Field(description="Profile name used in logs")
+    page_url_pattern: str = Field(
+        description="Regex matched against the URL of the page"
+    )
+    resource_types: list[str] = Field(
+        default_factory=list,
+        description="Playwright resource types to block",
+    )
+    url_patterns: list[str] = Field(
+        default_factory=list,
+        description="Regexes of request URLs to block",
+    )
+    block_trackers: bool = Field(
+        default=True, description="Block analytics and ad hosts"
+    )
+
+
+class Blocking(BaseModel):
+    """Network resource blocking configuration"""
+
+    enabled: bool = Field(
+        default=True, description="Intercept and block unneeded requests"
+    )
+    allow_url_patterns: list[str] = Field(
+        default=["captcha"],
+        description="Regexes of request URLs that are never blocked",
+    )
+    tracker_url_patterns: list[str] = Field(
+        default=[
+            r"mc\.yandex\.(ru|com)",
+            r"an\.yandex\.ru",
+            r"yandex\.ru/ads",
+            r"google-analytics\.com",
+            r"googletagmanager\.com",
+            r"doubleclick\.net",
+            r"top-fwz1\.mail\.ru",
+            r"counter\.yadro\.ru",
+            r"ads\.adfox\.ru",
+            r"vk\.com/rtrg",
+            r"/analytics/",
+        ],
+        description="Regexes of analytics and ad request URLs",
+    )
+    profiles: list[BlockingProfile] = Field(
+        default=[
+            BlockingProfile(
+                name="login",
+                page_url_pattern=r"/account/",
+                block_trackers=False,
+            ),
+            BlockingProfile(
+                name="vacancy",
+                page_url_pattern=r"/vacancy/\d+",
+                resource_types=["image", "media", "font"],
+            ),
+            BlockingProfile(
+                name="search",
+                page_url_pattern=r"/search/vacancy",
+                resource_types=["image", "media", "font"],
+            ),
+            BlockingProfile(name="default", page_url_pattern=r".*"),
+        ],
+        description="Profiles by page type, the first matching one is used",
+    )
+    estimated_sizes: dict[str, int] = Field(
+        default={
+            "image": 30_000,
+            "media": 300_000,
+            "font": 40_000,
+            "script": 50_000,
+            "stylesheet": 20_000,
+        },
+        description="Assumed size of a blocked resource by type, the bytes saved are estimated from it (in bytes)",
+    )
@@ -1,8 +1,12 @@
 from .app_environment import AppEnvironment
+from .apply_outcome import ApplyOutcome
 from .country_regions import HHCountryRegions
 from .error_codes import ErrorCodes
 from .job_search_status import JobSearchStatus, JobParserStage
 from .log_level import LogLevel
+from .pacing_signal import PacingSignal
+from .page_state import PageState
+from .skip_reason import SkipReason
 
 __all__ = [
     "AppEnvironment",
@@ -10,5 +14,9 @@ __all__ = [
     "ErrorCodes",
     "HHCountryRegions",
     "JobSearchStatus",
-    "JobParserStage"
+    "JobParserStage",
+    "PageState",
+    "ApplyOutcome",
+    "SkipReason",
+    "PacingSignal",
 ]
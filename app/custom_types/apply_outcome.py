@@ -0,0 +1,10 @@
+from enum import StrEnum
+
+
+class ApplyOutcome(StrEnum):
+    APPLIED = "applied"
+    # Sent before, by another run or by hand, not counted as applied
+    ALREADY_APPLIED = "already applied"
+    QUESTIONS_REQUIRED = "questions required"
+    LETTER_REQUIRED = "letter required"
+    FAILED = "failed"
@@ -5,6 +5,7 @@ class HHParserErrors(StrEnum):
     CAPTCHA_REQUIRED = "CAPTCHA_REQUIRED"
     INVALID_LOGIN = "INVALID_LOGIN"
     NO_VACANCIES_FOUND = "NO_VACANCIES_FOUND"
+    BROWSER_STALLED = "BROWSER_STALLED"
 
 
 class NetworkErrors(StrEnum):
@@ -6,6 +6,8 @@ class JobSearchStatus(StrEnum):
     CAPTCHA_REQUIRED = "captcha required"
     ERROR = "error"
     INVALID_CREDENTIALS = "invalid credentials"
+    STALLED = "stalled"
+    CANCELLED = "cancelled"
     SUCCESS = "success"
 
 
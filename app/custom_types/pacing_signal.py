@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class PacingSignal(StrEnum):
+    SUCCESS = "success"
+    CAPTCHA = "captcha"
+    TIMEOUT = "timeout"
+    ERROR = "error"
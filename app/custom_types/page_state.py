@@ -0,0 +1,12 @@
+from enum import StrEnum
+
+
+class PageState(StrEnum):
+    CAPTCHA = "captcha"
+    LOGIN_ERROR = "login error"
+    QUESTIONS_REQUIRED = "questions required"
+    LETTER_REQUIRED = "letter required"
+    APPLIED = "applied"
+    ADDITIONAL_INFO = "additional info"
+    NO_RESULTS = "no results"
+    UNKNOWN = "unknown"
@@ -0,0 +1,9 @@
+from enum import StrEnum
+
+
+class SkipReason(StrEnum):
+    ALREADY_RESPONDED = "already responded"
+    ALREADY_PROCESSED = "already processed"
+    NO_RESPONSE_BUTTON = "no response button"
+    EXCLUDED_EMPLOYER = "excluded employer"
+    NO_SALARY = "no salary"
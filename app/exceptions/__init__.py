@@ -1,5 +1,6 @@
 from .hh_exceptions import (
     AuthCredentialsError,
+    BrowserStalledError,
     CaptchaError,
     HHParserError,
     NoVacanciesFoundError,
@@ -8,6 +9,7 @@ from .hh_exceptions import (
 __all__ = [
     "HHParserError",
     "AuthCredentialsError",
+    "BrowserStalledError",
     "CaptchaError",
     "NoVacanciesFoundError",
 ]
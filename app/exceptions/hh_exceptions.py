@@ -40,3 +40,11 @@ class NoVacanciesFoundError(HHParserError):
             message,
             code=ErrorCodes.HHParserErrors.NO_VACANCIES_FOUND,
         )
+
+
+class BrowserStalledError(HHParserError):
+    def __init__(self, message: str) -> None:
+        super().__init__(
+            message,
+            code=ErrorCodes.HHParserErrors.BROWSER_STALLED,
+        )
@@ -1,11 +1,16 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from .api import api_router
+from .api import api_router, metrics_router
 from .core import load
+from .utils.metrics import HTTP_DURATION
+from .utils.tracing import configure_tracing
 
 config = load()
+configure_tracing(config.tracing)
 
 app = FastAPI(
     title="HH Auto Apply API",
@@ -21,6 +26,23 @@ app.add_middleware(
 )
 
 app.include_router(api_router)
+if config.metrics.enabled:
+    app.include_router(metrics_router)
+
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    """Observe API request durations by route template"""
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    HTTP_DURATION.labels(
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=response.status_code,
+    ).observe(time.perf_counter() - started)
+    return response
+
 
 # Serve static files
 app.mount("/", StaticFiles(directory="frontend", html=True), name="static")
@@ -1,4 +1,16 @@
+from .checkpoint import JobCheckpoint
 from .hh_auth import AuthCredentials, EmailAuth, PhoneAuth
-from .job_search import JobSearchResult
+from .job_search import JobSearchResult, VacancyApplication
+from .pacing import PacingState
+from .vacancy_card import VacancyCard
 
-__all__ = ["AuthCredentials", "EmailAuth", "PhoneAuth", "JobSearchResult"]
+__all__ = [
+    "AuthCredentials",
+    "EmailAuth",
+    "PhoneAuth",
+    "JobSearchResult",
+    "JobCheckpoint",
+    "VacancyApplication",
+    "VacancyCard",
+    "PacingState",
+]
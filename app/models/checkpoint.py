@@ -0,0 +1,51 @@
+from pydantic import BaseModel, Field
+
+from ..custom_types import JobParserStage, JobSearchStatus, SkipReason
+from .hh_auth import AuthCredentials
+from .job_search import JobSearchResult, VacancyApplication
+
+
+class JobCheckpoint(BaseModel):
+    """State of a job search task saved to resume it later.
+
+    The login session is not stored here, it is restored from the
+    session cache of the account.
+    """
+
+    task_id: str
+    credentials: AuthCredentials
+    search_query: str
+    max_applications: int
+    stage: JobParserStage = JobParserStage.WAITING
+    search_url: str | None = None
+    collected: list[str] = Field(default_factory=list)
+    collected_all: bool = False
+    vacancies: list[VacancyApplication] = Field(default_factory=list)
+    skip_reasons: dict[SkipReason, int] = Field(default_factory=dict)
+    updated_at: float = 0.0
+
+    @property
+    def pending(self) -> list[str]:
+        """Collected vacancy URLs that were not processed yet"""
+        processed = {vacancy.url for vacancy in self.vacancies}
+        return [url for url in self.collected if url not in processed]
+
+    def partial_result(
+        self, status: JobSearchStatus, message: str | None = None
+    ) -> JobSearchResult:
+        """Result of the vacancies processed up to this checkpoint.
+        Args:
+            status (JobSearchStatus): Status of the result.
+            message (str | None): Message of the result.
+        Returns:
+            JobSearchResult: Result with the counts of the checkpoint.
+        """
+        return JobSearchResult(
+            status=status,
+            applied=sum(vacancy.applied for vacancy in self.vacancies),
+            total=len(self.collected),
+            skipped=sum(self.skip_reasons.values()),
+            skip_reasons=dict(self.skip_reasons),
+            message=message,
+            vacancies=list(self.vacancies),
+        )
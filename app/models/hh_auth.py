@@ -11,6 +11,11 @@ class EmailAuth(BaseModel):
     answer_req: str | None = None
     auth_type: Literal["email"] = "email"
 
+    @property
+    def account_id(self) -> str:
+        """Stable identifier of the hh.ru account"""
+        return f"email:{self.email.lower()}"
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -30,6 +35,11 @@ class PhoneAuth(BaseModel):
     answer_req: str | None = None
     auth_type: Literal["phone"] = "phone"
 
+    @property
+    def account_id(self) -> str:
+        """Stable identifier of the hh.ru account"""
+        return f"phone:{self.country.name}:{self.phone}"
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -1,11 +1,23 @@
 from pydantic import BaseModel, Field
 
-from ..custom_types import JobSearchStatus
+from ..custom_types import ApplyOutcome, JobSearchStatus, SkipReason
+
+
+class VacancyApplication(BaseModel):
+    url: str
+    applied: bool
+    outcome: ApplyOutcome
+    error: str | None = None
 
 
 class JobSearchResult(BaseModel):
     status: JobSearchStatus
     applied: int
     total: int = 0
+    skipped: int = 0
+    skip_reasons: dict[SkipReason, int] = Field(default_factory=dict)
     progress: float = Field(0, le=100, ge=0)  # Percentage 0-100
     message: str | None = None
+    resumable: bool = False
+    vacancies: list[VacancyApplication] = Field(default_factory=list)
+    artifacts: list[str] = Field(default_factory=list)
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, computed_field
+
+
+class PacingState(BaseModel):
+    """Pacing of one account or egress IP learned from request outcomes"""
+
+    scope: str
+    key: str
+    delay: float
+    successes: int = 0
+    captchas: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    mean_latency: float | None = None
+    updated_at: float | None = None
+
+    @computed_field
+    @property
+    def requests_per_minute(self) -> float:
+        """Request rate the current delay allows"""
+        return round(60 / self.delay, 2) if self.delay else 0.0
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class VacancyCard(BaseModel):
+    url: str
+    vacancy_id: str | None = None
+    title: str | None = None
+    employer: str | None = None
+    salary: str | None = None
+    # Both depend on the account, hh.ru hides the response button once
+    # it has responded. None when the card came from a shared cache
+    has_response_button: bool | None = True
+    responded: bool | None = None
+
+    def shared(self) -> "VacancyCard":
+        """Copy of the card without the per-account fields"""
+        return self.model_copy(
+            update={"has_response_button": None, "responded": None}
+        )
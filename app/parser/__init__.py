@@ -1,15 +1,35 @@
 from .apply import apply_to_vacancy
-from .auth import login
-from .checks import check_captcha, check_login, check_no_vacancies
-from .search import goto_page, parse_vacancy_urls, search_vacancies
+from .apply_http import apply_via_http, fetch_resume_hash
+from .auth import login, restore_session
+from .checks import (
+    check_captcha,
+    check_login,
+    check_no_vacancies,
+    check_session,
+    probe_page_state,
+    wait_for_page_state,
+)
+from .search import (
+    goto_page,
+    parse_vacancy_cards,
+    search_vacancies,
+    stream_vacancies,
+)
 
 __all__ = [
     "apply_to_vacancy",
+    "apply_via_http",
+    "fetch_resume_hash",
     "login",
+    "restore_session",
     "check_captcha",
     "check_login",
     "check_no_vacancies",
+    "check_session",
+    "probe_page_state",
+    "wait_for_page_state",
     "goto_page",
-    "parse_vacancy_urls",
+    "parse_vacancy_cards",
     "search_vacancies",
+    "stream_vacancies",
 ]
@@ -1,23 +1,20 @@
-import asyncio
 import random
 
 from loguru import logger
 from playwright.async_api import Page, expect
 
 from ..core import Config
+from ..custom_types import ApplyOutcome, PageState
 from ..exceptions import CaptchaError
 from ..models import AuthCredentials
 from ..utils.click_utils import safe_click
-from .checks import (
-    check_additional_questions,
-    check_captcha,
-    check_required_letter,
-)
+from ..utils.throttle import throttle
+from .checks import wait_for_page_state
 
 
 async def apply_to_vacancy(
     page: Page, vacancy_url: str, config: Config, credentials: AuthCredentials
-) -> bool:
+) -> ApplyOutcome:
     """Apply to a vacancy on the given page.
     Args:
         page (Page): The Playwright page to apply on.
@@ -25,13 +22,15 @@ async def apply_to_vacancy(
         config (Config): The application configuration.
         credentials (AuthCredentials): The authentication credentials.
     Returns:
-        bool: True if the application was successful, False otherwise.
+        ApplyOutcome: APPLIED if the application was successful, the
+            reason it was not sent otherwise.
     Raises:
         CaptchaError: If a captcha is detected on the page.
     """
     logger.bind(vacancy_url=vacancy_url).info(
         "Starting application to vacancy"
     )
+    await throttle("navigation")
     await page.goto(
         vacancy_url,
         wait_until="domcontentloaded",
@@ -39,6 +38,7 @@ async def apply_to_vacancy(
     )
 
     apply_button = page.locator(config.selectors.vacancy_response).first
+    await throttle("submit")
     await safe_click(
         apply_button,
         config.selectors.vacancy_response,
@@ -46,35 +46,89 @@ async def apply_to_vacancy(
         no_wait_after=False,
     )
 
-    await asyncio.sleep(config.network.sleep_between_actions)
+    state = await wait_for_page_state(
+        page,
+        config,
+        [
+            PageState.CAPTCHA,
+            PageState.QUESTIONS_REQUIRED,
+            PageState.LETTER_REQUIRED,
+            PageState.APPLIED,
+            PageState.ADDITIONAL_INFO,
+        ],
+        timeout=config.timeouts.element_timeout * 1000,
+    )
+
+    if state == PageState.QUESTIONS_REQUIRED:
+        logger.bind(vacancy_url=vacancy_url).info(
+            "Employer questions required for a vacancy"
+        )
+        return ApplyOutcome.QUESTIONS_REQUIRED
+
+    if state == PageState.LETTER_REQUIRED:
+        if not await submit_cover_letter(page, config, credentials):
+            return ApplyOutcome.LETTER_REQUIRED
+        state = PageState.UNKNOWN
 
-    if await check_captcha(page, config):
+    if state in (PageState.ADDITIONAL_INFO, PageState.UNKNOWN):
+        await close_application_modal(page, config)
+        state = await wait_for_page_state(
+            page,
+            config,
+            [PageState.CAPTCHA, PageState.APPLIED],
+            timeout=config.timeouts.element_timeout * 1000,
+        )
+
+    if state == PageState.CAPTCHA:
         logger.error("Captcha detected during vacancy application.")
         raise CaptchaError("Captcha detected during vacancy application.")
 
-    if await check_additional_questions(page, config):
-        return False
+    if state != PageState.APPLIED:
+        return ApplyOutcome.FAILED
 
-    if not await check_required_letter(page, config, credentials):
-        return False
+    next_application_delay = random.uniform(
+        config.network.sleep_between_requests_min,
+        config.network.sleep_between_requests_max,
+    )
+    logger.bind(
+        vacancy_url=vacancy_url,
+        next_application_s=round(next_application_delay, 2),
+    ).success("Application successful")
+    return ApplyOutcome.APPLIED
 
-    await close_application_modal(page, config)
 
-    success_message = page.get_by_text(
-        config.selectors.vacancy_applied, exact=True
+async def submit_cover_letter(
+    page: Page, config: Config, credentials: AuthCredentials
+) -> bool:
+    """Fill and submit a required cover letter if provided in credentials.
+    Args:
+        page (Page): The Playwright page with the response dialog.
+        config (Config): The application configuration.
+        credentials (AuthCredentials): The authentication credentials containing the cover letter.
+
+    Returns:
+        bool: True if the cover letter was submitted, False otherwise.
+    """
+    logger.bind(vacancy_url=page.url).info(
+        "Additional letter required for a vacancy"
     )
-    try:
-        await expect(success_message).to_be_visible(
-            timeout=config.timeouts.element_timeout * 1000
+    if not credentials.answer_req:
+        logger.bind(vacancy_url=page.url).warning(
+            "Cover letter required but not provided in credentials"
         )
-        next_application_delay = random.uniform(
-            config.network.sleep_between_requests_min,
-            config.network.sleep_between_requests_max,
+        return False
+
+    try:
+        dialog = page.get_by_role("dialog")
+        letter_input = dialog.locator(config.selectors.cover_letter_input)
+        await letter_input.fill(credentials.answer_req)
+        logger.bind(vacancy_url=page.url).debug("Filled cover letter")
+        await throttle("submit")
+        await dialog.locator(config.selectors.vacancy_response_popup).click(
+            timeout=config.timeouts.element_timeout * 1000,
+            no_wait_after=False,
         )
-        logger.bind(
-            vacancy_url=vacancy_url,
-            next_application_s=round(next_application_delay, 2),
-        ).success("Application successful")
+        logger.bind(vacancy_url=page.url).info("Letter applied for a vacancy")
         return True
     except Exception:
         return False
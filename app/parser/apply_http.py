@@ -0,0 +1,143 @@
+import re
+
+from loguru import logger
+from playwright.async_api import Page
+
+from ..core import Config
+from ..custom_types import ApplyOutcome
+from ..models import AuthCredentials
+from ..utils.throttle import throttle
+from ..utils.url_utils import vacancy_id
+
+_RESUME_HASH = re.compile(r"/resume/([0-9a-f]{20,})")
+
+
+async def fetch_resume_hash(page: Page, config: Config) -> str | None:
+    """Find the hash of the resume the responses are sent with.
+    Args:
+        page (Page): A page of the logged in context.
+        config (Config): The application configuration.
+    Returns:
+        str | None: Hash of the first resume or None if it is not found.
+    """
+    await throttle("request")
+    try:
+        response = await page.request.get(
+            config.parsing.hh_resumes_url,
+            timeout=config.timeouts.connection_timeout * 1000,
+        )
+        html = await response.text()
+    except Exception as exc:
+        logger.warning(f"Failed to load resumes page: {exc}")
+        return None
+
+    match = _RESUME_HASH.search(html)
+    if not match:
+        logger.warning("No resume found for responses over HTTP")
+        return None
+    return match.group(1)
+
+
+def parse_response_reply(
+    status: int, reply: dict, config: Config
+) -> ApplyOutcome | None:
+    """Map a reply of the response endpoint to an application outcome.
+    Args:
+        status (int): HTTP status of the reply.
+        reply (dict): JSON body of the reply.
+        config (Config): The application configuration.
+    Returns:
+        ApplyOutcome | None: The outcome or None if the reply is not
+            known (e.g. captcha) and the browser has to apply instead.
+    """
+    if status == 200 and reply.get("success") in (True, "true"):
+        return ApplyOutcome.APPLIED
+
+    error = reply.get("error")
+    if isinstance(error, dict):
+        error = error.get("type")
+    return config.parsing.hh_response_errors.get(str(error))
+
+
+async def apply_via_http(
+    page: Page,
+    vacancy_url: str,
+    config: Config,
+    credentials: AuthCredentials,
+    resume_hash: str,
+) -> ApplyOutcome | None:
+    """Apply to a vacancy by submitting the response form data directly.
+
+    The request is sent from the page context, so it carries the
+    cookies of the logged in session, the XSRF token is taken from them.
+
+    Args:
+        page (Page): A page of the logged in context.
+        vacancy_url (str): The URL of the vacancy to apply to.
+        config (Config): The application configuration.
+        credentials (AuthCredentials): The authentication credentials.
+        resume_hash (str): Hash of the resume to respond with.
+    Returns:
+        ApplyOutcome | None: The outcome or None if the browser has to
+            apply instead.
+    """
+    found_id = vacancy_id(vacancy_url)
+    cookies = await page.context.cookies(config.parsing.hh_base_url)
+    xsrf = next(
+        (cookie["value"] for cookie in cookies if cookie["name"] == "_xsrf"),
+        None,
+    )
+    if found_id is None or xsrf is None:
+        return None
+
+    form = {
+        "vacancy_id": found_id,
+        "resume_hash": resume_hash,
+        "ignore_postponed": "true",
+        "incomplete": "false",
+        "letter": "",
+        "lux": "true",
+        "withoutTest": "no",
+    }
+    outcome = await _send_response(page, vacancy_url, config, form, xsrf)
+    if outcome == ApplyOutcome.LETTER_REQUIRED and credentials.answer_req:
+        form["letter"] = credentials.answer_req
+        outcome = await _send_response(page, vacancy_url, config, form, xsrf)
+
+    if outcome is None:
+        logger.bind(vacancy_url=vacancy_url).info(
+            "Unknown response reply, applying in the browser"
+        )
+    elif outcome == ApplyOutcome.APPLIED:
+        logger.bind(vacancy_url=vacancy_url).success(
+            "Application sent over HTTP"
+        )
+    return outcome
+
+
+async def _send_response(
+    page: Page, vacancy_url: str, config: Config, form: dict, xsrf: str
+) -> ApplyOutcome | None:
+    await throttle("submit")
+    try:
+        response = await page.request.post(
+            config.parsing.hh_response_url,
+            form=form,
+            headers={
+                "Referer": vacancy_url,
+                "X-Requested-With": "XMLHttpRequest",
+                "X-Xsrftoken": xsrf,
+            },
+            max_redirects=0,
+            timeout=config.timeouts.connection_timeout * 1000,
+        )
+        reply = await response.json()
+    except Exception as exc:
+        logger.bind(vacancy_url=vacancy_url).warning(
+            f"Failed to send response over HTTP: {exc}"
+        )
+        return None
+
+    if not isinstance(reply, dict):
+        return None
+    return parse_response_reply(response.status, reply, config)
@@ -1,13 +1,49 @@
-import asyncio
-
 from loguru import logger
 from playwright.async_api import Page
 
 from ..core import Config
+from ..custom_types import PageState
 from ..exceptions import AuthCredentialsError, CaptchaError
 from ..models import AuthCredentials, EmailAuth, PhoneAuth
-from ..utils.click_utils import safe_click
-from .checks import check_captcha, check_login
+from ..utils.click_utils import (
+    element_state,
+    first_ready,
+    safe_click,
+    wait_ready,
+)
+from ..utils.throttle import throttle
+from .checks import check_session, probe_page_state
+
+
+async def _login_answered(page: Page, config: Config) -> None:
+    """Wait until the page answers the submitted login form.
+
+    A successful login opens the main page, so its search button is
+    waited for together with the login error and the captcha. Trackers
+    keep the network busy long after that, a network idle window would
+    only end on its timeout.
+
+    Args:
+        page (Page): The Playwright page the form was submitted on.
+        config (Config): The application configuration.
+    """
+    selectors = config.selectors
+    timeout = config.timeouts.connection_timeout * 1000
+    await first_ready(
+        element_state(
+            page.locator(selectors.search_button), "visible", timeout
+        ),
+        element_state(
+            page.get_by_text(selectors.login_error, exact=True),
+            "visible",
+            timeout,
+        ),
+        element_state(
+            page.get_by_alt_text(selectors.captcha_alt_text),
+            "visible",
+            timeout,
+        ),
+    )
 
 
 async def login_with_email(
@@ -25,6 +61,7 @@ async def login_with_email(
     logger.bind(auth_type="email", login_email=credentials.email).info(
         "Starting email login"
     )
+    await throttle("navigation")
     await page.goto(
         config.parsing.hh_login_url,
         wait_until="domcontentloaded",
@@ -52,7 +89,14 @@ async def login_with_email(
     email_input = page.locator(config.selectors.email_input)
     await email_input.fill(credentials.email)
 
-    await asyncio.sleep(config.network.sleep_between_actions)
+    await wait_ready(
+        config.network,
+        element_state(
+            page.locator(config.selectors.password_button),
+            "visible",
+            timeout=config.timeouts.element_timeout * 1000,
+        ),
+    )
 
     password_button = page.locator(config.selectors.password_button)
     await safe_click(
@@ -65,9 +109,17 @@ async def login_with_email(
     password_input = page.locator(config.selectors.password_input)
     await password_input.fill(credentials.password)
 
-    await asyncio.sleep(config.network.sleep_between_actions)
+    await wait_ready(
+        config.network,
+        element_state(
+            page.locator(config.selectors.login_button),
+            "visible",
+            timeout=config.timeouts.element_timeout * 1000,
+        ),
+    )
 
     submit_button = page.locator(config.selectors.login_button)
+    await throttle("submit")
     await safe_click(
         submit_button,
         config.selectors.login_button,
@@ -75,16 +127,16 @@ async def login_with_email(
         no_wait_after=False,
     )
 
-    await page.wait_for_load_state(
-        "domcontentloaded", timeout=config.timeouts.connection_timeout * 1000
-    )
-    await asyncio.sleep(config.network.sleep_between_actions)
+    await wait_ready(config.network, _login_answered(page, config))
 
-    if await check_captcha(page, config):
+    state = await probe_page_state(
+        page, config, [PageState.CAPTCHA, PageState.LOGIN_ERROR]
+    )
+    if state == PageState.CAPTCHA:
         logger.error("Captcha detected during email login.")
         raise CaptchaError("Captcha detected during email login.")
 
-    if not await check_login(page, config):
+    if state == PageState.LOGIN_ERROR:
         logger.error("Login failed: invalid email or password.")
         raise AuthCredentialsError("Invalid email or password.")
 
@@ -110,6 +162,7 @@ async def login_with_phone(
         login_phone=credentials.phone,
         country=credentials.country.value,
     ).info("Starting phone login")
+    await throttle("navigation")
     await page.goto(config.parsing.hh_login_url)
 
     login_button = page.locator(config.selectors.login_button)
@@ -138,7 +191,14 @@ async def login_with_phone(
         credentials.phone, timeout=config.timeouts.element_timeout * 1000
     )
 
-    await asyncio.sleep(config.network.sleep_between_actions)
+    await wait_ready(
+        config.network,
+        element_state(
+            page.locator(config.selectors.password_button),
+            "visible",
+            timeout=config.timeouts.element_timeout * 1000,
+        ),
+    )
 
     password_button = page.locator(config.selectors.password_button)
     await safe_click(
@@ -151,9 +211,17 @@ async def login_with_phone(
     password_input = page.locator(config.selectors.password_input)
     await password_input.fill(credentials.password)
 
-    await asyncio.sleep(config.network.sleep_between_actions)
+    await wait_ready(
+        config.network,
+        element_state(
+            page.locator(config.selectors.login_button),
+            "visible",
+            timeout=config.timeouts.element_timeout * 1000,
+        ),
+    )
 
     submit_button = page.locator(config.selectors.login_button)
+    await throttle("submit")
     await safe_click(
         submit_button,
         config.selectors.login_button,
@@ -161,16 +229,16 @@ async def login_with_phone(
         no_wait_after=False,
     )
 
-    await page.wait_for_load_state(
-        "domcontentloaded", timeout=config.timeouts.connection_timeout * 1000
-    )
-    await asyncio.sleep(config.network.sleep_between_actions)
+    await wait_ready(config.network, _login_answered(page, config))
 
-    if await check_captcha(page, config):
+    state = await probe_page_state(
+        page, config, [PageState.CAPTCHA, PageState.LOGIN_ERROR]
+    )
+    if state == PageState.CAPTCHA:
         logger.error("Captcha detected during phone login.")
         raise CaptchaError("Captcha detected during phone login.")
 
-    if not await check_login(page, config):
+    if state == PageState.LOGIN_ERROR:
         logger.error("Login failed: invalid phone number or password.")
         raise AuthCredentialsError("Invalid phone number or password.")
 
@@ -204,3 +272,26 @@ async def login(
         raise AuthCredentialsError(
             f"Unsupported authentication method with type: {type(credentials)}, value: {credentials}."
         )
+
+
+async def restore_session(page: Page, config: Config) -> bool:
+    """Reuse a session restored into the page context instead of logging in.
+    Args:
+        page (Page): The Playwright page with restored cookies.
+        config (Config): The application configuration.
+    Returns:
+        bool: True if the session is valid and the main page is opened,
+            False if a full login is required.
+    """
+    if not await check_session(page, config):
+        logger.info("No valid saved session, full login required")
+        return False
+
+    await throttle("navigation")
+    await page.goto(
+        config.parsing.hh_base_url,
+        wait_until="domcontentloaded",
+        timeout=config.timeouts.connection_timeout * 1000,
+    )
+    logger.success("Saved session restored, login skipped")
+    return True
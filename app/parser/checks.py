@@ -1,128 +1,239 @@
+from typing import Iterable
+
 from loguru import logger
 from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from ..core import Config
-from ..models import AuthCredentials
+from ..custom_types import PageState
+from ..utils.metrics import ACTION_DURATION, timed
+from ..utils.throttle import throttle
+from ..utils.tracing import span
 
+# Returns the first of the wanted states whose marker is visible, or null.
+# Text markers are matched exactly against visible text nodes, the same
+# way as get_by_text(..., exact=True). Element markers are CSS selectors.
+_PROBE_SCRIPT = """
+([markers, wanted]) => {
+    const isVisible = (element) => {
+        if (!element || !element.getClientRects().length) return false;
+        const style = getComputedStyle(element);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    const normalize = (text) => (text || '').replace(/\\s+/g, ' ').trim();
 
-async def check_login(page: Page, config: Config) -> bool:
-    """Check if login was successful.
+    const found = new Set();
+    if (wanted.includes('captcha')) {
+        // Case-insensitive substring, the same as get_by_alt_text()
+        const alt = `img[alt*=${CSS.escape(markers.captcha_alt)} i]`;
+        const images = document.querySelectorAll(
+            `[role="dialog"] ${alt}, dialog ${alt}`
+        );
+        if ([...images].some(isVisible)) found.add('captcha');
+    }
+
+    for (const [state, selector] of Object.entries(markers.elements)) {
+        if (!wanted.includes(state)) continue;
+        try {
+            const elements = document.querySelectorAll(selector);
+            if ([...elements].some(isVisible)) found.add(state);
+        } catch (error) {
+            // An invalid selector in the config never matches
+        }
+    }
+
+    const texts = Object.entries(markers.texts).filter(
+        ([state]) => wanted.includes(state)
+    );
+    if (texts.length && document.body) {
+        const walker = document.createTreeWalker(
+            document.body, NodeFilter.SHOW_TEXT
+        );
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const text = normalize(node.textContent);
+            if (!text) continue;
+            const parent = node.parentElement;
+            const parentText = normalize(parent.textContent);
+            for (const [state, marker] of texts) {
+                if (found.has(state)) continue;
+                if (text !== marker && parentText !== marker) continue;
+                if (isVisible(parent)) found.add(state);
+            }
+        }
+    }
+
+    return wanted.find((state) => found.has(state)) || null;
+}
+"""
+
+# Priority of the states when several markers are visible at once
+_STATE_ORDER = [
+    PageState.CAPTCHA,
+    PageState.LOGIN_ERROR,
+    PageState.QUESTIONS_REQUIRED,
+    PageState.LETTER_REQUIRED,
+    PageState.APPLIED,
+    PageState.ADDITIONAL_INFO,
+    PageState.NO_RESULTS,
+]
+
+
+def _probe_args(config: Config, states: Iterable[PageState] | None) -> list:
+    selectors = config.selectors
+    markers = {
+        "captcha_alt": selectors.captcha_alt_text,
+        "elements": {
+            PageState.ADDITIONAL_INFO: selectors.additional_info,
+        },
+        "texts": {
+            PageState.LOGIN_ERROR: selectors.login_error,
+            PageState.QUESTIONS_REQUIRED: selectors.additional_quest,
+            PageState.LETTER_REQUIRED: selectors.cover_letter_text,
+            PageState.APPLIED: selectors.vacancy_applied,
+            PageState.NO_RESULTS: selectors.vacancy_not_found,
+        },
+    }
+    wanted = set(states) if states is not None else set(_STATE_ORDER)
+    return [markers, [state for state in _STATE_ORDER if state in wanted]]
+
+
+def _states_label(args: list) -> str:
+    """Checked states of the probe arguments, used as a metric label"""
+    return ",".join(args[1])
+
+
+async def probe_page_state(
+    page: Page, config: Config, states: Iterable[PageState] | None = None
+) -> PageState:
+    """Classify the page by all known markers in one in-page evaluation.
     Args:
-        page (Page): The Playwright page after attempting login.
+        page (Page): The Playwright page to classify.
         config (Config): The application configuration.
+        states (Iterable[PageState] | None): States to look for,
+            all known states by default.
     Returns:
-        bool: True if login was successful, False otherwise.
+        PageState: The highest priority state found, UNKNOWN if none.
     """
-    logger.debug("Checking login status")
+    args = _probe_args(config, states)
     try:
-        login_error = page.get_by_text(config.selectors.login_error)
-        is_visible = await login_error.is_visible(timeout=1000)
-        return not is_visible
+        label = _states_label(args)
+        with (
+            timed(ACTION_DURATION, action="probe", target=label),
+            span("probe", states=label),
+        ):
+            state = await page.evaluate(_PROBE_SCRIPT, args)
     except Exception as exc:
-        logger.exception(f"Failed to check login errors: {exc}")
-        return True
+        logger.bind(page_url=page.url).warning(
+            f"Failed to probe page state: {exc}"
+        )
+        return PageState.UNKNOWN
 
+    result = PageState(state) if state else PageState.UNKNOWN
+    logger.bind(page_url=page.url, page_state=result).debug("Page state")
+    return result
 
-async def check_captcha(page: Page, config: Config) -> bool:
-    """Check if a captcha is present on the page.
+
+async def wait_for_page_state(
+    page: Page,
+    config: Config,
+    states: Iterable[PageState],
+    timeout: float,
+) -> PageState:
+    """Wait until any of the states appears on the page.
     Args:
-        page (Page): The Playwright page to check for captcha.
+        page (Page): The Playwright page to watch.
         config (Config): The application configuration.
+        states (Iterable[PageState]): States to wait for.
+        timeout (float): Maximum time to wait (in milliseconds).
     Returns:
-        bool: True if captcha is present, False otherwise.
+        PageState: The first state found, UNKNOWN on timeout.
     """
-    logger.debug("Checking for captcha")
+    args = _probe_args(config, states)
     try:
-        dialog = page.get_by_role("dialog")
-        captcha_img = dialog.get_by_alt_text(config.selectors.captcha_alt_text)
-        return await captcha_img.is_visible(timeout=1000)
+        label = _states_label(args)
+        with (
+            timed(ACTION_DURATION, action="wait_state", target=label),
+            span("wait_state", states=label),
+        ):
+            handle = await page.wait_for_function(
+                _PROBE_SCRIPT, arg=args, timeout=timeout, polling=100
+            )
+        result = PageState(await handle.json_value())
+    except PlaywrightTimeoutError:
+        result = PageState.UNKNOWN
     except Exception as exc:
-        logger.exception(f"Failed to check captcha : {exc}")
-        return False
+        logger.bind(page_url=page.url).warning(
+            f"Failed to wait for page state: {exc}"
+        )
+        result = PageState.UNKNOWN
 
+    logger.bind(page_url=page.url, page_state=result).debug("Page state")
+    return result
 
-async def check_no_vacancies(page: Page, config: Config) -> bool:
-    """Check if no vacancies were found on the page.
+
+async def check_login(page: Page, config: Config) -> bool:
+    """Check if login was successful.
     Args:
-        page (Page): The Playwright page to check for vacancies.
+        page (Page): The Playwright page after attempting login.
         config (Config): The application configuration.
     Returns:
-        bool: True if no vacancies were found, False otherwise.
+        bool: True if login was successful, False otherwise.
     """
-    logger.debug("Checking for no vacancies")
-    try:
-        no_results = page.get_by_text(
-            config.selectors.vacancy_not_found, exact=True
-        )
-        return await no_results.is_visible(timeout=1000)
-    except Exception as exc:
-        logger.exception(
-            f"Failed to check for vacancies after pagination: {exc}"
-        )
-        return False
+    logger.debug("Checking login status")
+    state = await probe_page_state(page, config, [PageState.LOGIN_ERROR])
+    return state != PageState.LOGIN_ERROR
 
 
-async def check_additional_questions(page: Page, config: Config) -> bool:
-    """Check if additional questions are required for application.
+async def check_session(page: Page, config: Config) -> bool:
+    """Check if the page context holds an authorized hh.ru session.
     Args:
-        page (Page): The Playwright page to check for additional questions.
+        page (Page): The Playwright page with restored cookies.
         config (Config): The application configuration.
     Returns:
-        bool: True if additional questions are required, False otherwise.
+        bool: True if the session is still valid, False otherwise.
     """
-    logger.debug("Checking for additional questions")
+    logger.debug("Checking restored session")
+    check_url = config.parsing.hh_session_check_url
+    if not await page.context.cookies(check_url):
+        return False
+    await throttle("request")
     try:
-        quest = page.get_by_text(config.selectors.additional_quest, exact=True)
-        return await quest.is_visible(timeout=1000)
-    except Exception:
+        with (
+            timed(ACTION_DURATION, action="check", target="session"),
+            span("check_session"),
+        ):
+            response = await page.request.get(
+                check_url,
+                max_redirects=0,
+                timeout=config.timeouts.connection_timeout * 1000,
+            )
+        return response.ok
+    except Exception as exc:
+        logger.exception(f"Failed to check restored session: {exc}")
         return False
 
 
-async def check_required_letter(
-    page: Page, config: Config, credentials: AuthCredentials
-) -> bool:
-    """Check if a cover letter is required and fill it if provided in credentials.
+async def check_captcha(page: Page, config: Config) -> bool:
+    """Check if a captcha is present on the page.
     Args:
-        page (Page): The Playwright page to check for required cover letter.
+        page (Page): The Playwright page to check for captcha.
         config (Config): The application configuration.
-        credentials (AuthCredentials): The authentication credentials containing the cover letter.
+    Returns:
+        bool: True if captcha is present, False otherwise.
+    """
+    logger.debug("Checking for captcha")
+    state = await probe_page_state(page, config, [PageState.CAPTCHA])
+    return state == PageState.CAPTCHA
 
+
+async def check_no_vacancies(page: Page, config: Config) -> bool:
+    """Check if no vacancies were found on the page.
+    Args:
+        page (Page): The Playwright page to check for vacancies.
+        config (Config): The application configuration.
     Returns:
-        bool: True if cover questions passed down or there is no questions, False otherwise.
+        bool: True if no vacancies were found, False otherwise.
     """
-    logger.bind(vacancy_url=page.url).debug(
-        "Checking for required cover letter"
-    )
-    try:
-        required = page.get_by_text(
-            config.selectors.cover_letter_text, exact=True
-        )
-        if await required.is_visible(timeout=1000):
-            logger.bind(vacancy_url=page.url).info(
-                "Additional letter required for a vacancy"
-            )
-            if credentials.answer_req:
-                dialog = page.get_by_role("dialog")
-                letter_input = dialog.locator(
-                    config.selectors.cover_letter_input
-                )
-                await letter_input.fill(credentials.answer_req)
-                logger.bind(vacancy_url=page.url).debug("Filled cover letter")
-                await dialog.locator(
-                    config.selectors.vacancy_response_popup
-                ).click(
-                    timeout=config.timeouts.element_timeout,
-                    no_wait_after=False,
-                )
-                logger.bind(vacancy_url=page.url).info(
-                    "Letter applied for a vacancy"
-                )
-                return True
-            else:
-                logger.bind(vacancy_url=page.url).warning(
-                    "Cover letter required but not provided in credentials"
-                )
-                return False
-        return True
-    except Exception:
-        return False
+    logger.debug("Checking for no vacancies")
+    state = await probe_page_state(page, config, [PageState.NO_RESULTS])
+    return state == PageState.NO_RESULTS
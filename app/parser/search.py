@@ -1,11 +1,54 @@
 import asyncio
+import math
+import re
+from typing import Awaitable, Callable
+from urllib.parse import (
+    parse_qs,
+    urlencode,
+    urlsplit,
+    urlunsplit,
+)
 
 from loguru import logger
 from playwright.async_api import Page
 
+from ..custom_types import PageState
 from ..exceptions import CaptchaError, NoVacanciesFoundError
-from ..utils.click_utils import safe_click
-from .checks import check_captcha, check_no_vacancies
+from ..utils.click_utils import element_state, safe_click, wait_ready
+from ..utils.metrics import STEP_DURATION, timed
+from ..utils.throttle import throttle
+from ..utils.tracing import span
+from ..models import VacancyCard
+from .checks import probe_page_state
+from .search_http import (
+    build_vacancy_card,
+    check_response_buttons,
+    fetch_vacancy_cards,
+)
+
+CachedPageLoader = Callable[
+    [str, Callable[[], Awaitable[list[VacancyCard] | None]]],
+    Awaitable[list[VacancyCard] | None],
+]
+
+# Reads the values of every vacancy card on a results page
+_CARDS_SCRIPT = """
+(cards, [selectors, respondedText]) => cards.map((card) => {
+    const text = (selector) => {
+        const node = card.querySelector(selector);
+        return node ? node.innerText.trim() : null;
+    };
+    const link = card.querySelector(selectors.link);
+    return {
+        href: link ? link.getAttribute('href') : null,
+        title: link ? link.innerText.trim() : null,
+        employer: text(selectors.employer),
+        salary: text(selectors.salary),
+        response: card.querySelector(selectors.response) !== null,
+        responded: card.innerText.includes(respondedText),
+    };
+})
+"""
 
 
 async def search_vacancies(page: Page, query: str, config) -> None:
@@ -26,9 +69,17 @@ async def search_vacancies(page: Page, query: str, config) -> None:
         timeout=config.timeouts.element_timeout * 1000,
     )
 
-    await asyncio.sleep(config.network.sleep_between_actions)
+    await wait_ready(
+        config.network,
+        element_state(
+            page.locator(config.selectors.search_input),
+            "visible",
+            timeout=config.timeouts.element_timeout * 1000,
+        ),
+    )
 
-    if await check_captcha(page, config):
+    state = await probe_page_state(page, config, [PageState.CAPTCHA])
+    if state == PageState.CAPTCHA:
         logger.error("Captcha detected during vacancy search.")
         raise CaptchaError("Captcha detected during vacancy search.")
 
@@ -37,79 +88,296 @@ async def search_vacancies(page: Page, query: str, config) -> None:
         query, timeout=config.timeouts.element_timeout * 1000
     )
 
-    await asyncio.sleep(config.network.sleep_between_actions)
+    await wait_ready(config.network)
 
+    await throttle("submit")
     await search_input.press("Enter", no_wait_after=False)
 
-    await asyncio.sleep(config.network.sleep_between_actions)
+    await wait_ready(
+        config.network,
+        element_state(
+            page.locator(config.selectors.vacancy_result),
+            "attached",
+            timeout=config.timeouts.connection_timeout * 1000,
+        ),
+    )
 
     logger.bind(query=query).success("Vacancy search completed")
 
 
-async def parse_vacancy_urls(page: Page, config) -> list[str]:
-    """Parse vacancy URLs from the search results page.
+async def parse_vacancy_cards(page: Page, config) -> list[VacancyCard]:
+    """Parse vacancy cards from the search results page.
     Args:
         page (Page): The Playwright page containing the search results.
         config (Config): The application configuration.
     Returns:
-        list[str]: A list of vacancy URLs.
+        list[VacancyCard]: The vacancy cards in results order.
     """
-    logger.bind(search_url=page.url).info("Parsing vacancy URLs")
-    links: list[str] = []
+    logger.bind(search_url=page.url).info("Parsing vacancy cards")
 
     await page.wait_for_selector(
         config.selectors.vacancy_result,
         timeout=config.timeouts.element_timeout * 1000,
     )
 
-    if await check_no_vacancies(page, config):
+    state = await probe_page_state(
+        page, config, [PageState.CAPTCHA, PageState.NO_RESULTS]
+    )
+    if state == PageState.CAPTCHA:
+        logger.error("Captcha detected on search results page.")
+        raise CaptchaError("Captcha detected on search results page.")
+
+    if state == PageState.NO_RESULTS:
         logger.warning("No vacancies found for the query.")
         raise NoVacanciesFoundError("No vacancies found for the query.")
 
-    vacancy_links = await page.query_selector_all(
-        config.selectors.vacancy_links
+    selectors = config.selectors
+    raw_cards = await page.locator(selectors.vacancy_card).evaluate_all(
+        _CARDS_SCRIPT,
+        [
+            {
+                "link": selectors.vacancy_links,
+                "employer": selectors.vacancy_card_employer,
+                "salary": selectors.vacancy_card_salary,
+                "response": selectors.vacancy_card_response,
+            },
+            selectors.vacancy_applied,
+        ],
+    )
+    cards = check_response_buttons(
+        [
+            build_vacancy_card(raw, page.url, config)
+            for raw in raw_cards
+            if raw["href"]
+        ],
+        page.url,
     )
 
-    for link in vacancy_links:
-        url = await link.get_attribute("href")
-        if url:
-            links.append(url)
-
-    logger.bind(search_url=page.url, vacancy_count=len(links)).success(
-        "Vacancy URLs parsed"
+    logger.bind(search_url=page.url, vacancy_count=len(cards)).success(
+        "Vacancy cards parsed"
     )
-    return links
+    return cards
+
+
+def build_page_url(search_url: str, page_number: int) -> str:
+    """Build the URL of a search results page.
+    Args:
+        search_url (str): URL of any page of the search results.
+        page_number (int): The page number, starting from 1.
+    Returns:
+        str: URL of the requested page.
+    """
+    parts = urlsplit(search_url)
+    query = parse_qs(parts.query, keep_blank_values=True)
+    query["page"] = [str(page_number - 1)]
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+
+async def parse_total_vacancies(page: Page, config) -> int | None:
+    """Parse the total number of found vacancies from the results header.
+    Args:
+        page (Page): The Playwright page containing the search results.
+        config (Config): The application configuration.
+    Returns:
+        int | None: The number of vacancies or None if it is not shown.
+    """
+    try:
+        header = page.locator(config.selectors.vacancies_found).first
+        text = await header.inner_text(timeout=1000)
+    except Exception as exc:
+        logger.warning(f"Failed to read total vacancies count: {exc}")
+        return None
+
+    match = re.search(r"\d[\d\s\u00a0\u202f]*", text)
+    if not match:
+        return None
+    return int(re.sub(r"\D", "", match.group()))
 
 
-async def goto_page(page: Page, page_number: int, config) -> bool:
-    """Navigate to a specific page number in the search results.
+async def goto_page(
+    page: Page, page_number: int, config, search_url: str | None = None
+) -> bool:
+    """Navigate to a specific page number in the search results by URL.
     Args:
         page (Page): The Playwright page to navigate.
-        page_number (int): The page number to navigate to.
+        page_number (int): The page number to navigate to, starting from 1.
         config (Config): The application configuration.
+        search_url (str | None): URL of the search results, defaults to
+            the current URL of the page.
     Returns:
         bool: True if navigation was successful, False otherwise.
     Raises:
         CaptchaError: If a captcha is detected on the page.
     """
     logger.bind(page_number=page_number).debug("Navigating to page")
+    await throttle("navigation")
     try:
-        pagination_block = page.locator(config.selectors.pagination_block)
-        page_button = pagination_block.get_by_text(str(page_number))
-        await safe_click(
-            page_button,
-            f"{config.selectors.pagination_block} text:{page_number}",
-            timeout=config.timeouts.element_timeout * 1000,
-            no_wait_after=False,
+        with span("goto_page", page_number=page_number):
+            await page.goto(
+                build_page_url(search_url or page.url, page_number),
+                wait_until="domcontentloaded",
+                timeout=config.timeouts.connection_timeout * 1000,
+            )
+    except Exception as exc:
+        logger.bind(page_number=page_number).warning(
+            f"Failed to open results page: {exc}"
         )
+        return False
+
+    state = await probe_page_state(
+        page, config, [PageState.CAPTCHA, PageState.NO_RESULTS]
+    )
+    if state == PageState.CAPTCHA:
+        logger.error("Captcha detected during pagination.")
+        raise CaptchaError("Captcha detected during pagination.")
+
+    return state != PageState.NO_RESULTS
+
+
+async def stream_vacancies(
+    page: Page,
+    config,
+    max_count: int,
+    on_vacancy: Callable[[VacancyCard], Awaitable[None]],
+    select: (
+        Callable[[list[VacancyCard]], Awaitable[list[VacancyCard]]] | None
+    ) = None,
+    cached: CachedPageLoader | None = None,
+    on_first_page: Callable[[], Awaitable[None]] | None = None,
+) -> None:
+    """Stream vacancy cards from the search results opened on the page.
+
+    The first page tells the total number of vacancies and the page
+    size. Further pages are loaded by URL in parallel, over HTTP with
+    the session cookies when the http search backend is used and in
+    browser tabs otherwise or when the HTTP reply looks unexpected.
+    A page is only started while the streamed cards and the pages in
+    flight fall short of max_count, so cards dropped by select are
+    replaced from further pages without planning every results page.
+    Each new card is handed to on_vacancy as soon as its page is parsed,
+    a slow consumer holds the page loads back.
+    Pages after the first one are loaded through cached when given, so
+    they can be shared with other tasks running the same search.
+
+    Args:
+        page (Page): The Playwright page with the first results page.
+        config (Config): The application configuration.
+        max_count (int): Maximum number of vacancies to stream.
+        on_vacancy (Callable): Coroutine function receiving each card.
+        select (Callable | None): Coroutine function returning the cards
+            of a page that should be streamed, all of them by default.
+        cached (CachedPageLoader | None): Coroutine function called with
+            a page URL and its loader, returning the page vacancy cards.
+        on_first_page (Callable | None): Coroutine function called once
+            the first page is parsed, from then on the page may be used
+            for something else.
+    Raises:
+        CaptchaError: If a captcha is detected on any results page.
+        NoVacanciesFoundError: If no vacancies are found for the query.
+    """
+    first_page = await parse_vacancy_cards(page, config)
+    search_url = page.url
+    total = await parse_total_vacancies(page, config)
+    if on_first_page is not None:
+        await on_first_page()
 
-        if await check_captcha(page, config):
-            logger.error("Captcha detected during pagination.")
-            raise CaptchaError("Captcha detected during pagination.")
+    page_size = max(len(first_page), 1)
+    last_page = math.ceil(total / page_size) if total is not None else None
+    logger.bind(total=total, last_page=last_page).info("Streaming vacancies")
 
-        if await check_no_vacancies(page, config):
+    seen: set[str] = set()
+    streamed = 0
+
+    async def push(cards: list[VacancyCard]) -> None:
+        nonlocal streamed
+        new_cards: list[VacancyCard] = []
+        for card in cards:
+            if card.url not in seen:
+                seen.add(card.url)
+                new_cards.append(card)
+        if select is not None:
+            new_cards = await select(new_cards)
+        for card in new_cards:
+            if streamed >= max_count:
+                return
+            streamed += 1
+            await on_vacancy(card)
+
+    await push(first_page)
+
+    next_page = 2
+    in_flight = 0
+    exhausted = False
+    progress = asyncio.Condition()
+
+    def more_needed() -> bool:
+        """Whether another page is needed, counting pages in flight as full"""
+        if exhausted or (last_page is not None and next_page > last_page):
             return False
+        return streamed + in_flight * page_size < max_count
 
-        return True
-    except Exception:
-        return False
+    async def load(page_number: int) -> list[VacancyCard]:
+        if config.parsing.search_backend == "http":
+            try:
+                with span("fetch_page", page_number=page_number):
+                    cards = await fetch_vacancy_cards(
+                        page, build_page_url(search_url, page_number), config
+                    )
+            except NoVacanciesFoundError:
+                return []
+            if cards is not None:
+                return cards
+
+        tab = await page.context.new_page()
+        try:
+            if await goto_page(tab, page_number, config, search_url):
+                with span("parse_page", page_number=page_number):
+                    return await parse_vacancy_cards(tab, config)
+            return []
+        except NoVacanciesFoundError:
+            return []
+        finally:
+            await tab.close()
+
+    async def fetch() -> None:
+        nonlocal next_page, in_flight, exhausted
+        while True:
+            async with progress:
+                await progress.wait_for(lambda: more_needed() or not in_flight)
+                if not more_needed():
+                    return
+                page_number = next_page
+                next_page += 1
+                in_flight += 1
+
+            try:
+                with (
+                    timed(STEP_DURATION, step="page"),
+                    span("page", page_number=page_number),
+                ):
+                    if cached is None:
+                        cards = await load(page_number)
+                    else:
+                        cards = await cached(
+                            build_page_url(search_url, page_number),
+                            lambda: load(page_number),
+                        )
+                # Without a total an empty page is the end of the results
+                if not cards and last_page is None:
+                    exhausted = True
+                await push(cards or [])
+            finally:
+                async with progress:
+                    in_flight -= 1
+                    progress.notify_all()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for _ in range(config.parsing.pagination_tabs):
+                group.create_task(fetch())
+    except* CaptchaError as exc_group:
+        raise exc_group.exceptions[0]
+
+    logger.bind(collected=streamed, seen=len(seen)).success(
+        "Vacancies streamed"
+    )
@@ -0,0 +1,174 @@
+import json
+from urllib.parse import urljoin
+
+from loguru import logger
+from playwright.async_api import Page
+from selectolax.lexbor import LexborHTMLParser
+
+from ..exceptions import NoVacanciesFoundError
+from ..models import VacancyCard
+from ..utils.throttle import throttle
+from ..utils.url_utils import normalize_vacancy_url, vacancy_id
+
+
+def build_vacancy_card(raw: dict, base_url: str, config) -> VacancyCard:
+    """Build a vacancy card from the values read from its markup.
+    Args:
+        raw (dict): Card values: href, title, employer, salary,
+            response and responded.
+        base_url (str): URL of the results page with the card.
+        config (Config): The application configuration.
+    Returns:
+        VacancyCard: The card with a normalized vacancy URL.
+    """
+    url = normalize_vacancy_url(
+        urljoin(base_url, raw["href"]), config.parsing.hh_base_url
+    )
+    return VacancyCard(
+        url=url,
+        vacancy_id=vacancy_id(url),
+        title=raw.get("title") or None,
+        employer=raw.get("employer") or None,
+        salary=raw.get("salary") or None,
+        has_response_button=bool(raw.get("response")),
+        responded=bool(raw.get("responded")),
+    )
+
+
+def check_response_buttons(
+    cards: list[VacancyCard], base_url: str
+) -> list[VacancyCard]:
+    """Leave the response button unknown when no card of a page has one.
+
+    hh.ru shows the button on nearly every card, so its absence from a
+    whole page means the card selector went stale rather than that no
+    vacancy can be applied to. Skipping all of them would end the task
+    with nothing applied and no error.
+
+    Args:
+        cards (list[VacancyCard]): The vacancy cards of one results page.
+        base_url (str): URL of the results page, for the log.
+    Returns:
+        list[VacancyCard]: The cards, with an unknown response button
+            if none of them has one.
+    """
+    if not cards or any(card.has_response_button for card in cards):
+        return cards
+    logger.bind(search_url=base_url, vacancy_count=len(cards)).warning(
+        "No response button on any vacancy card, check the "
+        "vacancy_card_response selector"
+    )
+    return [
+        card.model_copy(update={"has_response_button": None}) for card in cards
+    ]
+
+
+def _has_visible_text(tree: LexborHTMLParser, text: str) -> bool:
+    """Check the text of the page body, without scripts and styles.
+
+    The raw HTML also holds the texts of the i18n bundles and the initial
+    state JSON, which contain every message whether it is shown or not.
+    """
+    if tree.body is None:
+        return False
+    tree.strip_tags(["script", "style", "template", "noscript"])
+    body_text = " ".join(tree.body.text(separator=" ").split())
+    return " ".join(text.split()) in body_text
+
+
+def parse_vacancy_html(
+    html: str, base_url: str, config
+) -> list[VacancyCard] | None:
+    """Parse vacancy cards from the HTML of a search results page.
+    Args:
+        html (str): HTML of the search results page.
+        base_url (str): URL the HTML was loaded from.
+        config (Config): The application configuration.
+    Returns:
+        list[VacancyCard] | None: The vacancy cards or None if the page
+            is not a regular results page (e.g. captcha).
+    Raises:
+        NoVacanciesFoundError: If no vacancies are found on the page.
+    """
+    tree = LexborHTMLParser(html)
+
+    # Case-insensitive substring, the same as get_by_alt_text()
+    captcha_alt = json.dumps(config.selectors.captcha_alt_text)
+    captcha_selector = f"img[alt*={captcha_alt} i]"
+    if tree.css_first(captcha_selector) is not None:
+        logger.bind(search_url=base_url).warning(
+            "Captcha markers in search results HTML"
+        )
+        return None
+
+    if _has_visible_text(tree, config.selectors.vacancy_not_found):
+        raise NoVacanciesFoundError("No vacancies found for the query.")
+
+    if tree.css_first(config.selectors.vacancy_result) is None:
+        logger.bind(search_url=base_url).warning(
+            "No results container in search results HTML"
+        )
+        return None
+
+    selectors = config.selectors
+    cards: list[VacancyCard] = []
+    for node in tree.css(selectors.vacancy_card):
+        link = node.css_first(selectors.vacancy_links)
+        if link is None or not link.attributes.get("href"):
+            continue
+        employer = node.css_first(selectors.vacancy_card_employer)
+        salary = node.css_first(selectors.vacancy_card_salary)
+        raw = {
+            "href": link.attributes["href"],
+            "title": link.text(strip=True),
+            "employer": employer.text(strip=True) if employer else None,
+            "salary": salary.text(strip=True) if salary else None,
+            "response": node.css_first(selectors.vacancy_card_response),
+            "responded": selectors.vacancy_applied in node.text(),
+        }
+        cards.append(build_vacancy_card(raw, base_url, config))
+    return check_response_buttons(cards, base_url)
+
+
+async def fetch_vacancy_cards(
+    page: Page, page_url: str, config
+) -> list[VacancyCard] | None:
+    """Load a search results page without rendering it.
+
+    The request is sent from the page context, so it carries the
+    cookies and headers of the logged in session.
+
+    Args:
+        page (Page): A page of the logged in context.
+        page_url (str): URL of the search results page.
+        config (Config): The application configuration.
+    Returns:
+        list[VacancyCard] | None: The vacancy cards or None if the
+            browser has to load the page instead.
+    Raises:
+        NoVacanciesFoundError: If no vacancies are found on the page.
+    """
+    logger.bind(search_url=page_url).debug("Fetching results page over HTTP")
+    await throttle("request")
+    try:
+        response = await page.request.get(
+            page_url, timeout=config.timeouts.connection_timeout * 1000
+        )
+    except Exception as exc:
+        logger.bind(search_url=page_url).warning(
+            f"Failed to fetch results page: {exc}"
+        )
+        return None
+
+    if not response.ok or "captcha" in response.url:
+        logger.bind(search_url=page_url, status=response.status).warning(
+            "Unexpected reply for results page"
+        )
+        return None
+
+    cards = parse_vacancy_html(await response.text(), response.url, config)
+    if cards is not None:
+        logger.bind(search_url=page_url, vacancy_count=len(cards)).debug(
+            "Vacancy cards parsed from HTML"
+        )
+    return cards
@@ -1,4 +1,25 @@
+from .applied_index import AppliedIndex
 from .browser import BrowserManager
+from .cancellation import CancelFlags
+from .capture import CaptureRecorder
+from .checkpoint_store import CheckpointStore
+from .pacing import PacingController
 from .parser import process_job_search
+from .progress import ProgressReporter
+from .rate_governor import RateGovernor
+from .serp_cache import SerpCache
+from .session_cache import SessionCache
 
-__all__ = ["BrowserManager", "process_job_search"]
+__all__ = [
+    "AppliedIndex",
+    "BrowserManager",
+    "CancelFlags",
+    "CaptureRecorder",
+    "CheckpointStore",
+    "PacingController",
+    "ProgressReporter",
+    "RateGovernor",
+    "SerpCache",
+    "SessionCache",
+    "process_job_search",
+]
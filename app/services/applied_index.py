@@ -0,0 +1,92 @@
+import json
+import time
+
+from loguru import logger
+
+from ..core import Config
+from ..models import AuthCredentials, VacancyApplication
+from ..utils.url_utils import vacancy_id
+from .redis_client import get_redis
+from .session_cache import account_key
+
+
+class AppliedIndex:
+    """Per-account index of processed vacancies stored in Redis.
+
+    Every account has a hash `hh:applied:<account key>` mapping vacancy
+    IDs to the outcome and time of the last attempt, so repeat runs skip
+    vacancies that were already applied to or can not be applied to.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.history
+        self._redis_url = config.environment.redis_url
+        self._skip = {str(outcome) for outcome in self._settings.skip_outcomes}
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.enabled
+
+    async def select_new(
+        self, credentials: AuthCredentials, urls: list[str]
+    ) -> list[str]:
+        """Drop the vacancies that should not be processed again.
+        Args:
+            credentials (AuthCredentials): The account credentials.
+            urls (list[str]): Normalized vacancy URLs.
+        Returns:
+            list[str]: URLs without a skipped outcome in the index,
+                all of them if the index is unavailable.
+        """
+        if not self.enabled or not urls:
+            return urls
+
+        try:
+            entries = await get_redis(self._redis_url).hmget(
+                self._key(credentials), [self._field(url) for url in urls]
+            )
+        except Exception as exc:
+            logger.exception(f"Failed to read applied vacancies: {exc}")
+            return urls
+
+        new = [
+            url
+            for url, entry in zip(urls, entries)
+            if entry is None or json.loads(entry)["outcome"] not in self._skip
+        ]
+        if len(new) < len(urls):
+            logger.bind(skipped=len(urls) - len(new)).info(
+                "Skipped already processed vacancies"
+            )
+        return new
+
+    async def record(
+        self, credentials: AuthCredentials, application: VacancyApplication
+    ) -> None:
+        """Save the outcome of an application attempt.
+        Args:
+            credentials (AuthCredentials): The account credentials.
+            application (VacancyApplication): The attempt result.
+        """
+        if not self.enabled:
+            return
+
+        entry = json.dumps(
+            {"outcome": application.outcome, "at": int(time.time())}
+        )
+        key = self._key(credentials)
+        try:
+            async with get_redis(self._redis_url).pipeline() as pipe:
+                pipe.hset(key, self._field(application.url), entry)
+                pipe.expire(key, self._settings.ttl)
+                await pipe.execute()
+        except Exception as exc:
+            logger.exception(f"Failed to record applied vacancy: {exc}")
+
+    @staticmethod
+    def _key(credentials: AuthCredentials) -> str:
+        return f"hh:applied:{account_key(credentials)}"
+
+    @staticmethod
+    def _field(url: str) -> str:
+        return vacancy_id(url) or url
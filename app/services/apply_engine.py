@@ -0,0 +1,193 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable
+
+from loguru import logger
+from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from ..core import Config
+from ..custom_types import ApplyOutcome, PacingSignal
+from ..exceptions import CaptchaError
+from ..models import AuthCredentials, VacancyApplication
+from ..parser import apply_to_vacancy, apply_via_http, fetch_resume_hash
+from ..utils.metrics import APPLY_OUTCOMES, STEP_DURATION
+from ..utils.tracing import span
+from .pacing import TaskPacing
+
+
+class ApplyPacer:
+    """Pacing budget shared by all tabs of a task.
+
+    Application starts are spaced by a delay from the adaptive pacing
+    of the account, or a random one from the Network settings without
+    it, no matter how many tabs are applying, so parallel tabs overlap
+    page loads without raising the request rate.
+    """
+
+    def __init__(
+        self, config: Config, pacing: TaskPacing | None = None
+    ) -> None:
+        self._config = config
+        self._pacing = pacing
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait for the next free application slot."""
+        async with self._lock:
+            if self._pacing:
+                delay = await self._pacing.next_delay()
+            else:
+                delay = random.uniform(
+                    self._config.network.sleep_between_requests_min,
+                    self._config.network.sleep_between_requests_max,
+                )
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + delay
+        await asyncio.sleep(start - now)
+
+
+class ApplyEngine:
+    """Applies to vacancies from several pages of one logged in context."""
+
+    def __init__(
+        self,
+        page: Page,
+        config: Config,
+        credentials: AuthCredentials,
+        on_result: (
+            Callable[[VacancyApplication], Awaitable[None]] | None
+        ) = None,
+        pacing: TaskPacing | None = None,
+    ) -> None:
+        self._page = page
+        self._config = config
+        self._credentials = credentials
+        self._on_result = on_result
+        self._pacing = pacing
+        self._pacer = ApplyPacer(config, pacing)
+        self._tabs: list[Page] = []
+        self._resume_hash: str | None = None
+
+    async def run(self, queue: asyncio.Queue[str | None]) -> None:
+        """Apply to vacancies from the queue until it yields None.
+
+        The queue is consumed while it is still being filled. With the
+        http apply backend responses are sent without loading vacancy
+        pages and the browser is used only for the replies it can not
+        handle. Extra tabs are opened only when there is a vacancy for
+        them.
+
+        Args:
+            queue (asyncio.Queue[str | None]): URLs of the vacancies to
+                apply to, followed by None once the producer is done.
+        Raises:
+            CaptchaError: If any tab meets a captcha, the other tabs
+                are cancelled before it is raised.
+        """
+        if self._config.parsing.apply_backend == "http":
+            self._resume_hash = await fetch_resume_hash(
+                self._page, self._config
+            )
+
+        tab_count = self._config.parsing.apply_tabs
+        logger.bind(tabs=tab_count, http=self._resume_hash is not None).info(
+            "Applying to vacancies"
+        )
+        try:
+            async with asyncio.TaskGroup() as group:
+                for index in range(tab_count):
+                    group.create_task(self._worker(index, queue))
+        except* CaptchaError as exc_group:
+            raise exc_group.exceptions[0]
+        finally:
+            for tab in self._tabs:
+                await tab.close()
+            self._tabs.clear()
+
+    async def _worker(
+        self, index: int, queue: asyncio.Queue[str | None]
+    ) -> None:
+        tab: Page | None = self._page if index == 0 else None
+
+        while True:
+            vacancy_url = await queue.get()
+            if vacancy_url is None:
+                # Leave the end marker for the other tabs
+                queue.put_nowait(None)
+                return
+
+            with span("pacing"):
+                await self._pacer.wait()
+
+            started = time.monotonic()
+            signal = PacingSignal.SUCCESS
+            try:
+                with span("apply", vacancy_url=vacancy_url) as trace:
+                    tab, outcome = await self._apply(tab, vacancy_url)
+                    if trace:
+                        trace.set(outcome=outcome)
+                result = VacancyApplication(
+                    url=vacancy_url,
+                    applied=outcome == ApplyOutcome.APPLIED,
+                    outcome=outcome,
+                )
+                if outcome == ApplyOutcome.FAILED:
+                    signal = PacingSignal.ERROR
+            except CaptchaError:
+                raise
+            except Exception as exc:
+                signal = (
+                    PacingSignal.TIMEOUT
+                    if isinstance(exc, PlaywrightTimeoutError)
+                    else PacingSignal.ERROR
+                )
+                logger.bind(vacancy_url=vacancy_url).warning(
+                    f"Failed to apply to vacancy: {exc}"
+                )
+                result = VacancyApplication(
+                    url=vacancy_url,
+                    applied=False,
+                    outcome=ApplyOutcome.FAILED,
+                    error=str(exc),
+                )
+
+            latency = time.monotonic() - started
+            STEP_DURATION.labels(step="apply").observe(latency)
+            APPLY_OUTCOMES.labels(outcome=result.outcome).inc()
+            if self._pacing:
+                await self._pacing.record(signal, latency=latency)
+            if self._on_result:
+                await self._on_result(result)
+
+    async def _apply(
+        self, tab: Page | None, vacancy_url: str
+    ) -> tuple[Page | None, ApplyOutcome]:
+        """Apply over HTTP if possible, in the tab of the worker otherwise.
+
+        The tab is opened on the first vacancy that needs the browser and
+        returned for the next ones.
+        """
+        if self._resume_hash:
+            with span("apply_http"):
+                outcome = await apply_via_http(
+                    self._page,
+                    vacancy_url,
+                    self._config,
+                    self._credentials,
+                    self._resume_hash,
+                )
+            if outcome is not None:
+                return tab, outcome
+
+        if tab is None:
+            tab = await self._page.context.new_page()
+            self._tabs.append(tab)
+        with span("apply_browser"):
+            outcome = await apply_to_vacancy(
+                tab, vacancy_url, self._config, self._credentials
+            )
+        return tab, outcome
@@ -1,16 +1,118 @@
+import asyncio
+import os
+import re
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+import psutil
 from fake_useragent import UserAgent
 from loguru import logger
 from playwright.async_api import (
     Browser,
+    BrowserContext,
     Page,
     Playwright,
+    Request,
+    Route,
     async_playwright,
 )
+from pydantic import BaseModel, Field
 
-from ..core import Config
+from ..core import Blocking, BlockingProfile, Config
+from ..exceptions import BrowserStalledError
+from ..utils.metrics import BROWSER_CONTEXTS, BROWSER_RESTARTS
+from .browser_watchdog import BrowserWatchdog, TaskWatch
+from .capture import TaskCapture
+from .context_pool import ContextPool, PooledContext
+
+
+class BlockingStats(BaseModel):
+    """Counters of blocked requests for one task"""
+
+    allowed: int = 0
+    blocked: int = 0
+    blocked_by_type: dict[str, int] = Field(default_factory=dict)
+    # Estimated from Blocking.estimated_sizes, not measured
+    estimated_bytes_saved: int = 0
+
+
+class RequestBlocker:
+    """Route handler blocking unneeded resources by page type.
+
+    The profile is chosen by the URL of the page a request belongs to,
+    so login pages stay permissive while vacancy pages are stripped
+    down without any changes to the parser.
+    """
+
+    def __init__(self, settings: Blocking) -> None:
+        self._settings = settings
+        self._allow = _compile(settings.allow_url_patterns)
+        self._trackers = _compile(settings.tracker_url_patterns)
+        self._profiles = [
+            (re.compile(profile.page_url_pattern), profile)
+            for profile in settings.profiles
+        ]
+        self._denied = {
+            profile.name: _compile(profile.url_patterns)
+            for profile in settings.profiles
+        }
+        self.stats = BlockingStats()
+
+    async def attach(self, context: BrowserContext) -> None:
+        await context.route("**/*", self._handle)
+
+    async def detach(self, context: BrowserContext) -> None:
+        await context.unroute("**/*", self._handle)
+
+    async def _handle(self, route: Route) -> None:
+        request = route.request
+        if not self._should_block(request):
+            self.stats.allowed += 1
+            await route.fallback()
+            return
+
+        resource_type = request.resource_type
+        by_type = self.stats.blocked_by_type
+        by_type[resource_type] = by_type.get(resource_type, 0) + 1
+        self.stats.blocked += 1
+        # An aborted request has no response to measure, count the
+        # configured average size of its type instead
+        self.stats.estimated_bytes_saved += (
+            self._settings.estimated_sizes.get(resource_type, 0)
+        )
+        await route.abort("blockedbyclient")
+
+    def _should_block(self, request: Request) -> bool:
+        url = request.url
+        if _matches(self._allow, url):
+            return False
+
+        profile = self._profile(request)
+        if profile.block_trackers and _matches(self._trackers, url):
+            return True
+        if request.is_navigation_request():
+            return False
+        if request.resource_type in profile.resource_types:
+            return True
+        return _matches(self._denied[profile.name], url)
+
+    def _profile(self, request: Request) -> BlockingProfile:
+        try:
+            page_url = request.frame.page.url
+        except Exception:
+            page_url = ""
+        for pattern, profile in self._profiles:
+            if pattern.search(page_url):
+                return profile
+        return BlockingProfile(name="none", page_url_pattern="")
+
+
+def _compile(patterns: list[str]) -> list[re.Pattern]:
+    return [re.compile(pattern) for pattern in patterns]
+
+
+def _matches(patterns: list[re.Pattern], url: str) -> bool:
+    return any(pattern.search(url) for pattern in patterns)
 
 
 class BrowserManager:
@@ -23,9 +125,24 @@ class BrowserManager:
             platforms=["desktop"],
         )
         self.headless = not config.environment.debug
+        self._pool_settings = config.pool
+        self._blocking = config.blocking
+        self._watchdog_settings = config.watchdog
 
         self._playwright: Playwright | None = None
         self._browser: Browser | None = None
+        self.pool: ContextPool | None = None
+        self.watchdog: BrowserWatchdog | None = (
+            BrowserWatchdog(config.watchdog)
+            if config.watchdog.enabled
+            else None
+        )
+
+        # Tasks using the browser, a restart waits for them to finish
+        self._active = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._restart_lock = asyncio.Lock()
 
     async def start(self) -> None:
         """Creates a Playwright browser instance."""
@@ -51,6 +168,11 @@ class BrowserManager:
             headless=self.headless, args=launch_args
         )
 
+        if self._pool_settings.enabled:
+            self.pool = ContextPool(self._new_context, self._pool_settings)
+        if self.watchdog:
+            self.watchdog.start()
+
         logger.success("Playwright browser started")
 
     async def close(self) -> None:
@@ -61,6 +183,12 @@ class BrowserManager:
 
         logger.info("Closing Playwright browser...")
 
+        if self.watchdog:
+            await self.watchdog.stop()
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+
         await self._browser.close()
         await self._playwright.stop()
 
@@ -69,10 +197,64 @@ class BrowserManager:
 
         logger.success("Playwright browser closed")
 
-    @asynccontextmanager
-    async def context(
-        self, proxy: dict | None = None
-    ) -> AsyncGenerator[Page, None]:
+    async def restart(self, reason: str) -> None:
+        """Replace the browser with a fresh one.
+
+        A browser that does not close in time is killed with the
+        Playwright driver.
+
+        Args:
+            reason (str): Why the browser is restarted, used in metrics.
+        """
+        BROWSER_RESTARTS.labels(reason=reason).inc()
+        logger.bind(reason=reason).warning("Restarting Playwright browser")
+        try:
+            await asyncio.wait_for(
+                self.close(), self._watchdog_settings.close_timeout
+            )
+        except Exception as exc:
+            logger.bind(error=str(exc)).error(
+                "Failed to close the browser, killing it"
+            )
+            _kill_children()
+            self._browser = None
+            self._playwright = None
+            self.pool = None
+        await self.start()
+        await self.fill_pool()
+
+    def stalled(self, page: Page) -> bool:
+        """Whether the watchdog aborted the task of the page as stalled.
+        Args:
+            page (Page): The page yielded by context().
+        """
+        return bool(self.watchdog and self.watchdog.stalled(page))
+
+    async def fill_pool(self) -> None:
+        """Pre-create the pooled browser contexts."""
+        if self.pool:
+            await self.pool.fill()
+
+    def mark_failed(self, page: Page) -> None:
+        """Do not reuse the context of a page whose task failed.
+        Args:
+            page (Page): The page yielded by context().
+        """
+        if self.pool:
+            self.pool.mark_unhealthy(page)
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            "User-Agent": self._ua.random,
+            "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+            "Connection": "keep-alive",
+        }
+
+    async def _new_context(
+        self, proxy: dict | None = None, **options
+    ) -> BrowserContext:
+        """Create a browser context with the stealth init script."""
         if not self._browser:
             logger.error("Browser is not started")
             raise RuntimeError(
@@ -83,18 +265,16 @@ class BrowserManager:
             "locale": "ru-RU",
             "timezone_id": "Europe/Moscow",
             "viewport": {"width": 1920, "height": 1080},
-            "extra_http_headers": {
-                "User-Agent": self._ua.random,
-                "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                "Connection": "keep-alive",
-            },
+            "extra_http_headers": self._headers(),
+            **options,
         }
 
         if proxy:
             context_options["proxy"] = proxy
 
         context = await self._browser.new_context(**context_options)
+        BROWSER_CONTEXTS.inc()
+        context.on("close", lambda _: BROWSER_CONTEXTS.dec())
 
         await context.add_init_script(
             """
@@ -116,12 +296,207 @@ class BrowserManager:
         """
         )
 
-        page = await context.new_page()
+        return context
+
+    @asynccontextmanager
+    async def context(
+        self,
+        proxy: dict | None = None,
+        storage_state: dict | None = None,
+        capture: TaskCapture | None = None,
+    ) -> AsyncGenerator[Page, None]:
+        """Provide an isolated browser context with a single page.
+
+        Contexts come from the warm pool unless a proxy is requested or a
+        HAR is recorded, such contexts are created and closed per task.
+
+        Args:
+            proxy (dict | None): Playwright proxy settings.
+            storage_state (dict | None): Saved storage state of a previous
+                session, its cookies and local storage are restored into
+                the context.
+            capture (TaskCapture | None): Trace and HAR recording of the
+                task, its artifacts are saved when the context is closed.
+        Yields:
+            Page: The page of the context.
+        """
+        await self._recycle_if_needed()
+        self._active += 1
+        self._drained.clear()
+        try:
+            async with self._open(proxy, storage_state, capture) as page:
+                yield page
+        finally:
+            self._active -= 1
+            if self._active == 0:
+                self._drained.set()
+
+    @asynccontextmanager
+    async def _open(
+        self,
+        proxy: dict | None,
+        storage_state: dict | None,
+        capture: TaskCapture | None,
+    ) -> AsyncGenerator[Page, None]:
+        pooled: PooledContext | None = None
+        if self.pool and not proxy and not (capture and capture.records_har):
+            pooled = await self.pool.acquire()
+            context, page = pooled.context, pooled.page
+            await context.set_extra_http_headers(self._headers())
+        else:
+            options = capture.context_options() if capture else {}
+            context = await self._new_context(proxy, **options)
+            page = await context.new_page()
 
+        blocker: RequestBlocker | None = None
+        watch: TaskWatch | None = None
         try:
-            logger.bind(proxy=proxy).info("Context and page created")
+            if capture:
+                await capture.start(context)
+
+            if self._blocking.enabled:
+                blocker = RequestBlocker(self._blocking)
+                await blocker.attach(context)
+
+            if storage_state:
+                await context.add_cookies(storage_state.get("cookies", []))
+                await _restore_origins(page, storage_state.get("origins", []))
+
+            if self.watchdog:
+                watch = self.watchdog.watch(context, page)
+
+            logger.bind(
+                proxy=proxy,
+                pooled=bool(pooled),
+                restored_session=bool(storage_state),
+            ).info("Context and page created")
             yield page
+        except BaseException as exc:
+            if pooled:
+                pooled.healthy = False
+            if capture:
+                capture.fail(type(exc).__name__)
+            # A task cancelled by the watchdog ends with a clear error
+            if watch and watch.stalled:
+                task = asyncio.current_task()
+                if isinstance(exc, asyncio.CancelledError) and task:
+                    task.uncancel()
+                raise BrowserStalledError(
+                    "Browser stopped responding, the task was aborted"
+                ) from exc
+            raise
         finally:
+            if self.watchdog and watch:
+                self.watchdog.unwatch(watch)
+            release = self._release(context, page, pooled, blocker, capture)
+            if watch and watch.stalled:
+                if pooled:
+                    pooled.healthy = False
+                try:
+                    await asyncio.wait_for(
+                        release, self._watchdog_settings.close_timeout
+                    )
+                except Exception as exc:
+                    logger.warning(f"Failed to close stalled context: {exc}")
+            else:
+                await release
+            logger.bind(proxy=proxy).info("Context and page closed")
+
+    async def _release(
+        self,
+        context: BrowserContext,
+        page: Page,
+        pooled: PooledContext | None,
+        blocker: RequestBlocker | None,
+        capture: TaskCapture | None,
+    ) -> None:
+        """Close the context of a task or return it to the pool"""
+        if blocker:
+            try:
+                await blocker.detach(context)
+            except Exception as exc:
+                logger.warning(f"Failed to remove request blocker: {exc}")
+                if pooled:
+                    pooled.healthy = False
+            logger.bind(**blocker.stats.model_dump()).info(
+                "Network resources blocked, bytes saved are estimated "
+                "from the average size by resource type"
+            )
+        if capture:
+            await capture.stop(context, page)
+        if pooled and self.pool:
+            await self.pool.release(pooled)
+        else:
             await page.close()
             await context.close()
-            logger.bind(proxy=proxy).info("Context and page closed")
+        if capture:
+            await capture.finish()
+
+    async def _recycle_if_needed(self) -> None:
+        """Restart an unhealthy browser once its running tasks finished"""
+        if not self.watchdog or not self._browser:
+            return
+        async with self._restart_lock:
+            if not self._browser:
+                return
+            reason = self.watchdog.restart_reason(self._browser)
+            if reason is None:
+                return
+            logger.bind(reason=reason, active=self._active).info(
+                "Browser restart is due, waiting for running tasks"
+            )
+            await self._drained.wait()
+            await self.restart(reason)
+
+
+# Writes the saved local storage items of an origin
+_RESTORE_STORAGE_SCRIPT = """
+(items) => {
+    for (const { name, value } of items) localStorage.setItem(name, value);
+}
+"""
+
+
+async def _restore_origins(page: Page, origins: list[dict]) -> None:
+    """Write the saved local storage of each origin into the context.
+
+    Playwright only applies the origins of a storage state when a context
+    is created, which pooled contexts are not. Each origin is opened on a
+    stub document served by a route instead, so its storage is written
+    without loading the site, then the page goes back to about:blank.
+    The pool records the origins the page visited and clears their
+    storage again when the context is reset.
+
+    Args:
+        page (Page): The page of the task context.
+        origins (list[dict]): Origins of the storage state, each with
+            its "origin" and "localStorage" name and value pairs.
+    """
+
+    async def stub(route: Route) -> None:
+        await route.fulfill(status=200, content_type="text/html", body="")
+
+    restored = False
+    for origin in origins:
+        items = origin.get("localStorage") or []
+        if not items:
+            continue
+        url = origin["origin"].rstrip("/") + "/"
+        await page.route(url, stub)
+        try:
+            await page.goto(url, wait_until="commit")
+            await page.evaluate(_RESTORE_STORAGE_SCRIPT, items)
+            restored = True
+        finally:
+            await page.unroute(url, stub)
+    if restored:
+        await page.goto("about:blank")
+
+
+def _kill_children() -> None:
+    """Kill the Playwright driver and the browser of this process"""
+    for child in psutil.Process(os.getpid()).children(recursive=True):
+        try:
+            child.kill()
+        except psutil.Error:
+            continue
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import time
+
+from loguru import logger
+from playwright.async_api import Browser, BrowserContext, Page
+
+from ..core import Watchdog
+from ..utils.metrics import TASK_STALLS
+from ..utils.processes import browser_rss
+
+_MB = 1024 * 1024
+
+# Context events emitted when a browser operation has finished
+_ACTIVITY_EVENTS = ("response", "requestfinished", "requestfailed")
+
+
+class TaskWatch:
+    """Activity of the context of one running task"""
+
+    def __init__(
+        self,
+        context: BrowserContext,
+        page: Page,
+        task: asyncio.Task | None,
+    ) -> None:
+        self.context = context
+        self.page = page
+        self.task = task
+        self.last_activity = time.monotonic()
+        self.stalled = False
+
+    def touch(self, *_) -> None:
+        self.last_activity = time.monotonic()
+
+
+class BrowserWatchdog:
+    """Health of the browser of a worker process.
+
+    Running tasks are watched for the time since their context last
+    finished an operation. A page idle for longer than idle_timeout is
+    probed, and one that does not answer within probe_timeout counts as
+    stalled: its context is closed so the hung call fails at once, or
+    its task is cancelled if even that hangs. Between tasks the browser
+    is due for a restart after a stall or past the RSS, open contexts or
+    tasks thresholds.
+    """
+
+    def __init__(self, settings: Watchdog) -> None:
+        self._settings = settings
+        self._watches: set[TaskWatch] = set()
+        self._checker: asyncio.Task | None = None
+        self._had_stall = False
+        self.tasks = 0
+
+    def start(self) -> None:
+        """Check the running tasks periodically on the current loop."""
+        if self._checker is None:
+            self._checker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the checks and forget the browser counters."""
+        if self._checker:
+            self._checker.cancel()
+            try:
+                await self._checker
+            except asyncio.CancelledError:
+                pass
+            self._checker = None
+        self._watches.clear()
+        self._had_stall = False
+        self.tasks = 0
+
+    def watch(self, context: BrowserContext, page: Page) -> TaskWatch:
+        """Start watching the context of the current task.
+        Args:
+            context (BrowserContext): Context of the task.
+            page (Page): Page of the task.
+        Returns:
+            TaskWatch: The activity of the task.
+        """
+        watch = TaskWatch(context, page, asyncio.current_task())
+        for event in _ACTIVITY_EVENTS:
+            context.on(event, watch.touch)
+        self._watches.add(watch)
+        self.tasks += 1
+        return watch
+
+    def unwatch(self, watch: TaskWatch) -> None:
+        """Stop watching a task.
+        Args:
+            watch (TaskWatch): The activity returned by watch().
+        """
+        self._watches.discard(watch)
+        for event in _ACTIVITY_EVENTS:
+            try:
+                watch.context.remove_listener(event, watch.touch)
+            except Exception:
+                continue
+
+    def stalled(self, page: Page) -> bool:
+        """Whether the task of the page was aborted as stalled."""
+        return any(
+            watch.stalled for watch in self._watches if watch.page is page
+        )
+
+    def restart_reason(self, browser: Browser) -> str | None:
+        """Get why the browser should be restarted before the next task.
+        Args:
+            browser (Browser): The browser of the process.
+        Returns:
+            str | None: The reason, None while the browser is healthy.
+        """
+        settings = self._settings
+        if not browser.is_connected():
+            return "disconnected"
+        if self._had_stall:
+            return "stall"
+        if self.tasks >= settings.max_tasks:
+            return "tasks"
+        if len(browser.contexts) > settings.max_contexts:
+            return "contexts"
+        try:
+            rss = browser_rss(os.getpid())
+        except Exception as exc:
+            logger.warning(f"Failed to measure browser memory: {exc}")
+            return None
+        if rss > settings.max_rss_mb * _MB:
+            return "memory"
+        return None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._settings.check_interval)
+            for watch in list(self._watches):
+                idle = time.monotonic() - watch.last_activity
+                if not watch.stalled and idle > self._settings.idle_timeout:
+                    await self._probe(watch, idle)
+
+    async def _probe(self, watch: TaskWatch, idle: float) -> None:
+        """Check that an idle page still answers, abort its task if not"""
+        try:
+            await asyncio.wait_for(
+                watch.page.evaluate("1"), self._settings.probe_timeout
+            )
+        except TimeoutError:
+            await self._abort(watch, idle)
+            return
+        except Exception:
+            # Navigating or closed pages are handled by the task itself
+            pass
+        watch.touch()
+
+    async def _abort(self, watch: TaskWatch, idle: float) -> None:
+        watch.stalled = True
+        self._had_stall = True
+        TASK_STALLS.inc()
+        logger.bind(idle_s=round(idle, 1), url=watch.page.url).error(
+            "Browser stalled, aborting the task"
+        )
+        try:
+            await asyncio.wait_for(
+                watch.context.close(), self._settings.close_timeout
+            )
+        except Exception as exc:
+            logger.bind(error=str(exc)).warning(
+                "Failed to close stalled context, cancelling the task"
+            )
+            if watch.task and not watch.task.done():
+                watch.task.cancel()
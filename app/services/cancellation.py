@@ -0,0 +1,162 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from loguru import logger
+
+from ..core import Config
+from .redis_client import get_redis
+
+# Value of the flag of a task that did not stop within the grace period
+_TERMINATE = b"terminate"
+
+
+class CancelFlags:
+    """Cancel flags of tasks in Redis, set by the API and read by workers"""
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.cancellation
+        self._redis_url = config.environment.redis_url
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.enabled
+
+    @property
+    def grace_period(self) -> int:
+        return self._settings.grace_period
+
+    async def request(self, task_id: str, terminate: bool = False) -> bool:
+        """Ask a task to stop.
+        Args:
+            task_id (str): ID of the Celery task.
+            terminate (bool): Cancel the asyncio task of a task that did
+                not stop cooperatively, wherever it waits.
+        Returns:
+            bool: True if the flag was set.
+        """
+        if not self.enabled:
+            return False
+        try:
+            await get_redis(self._redis_url).set(
+                self._key(task_id),
+                _TERMINATE if terminate else 1,
+                ex=self._settings.ttl,
+            )
+        except Exception as exc:
+            logger.warning(f"Failed to set cancel flag: {exc}")
+            return False
+        return True
+
+    async def requested(self, task_id: str) -> bool:
+        """Check whether a task was asked to stop.
+        Args:
+            task_id (str): ID of the Celery task.
+        Returns:
+            bool: True if the flag is set.
+        """
+        try:
+            return bool(
+                await get_redis(self._redis_url).exists(self._key(task_id))
+            )
+        except Exception as exc:
+            logger.warning(f"Failed to read cancel flag: {exc}")
+            return False
+
+    async def clear(self, task_id: str) -> None:
+        """Drop the flag of a stopped task.
+        Args:
+            task_id (str): ID of the Celery task.
+        """
+        try:
+            await get_redis(self._redis_url).delete(self._key(task_id))
+        except Exception as exc:
+            logger.warning(f"Failed to clear cancel flag: {exc}")
+
+    @asynccontextmanager
+    async def watch(self, task_id: str) -> AsyncIterator["TaskCancellation"]:
+        """Poll the flag of a task while it runs.
+        Args:
+            task_id (str): ID of the Celery task.
+        Yields:
+            TaskCancellation: Cancellation of the task.
+        """
+        cancellation = TaskCancellation()
+        poller = (
+            asyncio.create_task(self._poll(task_id, cancellation))
+            if self.enabled
+            else None
+        )
+        try:
+            yield cancellation
+        finally:
+            if poller:
+                poller.cancel()
+            if cancellation.requested:
+                await self.clear(task_id)
+
+    async def _poll(
+        self, task_id: str, cancellation: "TaskCancellation"
+    ) -> None:
+        while True:
+            try:
+                flag = await get_redis(self._redis_url).get(self._key(task_id))
+            except Exception as exc:
+                logger.warning(f"Failed to read cancel flag: {exc}")
+                flag = None
+
+            if flag == _TERMINATE:
+                logger.bind(task_id=task_id).warning(
+                    "Task did not stop in time, cancelling it"
+                )
+                cancellation.terminate()
+                return
+            if flag is not None and not cancellation.requested:
+                logger.bind(task_id=task_id).warning("Task cancel requested")
+                cancellation.cancel()
+            await asyncio.sleep(self._settings.poll_interval)
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"hh:cancel:{task_id}"
+
+
+class TaskCancellation:
+    """Cancellation of one running task.
+
+    Once the cancel flag is seen, the asyncio task bound with bind() is
+    cancelled, so it stops at its next await, even mid-navigation or in
+    a pacing delay, and can return its partial result. A task that has
+    not stopped within the grace period is terminated: its asyncio task
+    is cancelled whether bound or not, e.g. while it saves its result or
+    closes its context. Killing the pool process does not work with the
+    threads pool, where the process runs other tasks too.
+    """
+
+    def __init__(self) -> None:
+        self.requested = False
+        self.terminated = False
+        self._task: asyncio.Task | None = None
+        self._root = asyncio.current_task()
+
+    def bind(self) -> None:
+        """Cancel the current asyncio task when the flag is seen."""
+        self._task = asyncio.current_task()
+        if self.requested and self._task:
+            self._task.cancel()
+
+    def unbind(self) -> None:
+        """Stop cancelling the current asyncio task."""
+        self._task = None
+
+    def cancel(self) -> None:
+        self.requested = True
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+    def terminate(self) -> None:
+        """Cancel the asyncio task the cancellation was made in."""
+        self.requested = True
+        self.terminated = True
+        if self._root and not self._root.done():
+            self._root.cancel()
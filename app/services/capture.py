@@ -0,0 +1,216 @@
+import asyncio
+import gzip
+import random
+import shutil
+import time
+from pathlib import Path
+
+from loguru import logger
+from playwright.async_api import BrowserContext, Page
+
+from ..core import Capture, Config
+from ..custom_types import JobParserStage
+
+
+class CaptureRecorder:
+    """Decides which tasks record Playwright traces and HARs.
+
+    Artifacts are kept in one directory whose size is bounded by removing
+    the oldest files.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.capture
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.enabled
+
+    def begin(self, task_id: str) -> "TaskCapture | None":
+        """Make the capture of one task.
+        Args:
+            task_id (str): ID of the Celery task.
+        Returns:
+            TaskCapture | None: The capture, None when nothing is recorded.
+        """
+        if not self.enabled:
+            return None
+        sampled = random.random() < self._settings.sample_rate
+        if not sampled and not self._settings.on_failure:
+            return None
+        return TaskCapture(self._settings, task_id, sampled)
+
+
+class TaskCapture:
+    """Playwright trace and HAR recording of one task.
+
+    A sampled task records a full trace with screenshots and DOM
+    snapshots and a HAR of its context. Other tasks record a trace of the
+    actions only, without snapshots, which is kept with a screenshot of
+    the page if the task fails or a stage exceeds its latency budget and
+    dropped otherwise.
+    """
+
+    def __init__(self, settings: Capture, task_id: str, sampled: bool) -> None:
+        self._settings = settings
+        self.task_id = task_id
+        self.sampled = sampled
+        self.reasons: list[str] = []
+        self.artifacts: list[str] = []
+
+        self._directory = Path(settings.directory)
+        self._har_path: Path | None = None
+        self._tracing = False
+        self._stage: JobParserStage | None = None
+        self._stage_started = time.monotonic()
+
+    @property
+    def records_har(self) -> bool:
+        """A HAR is set up with the context, it cannot be pooled."""
+        return self.sampled
+
+    @property
+    def keep(self) -> bool:
+        return self.sampled or bool(self.reasons)
+
+    def context_options(self) -> dict:
+        """Options of a new browser context recording the HAR."""
+        if not self.records_har:
+            return {}
+        self._har_path = Path(self._path("network.har"))
+        return {
+            "record_har_path": str(self._har_path),
+            "record_har_content": self._settings.har_content,
+        }
+
+    def stage(self, stage: JobParserStage) -> None:
+        """Mark the start of a job stage to check its latency budget.
+        Args:
+            stage (JobParserStage): The stage the task is in.
+        """
+        if stage == self._stage:
+            return
+        self._check_budget()
+        self._stage = stage
+        self._stage_started = time.monotonic()
+
+    def fail(self, reason: str) -> None:
+        """Keep the artifacts of the task.
+        Args:
+            reason (str): Why the task failed, e.g. its status.
+        """
+        self.reasons.append(reason)
+
+    async def start(self, context: BrowserContext) -> None:
+        """Start tracing the context.
+        Args:
+            context (BrowserContext): Context of the task.
+        """
+        try:
+            await context.tracing.start(
+                name=self.task_id,
+                screenshots=self.sampled,
+                snapshots=self.sampled,
+            )
+            self._tracing = True
+        except Exception as exc:
+            logger.warning(f"Failed to start tracing: {exc}")
+
+    async def stop(self, context: BrowserContext, page: Page) -> None:
+        """Save or drop the trace before the context is closed or reused.
+        Args:
+            context (BrowserContext): Context of the task.
+            page (Page): Page of the task.
+        """
+        self._check_budget()
+        if self.reasons:
+            path = self._path("failure.png")
+            try:
+                await page.screenshot(path=path, full_page=True)
+                self.artifacts.append(path)
+            except Exception as exc:
+                logger.warning(f"Failed to take a failure screenshot: {exc}")
+
+        if not self._tracing:
+            return
+        path = self._path("trace.zip") if self.keep else None
+        self._tracing = False
+        try:
+            await context.tracing.stop(path=path)
+        except Exception as exc:
+            logger.warning(f"Failed to stop tracing: {exc}")
+            return
+        if path:
+            self.artifacts.append(path)
+
+    async def finish(self) -> None:
+        """Compress the HAR written on close and apply the retention."""
+        if self._har_path:
+            if self._har_path.exists():
+                self.artifacts.append(
+                    await asyncio.to_thread(_compress, self._har_path)
+                )
+            self._har_path = None
+        if not self.artifacts:
+            return
+
+        try:
+            removed = await asyncio.to_thread(
+                _enforce_retention,
+                self._directory,
+                self._settings.max_total_mb * 1024 * 1024,
+                {Path(path) for path in self.artifacts},
+            )
+        except OSError as exc:
+            logger.warning(f"Failed to apply artifacts retention: {exc}")
+            removed = 0
+        logger.bind(
+            artifacts=self.artifacts,
+            sampled=self.sampled,
+            reasons=self.reasons,
+            removed=removed,
+        ).info("Browser artifacts saved")
+
+    def _check_budget(self) -> None:
+        if self._stage is None:
+            return
+        budget = self._settings.stage_budgets.get(self._stage)
+        elapsed = time.monotonic() - self._stage_started
+        reason = f"{self._stage} over budget"
+        if budget and elapsed > budget and reason not in self.reasons:
+            logger.bind(
+                stage=self._stage, elapsed=round(elapsed, 1), budget=budget
+            ).warning("Stage exceeded its latency budget")
+            self.reasons.append(reason)
+
+    def _path(self, suffix: str) -> str:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        return str(self._directory / f"{self.task_id}-{suffix}")
+
+
+def _compress(path: Path) -> str:
+    target = path.with_name(path.name + ".gz")
+    with path.open("rb") as source, gzip.open(target, "wb") as output:
+        shutil.copyfileobj(source, output)
+    path.unlink()
+    return str(target)
+
+
+def _enforce_retention(
+    directory: Path, max_bytes: int, keep: set[Path]
+) -> int:
+    files = sorted(
+        (path for path in directory.iterdir() if path.is_file()),
+        key=lambda path: path.stat().st_mtime,
+    )
+    total = sum(path.stat().st_size for path in files)
+    removed = 0
+    for path in files:
+        if total <= max_bytes:
+            break
+        if path in keep:
+            continue
+        total -= path.stat().st_size
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
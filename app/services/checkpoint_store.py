@@ -0,0 +1,129 @@
+import time
+
+from cryptography.fernet import InvalidToken
+from loguru import logger
+
+from ..core import Config
+from ..models import JobCheckpoint
+from .redis_client import get_redis
+from .session_cache import build_cipher
+
+
+class CheckpointStore:
+    """Encrypted job search checkpoints in Redis, one per task.
+
+    Checkpoints hold the account credentials, so they are encrypted with
+    the same key as the saved sessions and are not stored without it.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.checkpoints
+        self._redis_url = config.environment.redis_url
+
+        secret = config.environment.session_encryption_key
+        self._fernet = build_cipher(secret) if secret else None
+
+        if self._settings.enabled and not self._fernet:
+            logger.warning(
+                "SESSION_ENCRYPTION_KEY is not set, checkpoints disabled"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.enabled and self._fernet is not None
+
+    @property
+    def every(self) -> int:
+        return self._settings.every
+
+    async def save(self, checkpoint: JobCheckpoint) -> bool:
+        """Encrypt and save the checkpoint of a task.
+        Args:
+            checkpoint (JobCheckpoint): The task state.
+        Returns:
+            bool: True if the checkpoint was saved.
+        """
+        if not self.enabled:
+            return False
+
+        checkpoint.updated_at = time.time()
+        token = self._fernet.encrypt(  # type: ignore
+            checkpoint.model_dump_json().encode()
+        )
+        try:
+            await get_redis(self._redis_url).set(
+                self._key(checkpoint.task_id), token, ex=self._settings.ttl
+            )
+        except Exception as exc:
+            logger.exception(f"Failed to save checkpoint: {exc}")
+            return False
+
+        logger.bind(
+            task_id=checkpoint.task_id,
+            stage=checkpoint.stage,
+            collected=len(checkpoint.collected),
+            processed=len(checkpoint.vacancies),
+        ).debug("Checkpoint saved")
+        return True
+
+    async def load(self, task_id: str) -> JobCheckpoint | None:
+        """Load the checkpoint of a task.
+        Args:
+            task_id (str): ID of the task that saved the checkpoint.
+        Returns:
+            JobCheckpoint | None: The task state or None if not saved.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            token = await get_redis(self._redis_url).get(self._key(task_id))
+        except Exception as exc:
+            logger.exception(f"Failed to read checkpoint: {exc}")
+            return None
+
+        if token is None:
+            return None
+
+        try:
+            data = self._fernet.decrypt(token)  # type: ignore
+        except InvalidToken:
+            logger.bind(task_id=task_id).warning(
+                "Checkpoint can not be decrypted, dropping it"
+            )
+            await self.delete(task_id)
+            return None
+        return JobCheckpoint.model_validate_json(data)
+
+    async def exists(self, task_id: str) -> bool:
+        """Check if a task has a checkpoint to resume from.
+        Args:
+            task_id (str): ID of the task.
+        Returns:
+            bool: True if a checkpoint is saved.
+        """
+        if not self.enabled:
+            return False
+        try:
+            return bool(
+                await get_redis(self._redis_url).exists(self._key(task_id))
+            )
+        except Exception as exc:
+            logger.exception(f"Failed to check checkpoint: {exc}")
+            return False
+
+    async def delete(self, task_id: str) -> None:
+        """Remove the checkpoint of a task.
+        Args:
+            task_id (str): ID of the task.
+        """
+        if not self.enabled:
+            return
+        try:
+            await get_redis(self._redis_url).delete(self._key(task_id))
+        except Exception as exc:
+            logger.exception(f"Failed to remove checkpoint: {exc}")
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"hh:checkpoint:{task_id}"
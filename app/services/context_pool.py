@@ -0,0 +1,254 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+from loguru import logger
+from playwright.async_api import BrowserContext, Frame, Page
+from pydantic import BaseModel
+
+from ..core import Pool
+from ..utils.metrics import POOL_ACQUIRES, POOL_CONTEXTS
+
+# Origin storage cleared between tasks, cookies are cleared separately
+_STORAGE_TYPES = ",".join(
+    [
+        "local_storage",
+        "indexeddb",
+        "websql",
+        "file_systems",
+        "cache_storage",
+        "service_workers",
+    ]
+)
+
+
+class PoolStats(BaseModel):
+    """Counters of the browser context pool"""
+
+    hits: int = 0
+    misses: int = 0
+    waits: int = 0
+    wait_time: float = 0.0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+class PooledContext:
+    """Browser context with its page, owned by the pool"""
+
+    def __init__(self, context: BrowserContext, page: Page) -> None:
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.healthy = True
+        # Origins whose storage has to be cleared before the next task
+        self.origins: set[str] = set()
+
+        context.on("page", self._watch)
+        self._watch(page)
+        page.on("crash", lambda _: self._mark_unhealthy())
+
+    def replace_page(self, page: Page) -> None:
+        """Hand out a new page of the context with an empty session storage"""
+        self.page = page
+        page.on("crash", lambda _: self._mark_unhealthy())
+
+    def _watch(self, page: Page) -> None:
+        page.on("framenavigated", self._record_origin)
+
+    def _record_origin(self, frame: Frame) -> None:
+        url = urlsplit(frame.url)
+        if url.scheme in ("http", "https"):
+            self.origins.add(f"{url.scheme}://{url.netloc}")
+
+    def _mark_unhealthy(self) -> None:
+        self.healthy = False
+
+
+class ContextPool:
+    """Bounded pool of pre-warmed browser contexts.
+
+    Contexts are created by the factory with the stealth init script
+    already injected, reset between tasks and recreated after
+    `max_uses` tasks or when a task using them failed.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Awaitable[BrowserContext]],
+        settings: Pool,
+    ) -> None:
+        self._factory = factory
+        self._settings = settings
+        self._idle: asyncio.Queue[PooledContext] = asyncio.Queue()
+        self._in_use: dict[Page, PooledContext] = {}
+        self._size = 0
+        self._refills: set[asyncio.Task] = set()
+        self._closed = False
+        self.stats = PoolStats()
+
+    @property
+    def in_use(self) -> int:
+        return len(self._in_use)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    async def fill(self) -> None:
+        """Create contexts until the pool reaches its configured size."""
+        while self._size < self._settings.size:
+            self._size += 1
+            try:
+                self._idle.put_nowait(await self._create())
+            except Exception:
+                self._size -= 1
+                raise
+        self._report()
+        logger.bind(pool_size=self._size).success("Context pool filled")
+
+    async def acquire(self) -> PooledContext:
+        """Take a warm context from the pool.
+        Returns:
+            PooledContext: The context and its page.
+        Raises:
+            TimeoutError: If no context was released in time.
+        """
+        if not self._idle.empty():
+            self.stats.hits += 1
+            POOL_ACQUIRES.labels(result="hit").inc()
+            return self._take(self._idle.get_nowait())
+
+        if self._size < self._settings.size:
+            self.stats.misses += 1
+            POOL_ACQUIRES.labels(result="miss").inc()
+            self._size += 1
+            try:
+                return self._take(await self._create())
+            except Exception:
+                self._size -= 1
+                raise
+
+        started = time.monotonic()
+        item = await asyncio.wait_for(
+            self._idle.get(), timeout=self._settings.acquire_timeout
+        )
+        self.stats.hits += 1
+        self.stats.waits += 1
+        self.stats.wait_time += time.monotonic() - started
+        POOL_ACQUIRES.labels(result="wait").inc()
+        return self._take(item)
+
+    def mark_unhealthy(self, page: Page) -> None:
+        """Evict the context of the page when it is released.
+        Args:
+            page (Page): The page handed out by the pool.
+        """
+        item = self._in_use.get(page)
+        if item:
+            item.healthy = False
+
+    async def release(self, item: PooledContext) -> None:
+        """Return a context to the pool, resetting or evicting it.
+        Args:
+            item (PooledContext): The context taken with acquire().
+        """
+        self._in_use.pop(item.page, None)
+        item.uses += 1
+
+        if (
+            self._closed
+            or not item.healthy
+            or item.uses >= self._settings.max_uses
+        ):
+            await self._evict(item)
+            return
+
+        try:
+            await self._reset(item)
+        except Exception as exc:
+            logger.warning(f"Failed to reset pooled context: {exc}")
+            await self._evict(item)
+            return
+
+        self._idle.put_nowait(item)
+        self._report()
+        logger.bind(
+            uses=item.uses, **self.stats.model_dump()
+        ).debug("Context returned to pool")
+
+    async def close(self) -> None:
+        """Close all idle contexts, in-use ones are closed on release."""
+        self._closed = True
+        for task in list(self._refills):
+            task.cancel()
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+
+    async def _create(self) -> PooledContext:
+        context = await self._factory()
+        page = await context.new_page()
+        return PooledContext(context, page)
+
+    def _take(self, item: PooledContext) -> PooledContext:
+        self._in_use[item.page] = item
+        self._report()
+        return item
+
+    def _report(self) -> None:
+        """Update the pool gauges"""
+        POOL_CONTEXTS.labels(state="idle").set(self._idle.qsize())
+        POOL_CONTEXTS.labels(state="in_use").set(len(self._in_use))
+
+    async def _reset(self, item: PooledContext) -> None:
+        """Drop the state left by the previous task, maybe of another account.
+
+        The pages are replaced by a new one, so their session storage is
+        gone, and the storage of every origin they visited is cleared.
+        """
+        pages = item.context.pages
+        item.replace_page(await item.context.new_page())
+        for page in pages:
+            await page.close()
+
+        cdp = await item.context.new_cdp_session(item.page)
+        try:
+            for origin in item.origins:
+                await cdp.send(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": _STORAGE_TYPES},
+                )
+        finally:
+            await cdp.detach()
+        item.origins.clear()
+
+        await item.context.clear_cookies()
+        await item.context.clear_permissions()
+
+    async def _evict(self, item: PooledContext) -> None:
+        self.stats.evictions += 1
+        await self._discard(item)
+        if not self._closed:
+            task = asyncio.create_task(self._refill())
+            self._refills.add(task)
+            task.add_done_callback(self._refills.discard)
+
+    async def _discard(self, item: PooledContext) -> None:
+        self._size -= 1
+        self._report()
+        try:
+            await item.context.close()
+        except Exception as exc:
+            logger.warning(f"Failed to close pooled context: {exc}")
+
+    async def _refill(self) -> None:
+        """Keep the pool warm after an eviction"""
+        try:
+            await self.fill()
+        except Exception as exc:
+            logger.warning(f"Failed to refill context pool: {exc}")
@@ -0,0 +1,256 @@
+import hashlib
+import random
+import time
+
+from loguru import logger
+
+from ..core import Config
+from ..custom_types import PacingSignal
+from ..models import AuthCredentials, PacingState
+from .rate_governor import egress_name
+from .redis_client import get_redis
+from .session_cache import account_key
+
+# Adds an outcome to the window of one scope and updates its delay:
+# captchas, timeouts and errors multiply it, successes in a window
+# without them add rate_step to the request rate while the mean latency
+# is in limit.
+# KEYS: state hash, window list.
+# ARGV: signal, latency, window size, initial, min and max delay,
+#   captcha factor, timeout factor, error factor, rate step, latency
+#   limit, ttl, label, current time.
+_RECORD_SCRIPT = """
+local signal = ARGV[1]
+local entry = signal
+if signal == 'success' then
+    entry = 'success:' .. ARGV[2]
+end
+redis.call('LPUSH', KEYS[2], entry)
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[3]) - 1)
+
+local delay = tonumber(redis.call('HGET', KEYS[1], 'delay'))
+    or tonumber(ARGV[4])
+
+if signal == 'captcha' then
+    delay = delay * tonumber(ARGV[7])
+elseif signal == 'timeout' then
+    delay = delay * tonumber(ARGV[8])
+elseif signal == 'error' then
+    delay = delay * tonumber(ARGV[9])
+elseif signal == 'success' then
+    local clean = true
+    local total, count = 0, 0
+    for _, item in ipairs(redis.call('LRANGE', KEYS[2], 0, -1)) do
+        if item == 'captcha' or item == 'timeout' or item == 'error' then
+            clean = false
+            break
+        end
+        local latency = tonumber(string.match(item, '^success:(.+)$'))
+        if latency then
+            total = total + latency
+            count = count + 1
+        end
+    end
+    if clean and (count == 0 or total / count <= tonumber(ARGV[11])) then
+        delay = 1 / (1 / delay + tonumber(ARGV[10]))
+    end
+end
+
+delay = math.max(tonumber(ARGV[5]), math.min(tonumber(ARGV[6]), delay))
+redis.call(
+    'HSET', KEYS[1], 'delay', delay, 'label', ARGV[13], 'updated_at', ARGV[14]
+)
+redis.call('EXPIRE', KEYS[1], ARGV[12])
+redis.call('EXPIRE', KEYS[2], ARGV[12])
+return tostring(delay)
+"""
+
+# Scope name, Redis key of its state and a label shown in the API
+PacingScope = tuple[str, str, str]
+
+
+class PacingController:
+    """AIMD controller of the delay between applications.
+
+    Each account and egress proxy or IP has a delay in Redis, shared by
+    all workers, and a window of its latest outcomes. The delay shrinks
+    additively in request rate while the window has no captcha,
+    timeout or error, and grows multiplicatively on them. A task waits for the
+    largest delay of its scopes. Without Redis or when disabled the
+    static Network delays are used.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.pacing
+        self._network = config.network
+        self._redis_url = config.environment.redis_url
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.enabled
+
+    def bind(
+        self, credentials: AuthCredentials, proxy: dict | None = None
+    ) -> "TaskPacing":
+        """Make the pacing of one task.
+        Args:
+            credentials (AuthCredentials): Account the task applies from.
+            proxy (dict | None): Playwright proxy settings of the
+                context, the IP of this host is paced without it.
+        Returns:
+            TaskPacing: Pacing of the account and the egress of the task.
+        """
+        account = account_key(credentials)
+        egress = egress_name(self._network, proxy)
+        egress_hash = hashlib.sha256(egress.encode()).hexdigest()
+        scopes = [
+            ("account", f"hh:pacing:account:{account}", account),
+            ("egress", f"hh:pacing:egress:{egress_hash}", egress),
+        ]
+        return TaskPacing(self, scopes)
+
+    async def next_delay(self, scopes: list[PacingScope]) -> float:
+        """Get the delay before the next application of the scopes.
+        Args:
+            scopes (list[PacingScope]): Scopes the application counts in.
+        Returns:
+            float: Delay with jitter (in seconds).
+        """
+        if not self.enabled:
+            return self._static_delay()
+
+        try:
+            async with get_redis(self._redis_url).pipeline() as pipe:
+                for _, key, _ in scopes:
+                    pipe.hget(key, "delay")
+                values = await pipe.execute()
+        except Exception as exc:
+            logger.warning(f"Pacing state unavailable: {exc}")
+            return self._static_delay()
+
+        delay = max(
+            float(value) if value is not None else self._settings.initial_delay
+            for value in values
+        )
+        jitter = self._settings.jitter
+        return random.uniform(delay * (1 - jitter), delay * (1 + jitter))
+
+    async def record(
+        self,
+        scopes: list[PacingScope],
+        signal: PacingSignal,
+        latency: float | None = None,
+    ) -> None:
+        """Add an outcome to the windows of the scopes and adapt delays.
+        Args:
+            scopes (list[PacingScope]): Scopes the request counted in.
+            signal (PacingSignal): Outcome of the request.
+            latency (float | None): Duration of a successful request
+                (in seconds).
+        """
+        if not self.enabled:
+            return
+
+        settings = self._settings
+        try:
+            redis = get_redis(self._redis_url)
+            for scope, key, label in scopes:
+                delay = await redis.eval(
+                    _RECORD_SCRIPT,
+                    2,
+                    key,
+                    f"{key}:window",
+                    signal.value,
+                    round(latency or 0.0, 3),
+                    settings.window_size,
+                    settings.initial_delay,
+                    settings.min_delay,
+                    settings.max_delay,
+                    settings.captcha_factor,
+                    settings.timeout_factor,
+                    settings.error_factor,
+                    settings.rate_step,
+                    settings.latency_limit,
+                    settings.ttl,
+                    label,
+                    time.time(),
+                )
+                if signal != PacingSignal.SUCCESS:
+                    logger.bind(
+                        scope=scope, signal=signal, delay=float(delay)
+                    ).info("Pacing delay adapted")
+        except Exception as exc:
+            logger.warning(f"Failed to record pacing outcome: {exc}")
+
+    async def states(self) -> list[PacingState]:
+        """Get the pacing state of every known account and egress.
+        Returns:
+            list[PacingState]: States ordered by scope and key.
+        """
+        redis = get_redis(self._redis_url)
+        states: list[PacingState] = []
+        async for raw_key in redis.scan_iter(match="hh:pacing:*"):
+            key = raw_key.decode()
+            if key.endswith(":window"):
+                continue
+
+            state = await redis.hgetall(key)
+            window = await redis.lrange(f"{key}:window", 0, -1)
+            if not state:
+                continue
+
+            entries = [item.decode() for item in window]
+            latencies = [
+                float(item.split(":", 1)[1])
+                for item in entries
+                if item.startswith(f"{PacingSignal.SUCCESS}:")
+            ]
+            states.append(
+                PacingState(
+                    scope=key.split(":")[2],
+                    key=state.get(b"label", b"").decode(),
+                    delay=float(state[b"delay"]),
+                    successes=len(latencies),
+                    captchas=entries.count(PacingSignal.CAPTCHA),
+                    timeouts=entries.count(PacingSignal.TIMEOUT),
+                    errors=entries.count(PacingSignal.ERROR),
+                    mean_latency=(
+                        round(sum(latencies) / len(latencies), 3)
+                        if latencies
+                        else None
+                    ),
+                    updated_at=float(state.get(b"updated_at", 0)) or None,
+                )
+            )
+        return sorted(states, key=lambda state: (state.scope, state.key))
+
+    def _static_delay(self) -> float:
+        return random.uniform(
+            self._network.sleep_between_requests_min,
+            self._network.sleep_between_requests_max,
+        )
+
+
+class TaskPacing:
+    """Pacing of the account and the egress of one task."""
+
+    def __init__(
+        self, controller: PacingController, scopes: list[PacingScope]
+    ) -> None:
+        self._controller = controller
+        self._scopes = scopes
+
+    async def next_delay(self) -> float:
+        """Get the delay before the next application (in seconds)."""
+        return await self._controller.next_delay(self._scopes)
+
+    async def record(
+        self, signal: PacingSignal, latency: float | None = None
+    ) -> None:
+        """Report the outcome of a request of the task.
+        Args:
+            signal (PacingSignal): Outcome of the request.
+            latency (float | None): Duration of a successful request
+                (in seconds).
+        """
+        await self._controller.record(self._scopes, signal, latency)
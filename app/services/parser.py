@@ -1,25 +1,54 @@
 import asyncio
-import random
+import time
 from typing import Callable
 
 from loguru import logger
 from playwright.async_api import Page
 
 from ..core import Config
-from ..custom_types import JobParserStage, JobSearchStatus
+from ..custom_types import (
+    JobParserStage,
+    JobSearchStatus,
+    PacingSignal,
+    SkipReason,
+)
 from ..exceptions import (
     AuthCredentialsError,
     CaptchaError,
     NoVacanciesFoundError,
 )
-from ..models import AuthCredentials, JobSearchResult
+from ..models import (
+    AuthCredentials,
+    JobCheckpoint,
+    JobSearchResult,
+    VacancyApplication,
+    VacancyCard,
+)
 from ..parser import (
-    apply_to_vacancy,
     goto_page,
     login,
-    parse_vacancy_urls,
+    restore_session,
     search_vacancies,
+    stream_vacancies,
 )
+from ..utils import reset_throttle, set_throttle
+from ..utils.metrics import (
+    CAPTCHAS,
+    STAGE_DURATION,
+    STEP_DURATION,
+    TASK_RESULTS,
+    timed,
+)
+from ..utils.tracing import span
+from .applied_index import AppliedIndex
+from .apply_engine import ApplyEngine
+from .cancellation import TaskCancellation
+from .checkpoint_store import CheckpointStore
+from .pacing import PacingController
+from .rate_governor import RateGovernor
+from .serp_cache import SerpCache
+from .session_cache import SessionCache
+from .vacancy_filter import VacancyFilter
 
 
 async def process_job_search(
@@ -29,6 +58,15 @@ async def process_job_search(
     search_query: str,
     max_applications: int,
     progress_callback: Callable | None = None,
+    session_cache: SessionCache | None = None,
+    applied_index: AppliedIndex | None = None,
+    serp_cache: SerpCache | None = None,
+    checkpoint: JobCheckpoint | None = None,
+    checkpoint_store: CheckpointStore | None = None,
+    rate_governor: RateGovernor | None = None,
+    pacing_controller: PacingController | None = None,
+    cancellation: TaskCancellation | None = None,
+    proxy: dict | None = None,
 ) -> JobSearchResult:
     """Process a job search workflow including login, search, parsing, and applications.
 
@@ -42,7 +80,16 @@ async def process_job_search(
         credentials (AuthCredentials): The authentication credentials for login.
         search_query (str): The search query string for job vacancies.
         max_applications (int, optional): Maximum number of applications to attempt. Defaults to 200.
-        progress_callback (Callable): Function to update celery task progress
+        progress_callback (Callable): Function to update celery task progress, also given each processed vacancy.
+        session_cache (SessionCache | None): Cache to save the session to after a full login.
+        applied_index (AppliedIndex | None): Index of vacancies processed in previous runs to skip.
+        serp_cache (SerpCache | None): Search results pages shared with other tasks.
+        checkpoint (JobCheckpoint | None): State of the task, filled in while it runs. A checkpoint loaded from a previous run resumes it: the search URL is opened directly, pending vacancies are applied to first and processed ones are not repeated.
+        checkpoint_store (CheckpointStore | None): Store the checkpoint is saved to at stage boundaries and every few vacancies.
+        rate_governor (RateGovernor | None): Limiter all hh.ru requests of the task wait on, shared with the other workers.
+        pacing_controller (PacingController | None): Controller of the delay between applications, it learns from their outcomes and captchas.
+        cancellation (TaskCancellation | None): Cancellation of the task, once requested the workflow stops at its next step and returns the partial result.
+        proxy (dict | None): Playwright proxy settings of the page context, its requests are limited and paced per proxy instead of per host.
 
     Returns:
         JobSearchResult: The result of the job search process, including status, applied count, total vacancies, and progress.
@@ -51,97 +98,310 @@ async def process_job_search(
         CaptchaError: If a CAPTCHA is encountered during the process.
         Exception: If a element was not found
     """
-    applied_count = 0
-    total_vacancies = []
-    result = JobSearchResult(
-        status=JobSearchStatus.STARTED, applied=0, total=0, progress=0.0
+    result = (
+        checkpoint.partial_result(JobSearchStatus.STARTED)
+        if checkpoint
+        else JobSearchResult(
+            status=JobSearchStatus.STARTED, applied=0, total=0, progress=0.0
+        )
     )
+    collecting = True
+    current_stage = JobParserStage.WAITING
+    stage_started = time.monotonic()
+
+    collected = list(checkpoint.collected) if checkpoint else []
+
+    def finish_stage() -> None:
+        """Observe the duration of the current stage"""
+        nonlocal stage_started
+        now = time.monotonic()
+        if current_stage != JobParserStage.WAITING:
+            STAGE_DURATION.labels(stage=current_stage).observe(
+                now - stage_started
+            )
+        stage_started = now
 
     def update_progress(stage: JobParserStage, progress: float, **kwargs):
         """Update current progress and callback"""
+        nonlocal current_stage
+        if stage != current_stage:
+            finish_stage()
+        current_stage = stage
         result.progress = progress
         if progress_callback:
             progress_callback(stage=stage, progress=progress, **kwargs)
 
+    def update_pipeline_progress(
+        vacancy: VacancyApplication | None = None,
+    ) -> None:
+        """Report collected and processed vacancies of the two stages"""
+        processed = len(result.vacancies)
+        if collecting:
+            collected_share = result.total / max_applications
+            expected = max_applications
+        else:
+            collected_share = 1.0
+            expected = max(result.total, 1)
+        update_progress(
+            JobParserStage.PARSING if collecting else JobParserStage.APPLY,
+            progress=20 + collected_share * 10 + processed / expected * 70,
+            applied=result.applied,
+            total=result.total,
+            processed=processed,
+            skipped=result.skipped,
+            vacancy=vacancy,
+        )
+
+    async def save_checkpoint() -> None:
+        """Save the task state to resume it after an interruption"""
+        if not (checkpoint and checkpoint_store):
+            return
+        checkpoint.stage = current_stage
+        checkpoint.collected = list(collected)
+        checkpoint.collected_all = checkpoint.collected_all or not collecting
+        checkpoint.vacancies = list(result.vacancies)
+        checkpoint.skip_reasons = dict(result.skip_reasons)
+        result.resumable = await checkpoint_store.save(checkpoint)
+
+    async def drop_checkpoint() -> None:
+        """Remove the checkpoint of a task that needs no resume"""
+        result.resumable = False
+        if checkpoint and checkpoint_store:
+            await checkpoint_store.delete(checkpoint.task_id)
+
+    remaining = max_applications - len(collected)
+    if checkpoint and checkpoint.collected_all:
+        remaining = 0
+
+    pacing = (
+        pacing_controller.bind(credentials, proxy)
+        if pacing_controller
+        else None
+    )
+    throttle_token = set_throttle(
+        rate_governor.bind(credentials, proxy) if rate_governor else None
+    )
+    if cancellation:
+        cancellation.bind()
     try:
         # 1. Authorization
         update_progress(JobParserStage.AUTH, 5)
-        await login(page, credentials, config)
+        with span("auth"):
+            with (
+                timed(STEP_DURATION, step="restore_session"),
+                span("restore_session"),
+            ):
+                restored = await restore_session(page, config)
+            if not restored:
+                with timed(STEP_DURATION, step="login"), span("login"):
+                    await login(page, credentials, config)
+                if session_cache:
+                    await session_cache.save(
+                        credentials, await page.context.storage_state()
+                    )
         update_progress(JobParserStage.AUTH, 10)
+        await save_checkpoint()
 
-        # 2. Job search
+        # 2. Job search, resumed runs open the saved results directly
         update_progress(JobParserStage.SEARCH, 15)
-        await search_vacancies(page, search_query, config)
+        with span(
+            "search", resumed=bool(checkpoint and checkpoint.search_url)
+        ):
+            if remaining <= 0:
+                logger.info("All vacancies collected before, search skipped")
+            elif checkpoint and checkpoint.search_url:
+                if not await goto_page(page, 1, config, checkpoint.search_url):
+                    remaining = 0
+            else:
+                with timed(STEP_DURATION, step="search"):
+                    await search_vacancies(page, search_query, config)
+                if checkpoint:
+                    checkpoint.search_url = page.url
         update_progress(JobParserStage.SEARCH, 20)
+        await save_checkpoint()
 
-        # 3. Parsing vacancies with pagination
-        current_page = 1
-        while len(total_vacancies) < max_applications:
-            try:
-                vacancy_urls = await parse_vacancy_urls(page, config)
-                total_vacancies.extend(vacancy_urls)
-            except NoVacanciesFoundError as exc:
-                logger.warning(f"No more vacancies found: {exc}")
-                break
+        # 3. Parsing vacancies with pagination while applying to them
+        queue: asyncio.Queue[str | None] = asyncio.Queue(
+            maxsize=config.parsing.pipeline_queue_size
+        )
 
-            if len(total_vacancies) >= max_applications:
-                break
+        vacancy_filter = VacancyFilter(config)
 
-            current_page += 1
-            if not await goto_page(page, current_page, config):
-                break
+        known = set(collected)
 
-        # Limit the number
-        total_vacancies = total_vacancies[:max_applications]
-        result.total = len(total_vacancies)
-        update_progress(JobParserStage.PARSING, 30, total=len(total_vacancies))
+        async def on_vacancy(card: VacancyCard) -> None:
+            """Hand a collected vacancy to the apply stage"""
+            await queue.put(card.url)
+            collected.append(card.url)
+            result.total += 1
+            update_pipeline_progress()
 
-        # 4. Applications
-        for i, vacancy_url in enumerate(total_vacancies):
-            progress = 30 + ((i + 1) / len(total_vacancies)) * 70
+        def skip(reason: SkipReason, count: int = 1) -> None:
+            """Count skipped vacancies by reason"""
+            if not count:
+                return
+            result.skipped += count
+            result.skip_reasons[reason] = (
+                result.skip_reasons.get(reason, 0) + count
+            )
 
-            try:
-                success = await apply_to_vacancy(
-                    page, vacancy_url, config, credentials
+        async def select_vacancies(
+            cards: list[VacancyCard],
+        ) -> list[VacancyCard]:
+            """Skip unwinnable vacancies and ones processed before"""
+            selected: list[VacancyCard] = []
+            for card in cards:
+                if card.url in known:
+                    # Collected before the task was resumed
+                    continue
+                reason = vacancy_filter.skip_reason(card)
+                if reason:
+                    skip(reason)
+                else:
+                    selected.append(card)
+
+            if applied_index and selected:
+                new_urls = set(
+                    await applied_index.select_new(
+                        credentials, [card.url for card in selected]
+                    )
                 )
-                if success:
-                    applied_count += 1
-                    result.applied = applied_count
-            except CaptchaError:
-                raise
-            except Exception:
-                pass
-
-            update_progress(
-                JobParserStage.APPLY,
-                progress=progress,
-                applied=applied_count,
-                total=len(total_vacancies),
-            )
+                skip(
+                    SkipReason.ALREADY_PROCESSED,
+                    len(selected) - len(new_urls),
+                )
+                selected = [card for card in selected if card.url in new_urls]
+            return selected
 
-            # Delay between applications
-            delay = random.uniform(
-                config.network.sleep_between_requests_min,
-                config.network.sleep_between_requests_max,
-            )
-            await asyncio.sleep(delay)
+        pending_queued = False
+
+        async def queue_pending() -> None:
+            """Hand the vacancies pending in the checkpoint to the apply stage
+
+            The first apply worker uses the main page, so they are queued
+            only once the first search page on it has been parsed.
+            """
+            nonlocal pending_queued
+            if pending_queued:
+                return
+            pending_queued = True
+            for url in checkpoint.pending if checkpoint else []:
+                await queue.put(url)
 
-        update_progress(JobParserStage.COMPLETE, 100, applied=applied_count)
+        async def collect_vacancies() -> None:
+            nonlocal collecting
+            try:
+                if remaining > 0:
+                    await stream_vacancies(
+                        page,
+                        config,
+                        remaining,
+                        on_vacancy,
+                        select_vacancies,
+                        serp_cache.get if serp_cache else None,
+                        on_first_page=queue_pending,
+                    )
+            except NoVacanciesFoundError as exc:
+                logger.warning(f"No vacancies found: {exc}")
+            await queue_pending()
+            collecting = False
+            await queue.put(None)
+            update_pipeline_progress()
+            await save_checkpoint()
+            if serp_cache:
+                logger.bind(
+                    hit_rate=round(serp_cache.stats.hit_rate, 2),
+                    **serp_cache.stats.model_dump(),
+                ).info("Search results cache stats")
+
+        # 4. Applications
+        async def on_vacancy_result(vacancy: VacancyApplication) -> None:
+            """Record a vacancy result, they may arrive out of order"""
+            result.vacancies.append(vacancy)
+            if vacancy.applied:
+                result.applied += 1
+            update_pipeline_progress(vacancy)
+            if applied_index:
+                await applied_index.record(credentials, vacancy)
+            if (
+                checkpoint_store
+                and len(result.vacancies) % checkpoint_store.every == 0
+            ):
+                await save_checkpoint()
+
+        engine = ApplyEngine(
+            page, config, credentials, on_vacancy_result, pacing
+        )
+        try:
+            with span("pipeline", max_applications=max_applications) as trace:
+                async with asyncio.TaskGroup() as group:
+                    group.create_task(collect_vacancies())
+                    group.create_task(engine.run(queue))
+                if trace:
+                    trace.set(
+                        total=result.total,
+                        applied=result.applied,
+                        skipped=result.skipped,
+                    )
+        except* Exception as exc_group:
+            raise exc_group.exceptions[0]
+
+        update_progress(JobParserStage.COMPLETE, 100, applied=result.applied)
+        await drop_checkpoint()
         result.status = JobSearchStatus.SUCCESS
         return result
 
+    except asyncio.CancelledError:
+        if not (cancellation and cancellation.requested):
+            # Aborted by the watchdog or the worker shutting down, the
+            # caller builds the partial result from the checkpoint
+            await asyncio.shield(save_checkpoint())
+            raise
+        # Cancelled by the user, not by the worker shutting down
+        task = asyncio.current_task()
+        if task:
+            task.uncancel()
+        cancellation.unbind()
+        # A task terminated after the grace period is cancelled again,
+        # the save goes on and the caller returns the checkpoint
+        await asyncio.shield(save_checkpoint())
+        result.status = JobSearchStatus.CANCELLED
+        result.message = "Task cancelled"
+        logger.bind(
+            stage=current_stage,
+            applied=result.applied,
+            processed=len(result.vacancies),
+        ).warning("Task cancelled, returning partial results")
+        return result
     except CaptchaError as exc:
+        CAPTCHAS.labels(stage=current_stage).inc()
+        if pacing:
+            await pacing.record(PacingSignal.CAPTCHA)
+        await save_checkpoint()
         result.status = JobSearchStatus.CAPTCHA_REQUIRED
         result.message = str(exc)
-        result.applied = applied_count
         return result
     except AuthCredentialsError as exc:
+        if session_cache:
+            await session_cache.invalidate(credentials)
+        await drop_checkpoint()
         result.status = JobSearchStatus.INVALID_CREDENTIALS
         result.message = str(exc)
-        result.applied = applied_count
         return result
     except Exception as exc:
+        await save_checkpoint()
         result.status = JobSearchStatus.ERROR
         result.message = str(exc)
-        result.applied = applied_count
         return result
+    finally:
+        if cancellation:
+            cancellation.unbind()
+        reset_throttle(throttle_token)
+        if current_stage != JobParserStage.COMPLETE:
+            finish_stage()
+        TASK_RESULTS.labels(status=result.status).inc()
+        if rate_governor and rate_governor.enabled:
+            logger.bind(
+                mean_wait_s=round(rate_governor.stats.mean_wait, 3),
+                **rate_governor.stats.model_dump(),
+            ).info("Rate limiter stats")
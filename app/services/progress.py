@@ -0,0 +1,249 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from celery import Task
+from loguru import logger
+
+from ..core import Config, Progress
+from ..custom_types import JobParserStage, JobSearchStatus
+from ..models import VacancyApplication
+from ..utils.metrics import PROGRESS_UPDATES
+from .redis_client import get_redis
+
+
+class ProgressReporter:
+    """Reports the progress of tasks to the Celery backend and Redis"""
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.progress
+        self._redis_url = config.environment.redis_url
+
+    @property
+    def publishes(self) -> bool:
+        return self._settings.publish
+
+    @staticmethod
+    def channel(task_id: str) -> str:
+        """Name of the Redis channel with the progress deltas of a task."""
+        return f"hh:progress:{task_id}"
+
+    @asynccontextmanager
+    async def report(
+        self, task: Task, task_id: str
+    ) -> AsyncIterator["TaskProgress"]:
+        """Write the progress of a task while it runs.
+        Args:
+            task (Task): The Celery task writing its state.
+            task_id (str): ID of the Celery task.
+        Yields:
+            TaskProgress: Progress of the task.
+        """
+        progress = TaskProgress(self._settings, task, task_id, self._publish)
+        progress.start()
+        try:
+            yield progress
+        except Exception as exc:
+            progress.finish(status=JobSearchStatus.ERROR, message=str(exc))
+            raise
+        finally:
+            await progress.close()
+
+    async def events(
+        self, task_id: str, last_id: int = 0
+    ) -> AsyncIterator[dict[str, Any] | None]:
+        """Follow the progress deltas of a task.
+
+        The kept deltas after last_id are replayed first, then the new
+        ones are read from the channel, which is subscribed to before the
+        replay so that no delta is missed in between.
+
+        Args:
+            task_id (str): ID of the Celery task.
+            last_id (int): Sequence number of the last delta received.
+        Yields:
+            dict | None: Delta with its "seq" number, None when no delta
+                came within the keepalive interval.
+        """
+        redis = get_redis(self._redis_url)
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(self.channel(task_id))
+            for data in await redis.lrange(self._history_key(task_id), 0, -1):
+                delta = json.loads(data)
+                if delta["seq"] > last_id:
+                    last_id = delta["seq"]
+                    yield delta
+                    if delta.get("done"):
+                        return
+
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=self._settings.keepalive,
+                )
+                if message is None:
+                    yield None
+                    continue
+                delta = json.loads(message["data"])
+                if delta["seq"] <= last_id:
+                    continue
+                last_id = delta["seq"]
+                yield delta
+                if delta.get("done"):
+                    return
+        finally:
+            await pubsub.aclose()
+
+    async def _publish(self, task_id: str, delta: dict[str, Any]) -> None:
+        if not self._settings.publish:
+            return
+        data = json.dumps(delta, default=str)
+        history = self._history_key(task_id)
+        try:
+            async with get_redis(self._redis_url).pipeline() as pipe:
+                pipe.rpush(history, data)
+                pipe.ltrim(history, -self._settings.history_size, -1)
+                pipe.expire(history, self._settings.ttl)
+                pipe.publish(self.channel(task_id), data)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning(f"Failed to publish task progress: {exc}")
+
+    @classmethod
+    def _history_key(cls, task_id: str) -> str:
+        return f"{cls.channel(task_id)}:history"
+
+
+class TaskProgress:
+    """Progress of one running task.
+
+    update() only records the state, a writer task on the event loop
+    writes it to the result backend at most once per interval, so the
+    updates in between are coalesced. A stage change is written at once
+    and the last state when the task ends. Each write publishes the
+    fields changed since the previous one.
+    """
+
+    def __init__(
+        self,
+        settings: Progress,
+        task: Task,
+        task_id: str,
+        publish: Callable[[str, dict[str, Any]], Awaitable[None]],
+    ) -> None:
+        self._settings = settings
+        self._task = task
+        self.task_id = task_id
+        self._publish = publish
+
+        self._meta: dict[str, Any] = {}
+        self._delta: dict[str, Any] = {}
+        self._final: dict[str, Any] | None = None
+        self._stage: JobParserStage | None = None
+        self._sequence = 0
+        self._last_write = float("-inf")
+        self._changed = asyncio.Event()
+        self._urgent = asyncio.Event()
+        self._closing = False
+        self._writer: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the writer on the current loop."""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+
+    def update(
+        self,
+        stage: JobParserStage,
+        progress: float,
+        vacancy: VacancyApplication | None = None,
+        **kwargs,
+    ) -> None:
+        """Record the progress of the task, used as the progress callback.
+        Args:
+            stage (JobParserStage): The stage the task is in.
+            progress (float): Progress of the task (0-100).
+            vacancy (VacancyApplication | None): Vacancy just processed,
+                published with the next delta but not written to the
+                result backend.
+            **kwargs: Other fields, e.g. applied and total counts.
+        """
+        if vacancy:
+            self._delta.setdefault("vacancies", []).append(
+                vacancy.model_dump(mode="json")
+            )
+        for key, value in {
+            "stage": stage,
+            "progress": progress,
+            **kwargs,
+        }.items():
+            if key not in self._meta or self._meta[key] != value:
+                self._meta[key] = value
+                self._delta[key] = value
+
+        if self._changed.is_set():
+            PROGRESS_UPDATES.labels(result="coalesced").inc()
+        self._changed.set()
+        if stage != self._stage:
+            self._stage = stage
+            self._urgent.set()
+
+    def finish(self, **fields: Any) -> None:
+        """Publish the end of the task once its progress is written.
+        Args:
+            **fields: Final fields, e.g. the status of the result.
+        """
+        self._final = {**fields, "done": True}
+
+    async def close(self) -> None:
+        """Write the last state and stop the writer."""
+        self._closing = True
+        self._changed.set()
+        self._urgent.set()
+        if self._writer:
+            await self._writer
+            self._writer = None
+        if self._final is not None:
+            self._sequence += 1
+            await self._publish(
+                self.task_id, {"seq": self._sequence, **self._final}
+            )
+            self._final = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._changed.wait()
+            delay = self._last_write + self._settings.interval - (
+                time.monotonic()
+            )
+            if delay > 0 and not self._urgent.is_set():
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._urgent.wait(), delay)
+            self._changed.clear()
+            self._urgent.clear()
+            if self._delta:
+                await self._write()
+            if self._closing and not self._delta:
+                return
+
+    async def _write(self) -> None:
+        meta, delta = dict(self._meta), self._delta
+        self._delta = {}
+        self._last_write = time.monotonic()
+        self._sequence += 1
+        PROGRESS_UPDATES.labels(result="written").inc()
+
+        # The result backend client is blocking, keep it off the loop
+        try:
+            await asyncio.to_thread(
+                self._task.update_state,
+                task_id=self.task_id,
+                state="PROGRESS",
+                meta=meta,
+            )
+        except Exception as exc:
+            logger.warning(f"Failed to write task progress: {exc}")
+        await self._publish(self.task_id, {"seq": self._sequence, **delta})
@@ -0,0 +1,203 @@
+import asyncio
+import hashlib
+import random
+import socket
+import time
+
+from loguru import logger
+from pydantic import BaseModel
+
+from ..core import Config, Network
+from ..models import AuthCredentials
+from ..utils.metrics import RATE_WAIT
+from ..utils.throttle import Throttle
+from .redis_client import get_redis
+from .session_cache import account_key
+
+# Takes one token from every bucket or none of them. KEYS are the bucket
+# hashes, ARGV holds a rate and a burst per key. Returns "0" when the
+# tokens are taken, otherwise the seconds until all buckets have one.
+# Redis time is used, so clocks of the worker hosts do not matter.
+_ACQUIRE_SCRIPT = """
+local now_time = redis.call('TIME')
+local now = tonumber(now_time[1]) + tonumber(now_time[2]) / 1000000
+local tokens = {}
+local wait = 0
+
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(bucket[1]) or burst
+    local updated = tonumber(bucket[2]) or now
+    available = math.min(burst, available + math.max(0, now - updated) * rate)
+    tokens[i] = available
+    if available < 1 then
+        wait = math.max(wait, (1 - available) / rate)
+    end
+end
+
+if wait > 0 then
+    return tostring(wait)
+end
+
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    redis.call('HSET', key, 'tokens', tokens[i] - 1, 'ts', now)
+    redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+return '0'
+"""
+
+
+def egress_name(settings: Network, proxy: dict | None = None) -> str:
+    """Name of the proxy or IP the requests of a context leave through"""
+    if proxy:
+        return proxy["server"]
+    return settings.egress_id or socket.gethostname()
+
+
+class RateStats(BaseModel):
+    """Counters of the request slots taken by this process"""
+
+    acquired: int = 0
+    waited: int = 0
+    wait_seconds: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_seconds / self.acquired if self.acquired else 0.0
+
+
+class RateGovernor:
+    """Token buckets in Redis pacing hh.ru requests of all workers.
+
+    Every request takes a token from the global bucket, the bucket of
+    the account and the bucket of the egress proxy or IP at once, so
+    adding workers does not raise the request rate hh.ru sees. Buckets
+    live in `hh:rate:<scope>:<id>` hashes, a limit with rate 0 is off.
+    When Redis is unavailable requests are not delayed.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.network
+        self._redis_url = config.environment.redis_url
+        self.stats = RateStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.rate_limit_enabled
+
+    def bind(
+        self, credentials: AuthCredentials, proxy: dict | None = None
+    ) -> Throttle | None:
+        """Make a limiter for the requests of one task.
+        Args:
+            credentials (AuthCredentials): Account the requests are sent
+                from.
+            proxy (dict | None): Playwright proxy settings of the
+                context, the IP of this host is limited without it.
+        Returns:
+            Throttle | None: Coroutine function for set_throttle(), None
+                when rate limiting is disabled.
+        """
+        if not self.enabled:
+            return None
+
+        buckets = self._buckets(
+            account_key(credentials), egress_name(self._settings, proxy)
+        )
+        if not buckets:
+            return None
+
+        async def limiter(kind: str) -> None:
+            await self.acquire(buckets, kind)
+
+        return limiter
+
+    async def acquire(
+        self, buckets: list[tuple[str, float, int]], kind: str
+    ) -> float:
+        """Wait until every bucket has a token and take them.
+        Args:
+            buckets (list[tuple[str, float, int]]): Redis key, rate and
+                burst of each bucket.
+            kind (str): Kind of the request, used in logs and stats.
+        Returns:
+            float: Seconds spent waiting for the slot.
+        """
+        keys = [key for key, _, _ in buckets]
+        limits = [
+            value for _, rate, burst in buckets for value in (rate, burst)
+        ]
+        started = time.monotonic()
+        deadline = started + self._settings.rate_limit_max_wait
+        redis = get_redis(self._redis_url)
+
+        while True:
+            try:
+                wait = float(
+                    await redis.eval(
+                        _ACQUIRE_SCRIPT, len(keys), *keys, *limits
+                    )
+                )
+            except Exception as exc:
+                logger.warning(f"Rate limiter unavailable: {exc}")
+                break
+
+            if wait <= 0:
+                break
+            if time.monotonic() + wait > deadline:
+                logger.bind(kind=kind).warning(
+                    "Request slot wait timed out, sending request anyway"
+                )
+                break
+            # Jitter keeps the waiting workers from retrying in lockstep
+            await asyncio.sleep(wait + random.uniform(0, wait / 2))
+
+        waited = time.monotonic() - started
+        await self._record(kind, waited)
+        return waited
+
+    def _buckets(
+        self, account: str, egress: str
+    ) -> list[tuple[str, float, int]]:
+        settings = self._settings
+        egress_key = hashlib.sha256(egress.encode()).hexdigest()
+        buckets = [
+            ("hh:rate:global", settings.global_rate, settings.global_burst),
+            (
+                f"hh:rate:account:{account}",
+                settings.account_rate,
+                settings.account_burst,
+            ),
+            (
+                f"hh:rate:egress:{egress_key}",
+                settings.egress_rate,
+                settings.egress_burst,
+            ),
+        ]
+        return [bucket for bucket in buckets if bucket[1] > 0]
+
+    async def _record(self, kind: str, waited: float) -> None:
+        """Update the local and the shared wait counters"""
+        self.stats.acquired += 1
+        self.stats.wait_seconds += waited
+        self.stats.max_wait = max(self.stats.max_wait, waited)
+        RATE_WAIT.labels(kind=kind).observe(waited)
+        if waited < 0.01:
+            return
+
+        self.stats.waited += 1
+        logger.bind(kind=kind, wait_s=round(waited, 2)).debug(
+            "Waited for a request slot"
+        )
+        try:
+            async with get_redis(self._redis_url).pipeline() as pipe:
+                pipe.hincrby("hh:rate:stats", "waited", 1)
+                pipe.hincrbyfloat("hh:rate:stats", "wait_seconds", waited)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning(f"Failed to update rate limiter stats: {exc}")
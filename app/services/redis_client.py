@@ -0,0 +1,16 @@
+from functools import lru_cache
+
+from redis.asyncio import Redis
+
+
+@lru_cache
+def get_redis(url: str) -> Redis:
+    """Get a shared asyncio Redis client for the given URL.
+
+    Args:
+        url (str): Redis connection URL.
+
+    Returns:
+        Redis: Client reused by every caller in the current process.
+    """
+    return Redis.from_url(url)
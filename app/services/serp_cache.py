@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from typing import Awaitable, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from loguru import logger
+from pydantic import BaseModel
+
+from ..core import Config
+from ..models import VacancyCard
+from ..utils.metrics import SERP_CACHE
+from .redis_client import get_redis
+
+PageLoader = Callable[[], Awaitable[list[VacancyCard] | None]]
+
+
+class SerpStats(BaseModel):
+    """Counters of the search results cache"""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+class SerpCache:
+    """Search results pages shared between tasks through Redis.
+
+    Pages are keyed by the normalized search params (query text, region,
+    filters and page number) and hold vacancy cards without the fields
+    that depend on the account (e.g. the responded badge), so only the
+    task that loaded a page sees them. Only one loader runs for a key at
+    a time:
+    callers in this process wait on its future, other workers wait for
+    the Redis lock `hh:serp:<key>:lock` to be released.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.search_cache
+        self._redis_url = config.environment.redis_url
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.stats = SerpStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.enabled
+
+    async def get(
+        self, page_url: str, load: PageLoader
+    ) -> list[VacancyCard] | None:
+        """Get the vacancy cards of a results page, loading it on a miss.
+        Args:
+            page_url (str): URL of the search results page.
+            load (PageLoader): Coroutine function loading the page, it
+                returns None when the page can not be parsed.
+        Returns:
+            list[VacancyCard] | None: Vacancy cards of the page, None if
+                it was not loaded.
+        """
+        if not self.enabled:
+            return await load()
+
+        key = self._key(page_url)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats.coalesced += 1
+            SERP_CACHE.labels(result="coalesced").inc()
+            cards = await asyncio.shield(inflight)
+            return cards if cards is not None else await load()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        cards = None
+        try:
+            cards = await self._get_shared(key, load)
+            return cards
+        finally:
+            del self._inflight[key]
+            future.set_result(
+                [card.shared() for card in cards] if cards else cards
+            )
+
+    async def _get_shared(
+        self, key: str, load: PageLoader
+    ) -> list[VacancyCard] | None:
+        redis = get_redis(self._redis_url)
+        data_key = f"hh:serp:{key}"
+        lock_key = f"{data_key}:lock"
+        token = uuid.uuid4().hex
+
+        try:
+            cards = await self._wait_for_page(data_key, lock_key, token)
+        except Exception as exc:
+            logger.warning(f"Search results cache unavailable: {exc}")
+            return await load()
+
+        if cards is not None:
+            await self._count("hits")
+            return cards
+
+        await self._count("misses")
+        try:
+            cards = await load()
+            if cards is not None:
+                shared = [card.shared().model_dump() for card in cards]
+                await redis.set(
+                    data_key, json.dumps(shared), ex=self._settings.ttl
+                )
+            return cards
+        finally:
+            try:
+                if await redis.get(lock_key) == token.encode():
+                    await redis.delete(lock_key)
+            except Exception as exc:
+                logger.warning(f"Failed to release search page lock: {exc}")
+
+    async def _wait_for_page(
+        self, data_key: str, lock_key: str, token: str
+    ) -> list[VacancyCard] | None:
+        """Return the cached page or take the lock to load it"""
+        redis = get_redis(self._redis_url)
+        deadline = time.monotonic() + self._settings.wait_timeout
+        waited = False
+
+        while True:
+            cached = await redis.get(data_key)
+            if cached is not None:
+                return [VacancyCard(**card) for card in json.loads(cached)]
+
+            if await redis.set(
+                lock_key, token, nx=True, ex=self._settings.lock_ttl
+            ):
+                return None
+
+            if time.monotonic() > deadline:
+                logger.bind(cache_key=data_key).warning(
+                    "Search page is still loading elsewhere, loading it here"
+                )
+                return None
+
+            if not waited:
+                waited = True
+                self.stats.coalesced += 1
+                SERP_CACHE.labels(result="coalesced").inc()
+            await asyncio.sleep(0.2)
+
+    async def _count(self, counter: str) -> None:
+        """Update the local and the shared cache counters"""
+        setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+        SERP_CACHE.labels(result=counter).inc()
+        try:
+            await get_redis(self._redis_url).hincrby(
+                "hh:serp:stats", counter, 1
+            )
+        except Exception as exc:
+            logger.warning(f"Failed to update search cache stats: {exc}")
+
+    def _key(self, page_url: str) -> str:
+        """Hash of the search params that define the results page"""
+        parts = urlsplit(page_url)
+        params = [
+            (
+                name,
+                " ".join(value.lower().split()) if name == "text" else value,
+            )
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if name not in self._settings.ignored_params
+        ]
+        if not any(name == "page" for name, _ in params):
+            params.append(("page", "0"))
+        normalized = f"{parts.path}?{urlencode(sorted(params))}"
+        return hashlib.sha256(normalized.encode()).hexdigest()
@@ -0,0 +1,147 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from cryptography.fernet import Fernet, InvalidToken
+from loguru import logger
+
+from ..core import Config
+from ..models import AuthCredentials
+from .redis_client import get_redis
+
+
+def build_cipher(secret: str) -> Fernet:
+    """Build a Fernet cipher from an arbitrary secret string"""
+    digest = hashlib.sha256(secret.encode()).digest()
+    return Fernet(base64.urlsafe_b64encode(digest))
+
+
+def account_key(credentials: AuthCredentials) -> str:
+    """Hash of the account identifier, used in storage keys"""
+    return hashlib.sha256(credentials.account_id.encode()).hexdigest()
+
+
+class SessionCache:
+    """Encrypted cache of Playwright storage states per hh.ru account."""
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.sessions
+        self._redis_url = config.environment.redis_url
+        self._directory = Path(self._settings.directory)
+
+        secret = config.environment.session_encryption_key
+        self._fernet = build_cipher(secret) if secret else None
+
+        if self._settings.enabled and not self._fernet:
+            logger.warning(
+                "SESSION_ENCRYPTION_KEY is not set, session cache disabled"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self._settings.enabled and self._fernet is not None
+
+    async def load(self, credentials: AuthCredentials) -> dict | None:
+        """Load a saved storage state for the account.
+        Args:
+            credentials (AuthCredentials): The account credentials.
+        Returns:
+            dict | None: Playwright storage state or None if not cached.
+        """
+        if not self.enabled:
+            return None
+
+        key = account_key(credentials)
+        try:
+            token = await self._read(key)
+        except Exception as exc:
+            logger.exception(f"Failed to read saved session: {exc}")
+            return None
+
+        if token is None:
+            logger.bind(session_key=key).debug("No saved session")
+            return None
+
+        try:
+            state = json.loads(self._fernet.decrypt(token))  # type: ignore
+        except (InvalidToken, ValueError):
+            logger.bind(session_key=key).warning(
+                "Saved session can not be decrypted, dropping it"
+            )
+            await self.invalidate(credentials)
+            return None
+
+        logger.bind(session_key=key).info("Saved session loaded")
+        return state
+
+    async def save(self, credentials: AuthCredentials, state: dict) -> None:
+        """Encrypt and save a storage state for the account.
+        Args:
+            credentials (AuthCredentials): The account credentials.
+            state (dict): Playwright storage state of a logged in context.
+        """
+        if not self.enabled:
+            return
+
+        key = account_key(credentials)
+        token = self._fernet.encrypt(json.dumps(state).encode())  # type: ignore
+        try:
+            await self._write(key, token)
+            logger.bind(session_key=key).info("Session saved")
+        except Exception as exc:
+            logger.exception(f"Failed to save session: {exc}")
+
+    async def invalidate(self, credentials: AuthCredentials) -> None:
+        """Remove a saved storage state for the account.
+        Args:
+            credentials (AuthCredentials): The account credentials.
+        """
+        if not self.enabled:
+            return
+
+        key = account_key(credentials)
+        try:
+            await self._delete(key)
+            logger.bind(session_key=key).info("Saved session removed")
+        except Exception as exc:
+            logger.exception(f"Failed to remove saved session: {exc}")
+
+    async def _read(self, key: str) -> bytes | None:
+        if self._settings.backend == "redis":
+            return await get_redis(self._redis_url).get(f"hh:session:{key}")
+        return await asyncio.to_thread(self._read_file, key)
+
+    async def _write(self, key: str, token: bytes) -> None:
+        if self._settings.backend == "redis":
+            await get_redis(self._redis_url).set(
+                f"hh:session:{key}", token, ex=self._settings.ttl
+            )
+            return
+        await asyncio.to_thread(self._write_file, key, token)
+
+    async def _delete(self, key: str) -> None:
+        if self._settings.backend == "redis":
+            await get_redis(self._redis_url).delete(f"hh:session:{key}")
+            return
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}.session"
+
+    def _read_file(self, key: str) -> bytes | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        if time.time() - path.stat().st_mtime > self._settings.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return path.read_bytes()
+
+    def _write_file(self, key: str, token: bytes) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        path.write_bytes(token)
+        path.chmod(0o600)
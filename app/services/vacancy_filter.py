@@ -0,0 +1,37 @@
+from ..core import Config
+from ..custom_types import SkipReason
+from ..models import VacancyCard
+
+
+class VacancyFilter:
+    """Drops vacancies that can not be applied to, judging by their card."""
+
+    def __init__(self, config: Config) -> None:
+        self._settings = config.filters
+        self._excluded = [
+            employer.casefold()
+            for employer in self._settings.excluded_employers
+        ]
+
+    def skip_reason(self, card: VacancyCard) -> SkipReason | None:
+        """Tell why the vacancy should not be applied to.
+        Args:
+            card (VacancyCard): The vacancy card from search results.
+        Returns:
+            SkipReason | None: The first matching reason or None if the
+                vacancy should be applied to.
+        """
+        if self._settings.skip_responded and card.responded:
+            return SkipReason.ALREADY_RESPONDED
+        if (
+            self._settings.skip_without_response_button
+            and card.has_response_button is False
+        ):
+            return SkipReason.NO_RESPONSE_BUTTON
+        if self._excluded and card.employer:
+            employer = card.employer.casefold()
+            if any(excluded in employer for excluded in self._excluded):
+                return SkipReason.EXCLUDED_EMPLOYER
+        if self._settings.require_salary and not card.salary:
+            return SkipReason.NO_SALARY
+        return None
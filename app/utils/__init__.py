@@ -1,3 +1,22 @@
-from .click_utils import safe_click
+from .click_utils import (
+    element_state,
+    first_ready,
+    human_delay,
+    safe_click,
+    wait_ready,
+)
+from .throttle import reset_throttle, set_throttle, throttle
+from .url_utils import normalize_vacancy_url, vacancy_id
 
-__all__ = ["safe_click"]
+__all__ = [
+    "safe_click",
+    "human_delay",
+    "element_state",
+    "first_ready",
+    "wait_ready",
+    "set_throttle",
+    "reset_throttle",
+    "throttle",
+    "normalize_vacancy_url",
+    "vacancy_id",
+]
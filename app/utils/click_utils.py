@@ -1,6 +1,14 @@
+import asyncio
+import random
+from typing import Awaitable, Literal
+
 from loguru import logger
 from playwright.async_api import Locator
 
+from ..core import Network
+from .metrics import ACTION_DURATION, timed
+from .tracing import span
+
 
 async def safe_click(locator: Locator, selector: str, **kwargs) -> None:
     """Safely click a locator with logging and error handling.
@@ -12,9 +20,85 @@ async def safe_click(locator: Locator, selector: str, **kwargs) -> None:
     """
     logger.bind(selector=selector).debug("Clicking element")
     try:
-        await locator.click(**kwargs)
+        with (
+            timed(ACTION_DURATION, action="click", target=selector),
+            span("click", selector=selector),
+        ):
+            await locator.click(**kwargs)
     except Exception as exc:
         logger.bind(selector=selector).exception(
             f"Failed to click element: {exc}"
         )
         raise
+
+
+async def human_delay(settings: Network) -> None:
+    """Sleep for a random human-like pause between two actions.
+
+    Args:
+        settings (Network): The network configuration with the delay bounds.
+    """
+    await asyncio.sleep(
+        random.uniform(settings.action_delay_min, settings.action_delay_max)
+    )
+
+
+async def element_state(
+    locator: Locator,
+    state: Literal["attached", "detached", "visible", "hidden"],
+    timeout: float,
+) -> None:
+    """Wait until the element reaches the given state.
+
+    Args:
+        locator (Locator): The Playwright locator to watch.
+        state (str): The state to wait for.
+        timeout (float): Maximum time to wait (in milliseconds).
+    """
+    await locator.first.wait_for(state=state, timeout=timeout)
+
+
+async def first_ready(*conditions: Awaitable) -> None:
+    """Wait until the first of the conditions is met and cancel the others.
+
+    A condition that fails is ignored while others are still pending, the
+    error of the last one is raised when none of them is met.
+
+    Args:
+        *conditions (Awaitable): Conditions to wait for.
+    """
+    tasks = [asyncio.ensure_future(condition) for condition in conditions]
+    try:
+        error: BaseException | None = None
+        for task in asyncio.as_completed(tasks):
+            try:
+                await task
+                return
+            except Exception as exc:
+                error = exc
+        if error:
+            raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def wait_ready(settings: Network, *conditions: Awaitable) -> None:
+    """Wait for the readiness conditions and a human-like delay together.
+
+    The step takes as long as the slowest of them, so the delay only
+    adds time when the page is ready faster than a person would act.
+    A condition that fails or times out is logged and ignored, the next
+    action reports its own error if the page is really not ready.
+
+    Args:
+        settings (Network): The network configuration with the delay bounds.
+        *conditions (Awaitable): Readiness conditions to wait for.
+    """
+    results = await asyncio.gather(
+        human_delay(settings), *conditions, return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.debug(f"Readiness condition not met: {result}")
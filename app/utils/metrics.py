@@ -0,0 +1,159 @@
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+# Metrics of every process go to PROMETHEUS_MULTIPROC_DIR when it is set,
+# so the prefork children of the Celery worker and the API are collected
+# together. It has to be set before the process starts.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+_STEP_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+_ACTION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30)
+
+STAGE_DURATION = Histogram(
+    "hh_stage_duration_seconds",
+    "Duration of the job search stages",
+    ["stage"],
+    buckets=_STEP_BUCKETS,
+)
+STEP_DURATION = Histogram(
+    "hh_step_duration_seconds",
+    "Duration of the parser steps: login, search, results page, apply",
+    ["step"],
+    buckets=_STEP_BUCKETS,
+)
+ACTION_DURATION = Histogram(
+    "hh_action_duration_seconds",
+    "Duration of clicks and page checks by selector or checked states",
+    ["action", "target"],
+    buckets=_ACTION_BUCKETS,
+)
+TASK_RESULTS = Counter(
+    "hh_task_results", "Finished job searches by status", ["status"]
+)
+CAPTCHAS = Counter("hh_captchas", "Captchas met by job stage", ["stage"])
+APPLY_OUTCOMES = Counter(
+    "hh_apply_outcomes", "Vacancy applications by outcome", ["outcome"]
+)
+RATE_WAIT = Histogram(
+    "hh_rate_wait_seconds",
+    "Wait for a request slot of the rate governor",
+    ["kind"],
+    buckets=_ACTION_BUCKETS,
+)
+SERP_CACHE = Counter(
+    "hh_serp_cache", "Search results cache lookups by result", ["result"]
+)
+POOL_CONTEXTS = Gauge(
+    "hh_pool_contexts",
+    "Pooled browser contexts by state",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+POOL_ACQUIRES = Counter(
+    "hh_pool_acquires", "Context pool acquires by result", ["result"]
+)
+BROWSER_CONTEXTS = Gauge(
+    "hh_browser_contexts",
+    "Open browser contexts",
+    multiprocess_mode="livesum",
+)
+BROWSER_RESTARTS = Counter(
+    "hh_browser_restarts", "Browser restarts by reason", ["reason"]
+)
+TASK_STALLS = Counter(
+    "hh_task_stalls", "Tasks aborted because their browser stalled"
+)
+PROGRESS_UPDATES = Counter(
+    "hh_progress_updates",
+    "Task progress updates by result: written or coalesced",
+    ["result"],
+)
+BROWSER_RSS = Gauge(
+    "hh_browser_rss_bytes",
+    "RSS of the browser processes of a supervised worker",
+    ["slot"],
+    multiprocess_mode="livesum",
+)
+HTTP_DURATION = Histogram(
+    "hh_http_request_duration_seconds",
+    "Duration of API requests",
+    ["method", "route", "status"],
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the duration of the block, also when it raises.
+
+    Args:
+        histogram (Histogram): The histogram to observe in.
+        **labels (str): Label values of the histogram.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry with the metrics of this process or of all processes.
+
+    Returns:
+        CollectorRegistry: Registry to export.
+    """
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    """Render the metrics in the Prometheus text format.
+
+    Returns:
+        bytes: The exposition to serve on /metrics.
+    """
+    return generate_latest(metrics_registry())
+
+
+def clear_multiprocess_dir() -> None:
+    """Remove metric files left by processes of a previous run."""
+    if not MULTIPROC_DIR:
+        return
+    directory = Path(MULTIPROC_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob("*.db"):
+        path.unlink(missing_ok=True)
+
+
+def start_exporter(port: int) -> None:
+    """Serve the metrics of all processes over HTTP in a thread.
+
+    Args:
+        port (int): Port of the exporter.
+    """
+    start_http_server(port, registry=metrics_registry())
+
+
+def mark_process_dead() -> None:
+    """Drop the live gauges of the current process before it exits."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
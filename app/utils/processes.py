@@ -0,0 +1,20 @@
+import psutil
+
+
+def browser_rss(pid: int) -> int:
+    """Get the RSS of the processes started by a worker process.
+
+    They are the Playwright driver and the browser with its renderers.
+
+    Args:
+        pid (int): PID of the worker process.
+    Returns:
+        int: Sum of the RSS (in bytes).
+    """
+    total = 0
+    for child in psutil.Process(pid).children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
@@ -0,0 +1,46 @@
+from contextvars import ContextVar, Token
+from typing import Awaitable, Callable
+
+from .tracing import span
+
+Throttle = Callable[[str], Awaitable[None]]
+
+_current: ContextVar[Throttle | None] = ContextVar("throttle", default=None)
+
+
+def set_throttle(limiter: Throttle | None) -> Token:
+    """Route the requests of the current task through a rate limiter.
+
+    Tasks started from the current one inherit it.
+
+    Args:
+        limiter (Throttle | None): Coroutine function called with the
+            kind of request before it is sent, None to disable pacing.
+    Returns:
+        Token: Token to restore the previous limiter with reset_throttle().
+    """
+    return _current.set(limiter)
+
+
+def reset_throttle(token: Token) -> None:
+    """Restore the rate limiter that was active before set_throttle().
+
+    Args:
+        token (Token): Token returned by set_throttle().
+    """
+    _current.reset(token)
+
+
+async def throttle(kind: str) -> None:
+    """Wait until the active rate limiter allows the next hh.ru request.
+
+    Call it right before each navigation, submit or HTTP request sent to
+    hh.ru. Does nothing when no limiter is set.
+
+    Args:
+        kind (str): Kind of the request used in stats, e.g. "navigation".
+    """
+    limiter = _current.get()
+    if limiter is not None:
+        with span("throttle", kind=kind):
+            await limiter(kind)
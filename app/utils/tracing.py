@@ -0,0 +1,344 @@
+import argparse
+import random
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Protocol
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from ..core import Tracing
+
+AttributeValue = str | int | float | bool | None
+
+# Header names of the trace context in Celery task messages
+TRACEPARENT_HEADER = "traceparent"
+SENT_AT_HEADER = "trace_sent_at"
+
+
+class Span(BaseModel):
+    """Timed operation of a trace"""
+
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    name: str
+    start: float
+    end: float | None = None
+    attributes: dict[str, AttributeValue] = Field(default_factory=dict)
+    error: str | None = None
+    sampled: bool = Field(default=True, exclude=True)
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context of the span"""
+        flags = "01" if self.sampled else "00"
+        return f"00-{self.trace_id}-{self.span_id}-{flags}"
+
+    def set(self, **attributes: AttributeValue) -> None:
+        """Add attributes to the span."""
+        if self.sampled:
+            self.attributes.update(attributes)
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class LogSpanExporter:
+    """Writes finished spans to the log"""
+
+    def export(self, span: Span) -> None:
+        logger.bind(
+            trace_id=span.trace_id,
+            span_id=span.span_id,
+            parent_id=span.parent_id,
+            duration_s=round(span.duration, 4),
+            **span.attributes,
+        ).debug(f"Span {span.name}")
+
+
+class FileSpanExporter:
+    """Appends finished spans to a JSON lines file for offline analysis"""
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = span.model_dump_json() + "\n"
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a", encoding="utf-8") as file:
+                file.write(line)
+
+
+class MemorySpanExporter:
+    """Keeps the latest finished spans in the process"""
+
+    def __init__(self, size: int) -> None:
+        self._spans: deque[Span] = deque(maxlen=size)
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def spans(self, trace_id: str | None = None) -> list[Span]:
+        """Get the kept spans, optionally of one trace only."""
+        return [
+            span
+            for span in self._spans
+            if trace_id is None or span.trace_id == trace_id
+        ]
+
+
+_current: ContextVar[Span | None] = ContextVar("span", default=None)
+_settings = Tracing(enabled=False)
+_exporter: SpanExporter | None = None
+
+
+def configure_tracing(settings: Tracing) -> None:
+    """Set up sampling and the exporter from the configuration.
+
+    Args:
+        settings (Tracing): The tracing configuration.
+    """
+    global _settings
+    _settings = settings
+    if not settings.enabled:
+        set_exporter(None)
+    elif settings.exporter == "file":
+        set_exporter(FileSpanExporter(settings.file_path))
+    elif settings.exporter == "memory":
+        set_exporter(MemorySpanExporter(settings.memory_size))
+    else:
+        set_exporter(LogSpanExporter())
+
+
+def set_exporter(exporter: SpanExporter | None) -> None:
+    """Send finished spans to a custom exporter, None to drop them.
+
+    Args:
+        exporter (SpanExporter | None): Object with an export(span) method.
+    """
+    global _exporter
+    _exporter = exporter
+
+
+def current_span() -> Span | None:
+    """Get the span the current task runs in."""
+    return _current.get()
+
+
+def trace_headers() -> dict[str, str]:
+    """Celery message headers carrying the current trace context.
+
+    Returns:
+        dict[str, str]: Headers for apply_async(), empty out of a trace.
+    """
+    span = _current.get()
+    if span is None:
+        return {}
+    return {
+        TRACEPARENT_HEADER: span.traceparent,
+        SENT_AT_HEADER: str(time.time()),
+    }
+
+
+@contextmanager
+def start_trace(
+    name: str, traceparent: str | None = None, **attributes: AttributeValue
+) -> Iterator[Span]:
+    """Open the root span of a process, continuing a remote trace if given.
+
+    A new trace is sampled with the configured rate, a continued one
+    keeps the decision of its origin.
+
+    Args:
+        name (str): Name of the span.
+        traceparent (str | None): W3C trace context of the remote parent.
+        **attributes (AttributeValue): Attributes of the span.
+    Yields:
+        Span: The opened span.
+    """
+    parent = _parse_traceparent(traceparent) if traceparent else None
+    if parent is None:
+        parent = Span(
+            trace_id=secrets.token_hex(16),
+            span_id="",
+            name="",
+            start=0,
+            sampled=_exporter is not None
+            and random.random() < _settings.sample_rate,
+        )
+    with _open_span(name, parent, attributes) as span:
+        yield span
+
+
+@contextmanager
+def span(name: str, **attributes: AttributeValue) -> Iterator[Span | None]:
+    """Open a child span of the current one.
+
+    Does nothing out of a trace or in a trace that is not sampled.
+
+    Args:
+        name (str): Name of the span.
+        **attributes (AttributeValue): Attributes of the span.
+    Yields:
+        Span | None: The opened span or None if it is not recorded.
+    """
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        yield None
+        return
+    with _open_span(name, parent, attributes) as child:
+        yield child
+
+
+def record_span(
+    name: str, start: float, end: float, **attributes: AttributeValue
+) -> None:
+    """Export a finished child span of the current one, e.g. a queue wait.
+
+    Args:
+        name (str): Name of the span.
+        start (float): Start time (UNIX timestamp).
+        end (float): End time (UNIX timestamp).
+        **attributes (AttributeValue): Attributes of the span.
+    """
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        return
+    _export(
+        Span(
+            trace_id=parent.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id,
+            name=name,
+            start=start,
+            end=end,
+            attributes=attributes,
+        )
+    )
+
+
+@contextmanager
+def _open_span(
+    name: str, parent: Span, attributes: dict[str, AttributeValue]
+) -> Iterator[Span]:
+    child = Span(
+        trace_id=parent.trace_id,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id or None,
+        name=name,
+        start=time.time(),
+        attributes=attributes if parent.sampled else {},
+        sampled=parent.sampled,
+    )
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _current.reset(token)
+        child.end = time.time()
+        if child.sampled:
+            _export(child)
+
+
+def _export(span: Span) -> None:
+    if _exporter is None:
+        return
+    try:
+        _exporter.export(span)
+    except Exception as exc:
+        logger.warning(f"Failed to export span: {exc}")
+
+
+def _parse_traceparent(traceparent: str) -> Span | None:
+    parts = traceparent.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        logger.bind(traceparent=traceparent).warning("Invalid trace context")
+        return None
+    return Span(
+        trace_id=parts[1],
+        span_id=parts[2],
+        name="",
+        start=0,
+        sampled=parts[3] == "01" and _exporter is not None,
+    )
+
+
+def format_trace(spans: list[Span]) -> str:
+    """Render the spans of a trace as a tree with offsets and durations.
+
+    Args:
+        spans (list[Span]): Spans of one trace.
+    Returns:
+        str: One line per span, children indented under their parent.
+    """
+    if not spans:
+        return ""
+    children: dict[str | None, list[Span]] = {}
+    ids = {span.span_id for span in spans}
+    for item in sorted(spans, key=lambda span: span.start):
+        parent = item.parent_id if item.parent_id in ids else None
+        children.setdefault(parent, []).append(item)
+
+    origin = min(span.start for span in spans)
+    lines: list[str] = []
+
+    def render(parent: str | None, depth: int) -> None:
+        for item in children.get(parent, []):
+            attributes = " ".join(
+                f"{key}={value}" for key, value in item.attributes.items()
+            )
+            lines.append(
+                f"{item.start - origin:9.3f}s {item.duration:9.3f}s "
+                f"{'  ' * depth}{item.name}"
+                + (f" [{attributes}]" if attributes else "")
+                + (f" ! {item.error}" if item.error else "")
+            )
+            render(item.span_id, depth + 1)
+
+    render(None, 0)
+    return "\n".join(lines)
+
+
+def _main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Show a trace saved by the file span exporter"
+    )
+    parser.add_argument("id", help="Trace ID or Celery task ID")
+    parser.add_argument("--file", default=Tracing().file_path)
+    args = parser.parse_args()
+
+    spans = [
+        Span.model_validate_json(line)
+        for line in Path(args.file).read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    trace_ids = {
+        span.trace_id
+        for span in spans
+        if args.id in (span.trace_id, span.attributes.get("task_id"))
+    }
+    for trace_id in sorted(trace_ids):
+        print(f"Trace {trace_id}")
+        print(format_trace([s for s in spans if s.trace_id == trace_id]))
+    if not trace_ids:
+        print(f"No spans found for {args.id}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,35 @@
+import re
+from urllib.parse import urljoin
+
+_VACANCY_ID = re.compile(r"/vacancy/(\d+)")
+
+
+def vacancy_id(url: str) -> str | None:
+    """Extract the hh.ru vacancy ID from a vacancy URL.
+
+    Args:
+        url (str): Absolute or relative vacancy URL.
+    Returns:
+        str | None: The vacancy ID or None if the URL is not a vacancy.
+    """
+    match = _VACANCY_ID.search(url)
+    return match.group(1) if match else None
+
+
+def normalize_vacancy_url(url: str, base_url: str) -> str:
+    """Turn a vacancy link from search results into its canonical URL.
+
+    Tracking query params and regional subdomains are dropped, so the
+    same vacancy always has the same URL. Links that do not point to a
+    vacancy (e.g. ad redirects) are only made absolute.
+
+    Args:
+        url (str): The link as found on the page.
+        base_url (str): The main hh.ru URL, e.g. https://hh.ru/.
+    Returns:
+        str: Canonical vacancy URL.
+    """
+    found = vacancy_id(url)
+    if found is None:
+        return urljoin(base_url, url)
+    return urljoin(base_url, f"/vacancy/{found}")
@@ -2,6 +2,8 @@
 const API_BASE = '/api' // Relative to current host
 let currentTaskId = null
 let statusInterval = null
+let statusEvents = null
+let eventsRefused = false
 
 // DOM Elements
 const loginView = document.getElementById('login-view')
@@ -39,7 +41,7 @@ function setupEventListeners() {
 	refreshBtn.addEventListener('click', () => getStatus(currentTaskId))
 	cancelBtn.addEventListener('click', () => cancelJob(currentTaskId))
 	backBtn.addEventListener('click', () => {
-		clearInterval(statusInterval)
+		stopStatusUpdates()
 		showView('login-view')
 		resetForm()
 	})
@@ -186,7 +188,7 @@ async function submitJob(data) {
 		if (response.ok) {
 			currentTaskId = result.task_id
 			showView('dashboard-view')
-			startStatusPolling()
+			startStatusUpdates()
 		} else {
 			showError('query-error', result.detail || 'Submission failed')
 		}
@@ -208,6 +210,9 @@ async function getStatus(taskId) {
 
 		if (response.ok) {
 			updateStatus(data)
+			if (data.state === 'STARTED' || data.state === 'PROGRESS') {
+				followStatusEvents()
+			}
 		} else {
 			showStatusError(data.detail || 'Failed to get status')
 		}
@@ -226,8 +231,11 @@ async function cancelJob(taskId) {
 		})
 		const data = await response.json()
 
-		if (response.ok) {
-			clearInterval(statusInterval)
+		if (response.ok && data.status === 'cancelling') {
+			// Keep following until the task returns its partial results
+			statusText.textContent = 'Cancelling'
+		} else if (response.ok) {
+			stopStatusUpdates()
 			updateStatus({ state: 'CANCELLED', progress: 0 })
 		} else {
 			showStatusError(data.detail || 'Failed to cancel')
@@ -239,11 +247,60 @@ async function cancelJob(taskId) {
 }
 
 // Status Management
+function startStatusUpdates() {
+	eventsRefused = !window.EventSource
+	startStatusPolling()
+}
+
+// The event stream is refused for a queued task, so it is polled until it starts
+function followStatusEvents() {
+	if (eventsRefused || statusEvents || !statusInterval) return
+	clearInterval(statusInterval)
+	statusInterval = null
+
+	// Progress is pushed by the server, fields of each event are merged
+	const taskState = { task_id: currentTaskId, state: 'PROGRESS' }
+	statusEvents = new EventSource(`${API_BASE}/jobs/${currentTaskId}/events`)
+	statusEvents.addEventListener('progress', (event) => {
+		const { vacancies, ...delta } = JSON.parse(event.data)
+		Object.assign(taskState, delta)
+		updateStatus(taskState)
+	})
+	statusEvents.addEventListener('done', (event) => {
+		const result = JSON.parse(event.data)
+		stopStatusUpdates()
+		updateStatus({
+			...taskState,
+			state: 'SUCCESS',
+			applied: result.applied ?? taskState.applied,
+			total: result.total ?? taskState.total,
+			result,
+		})
+	})
+	statusEvents.onerror = () => {
+		// The browser reconnects by itself unless the stream was refused
+		if (statusEvents.readyState === EventSource.CLOSED) {
+			statusEvents = null
+			eventsRefused = true
+			startStatusPolling()
+		}
+	}
+}
+
 function startStatusPolling() {
 	getStatus(currentTaskId)
 	statusInterval = setInterval(() => getStatus(currentTaskId), 2000) // Poll every 2 seconds
 }
 
+function stopStatusUpdates() {
+	clearInterval(statusInterval)
+	statusInterval = null
+	if (statusEvents) {
+		statusEvents.close()
+		statusEvents = null
+	}
+}
+
 function updateStatus(data) {
 	statusError.style.display = 'none'
 	taskIdSpan.textContent = data.task_id
@@ -251,9 +308,14 @@ function updateStatus(data) {
 	// Check if result contains error status
 	const isErrorStatus =
 		data.result &&
-		['captcha required', 'invalid credentials', 'error'].includes(
-			data.result.status,
-		)
+		[
+			'captcha required',
+			'invalid credentials',
+			'error',
+			'stalled',
+		].includes(data.result.status)
+
+	const isCancelled = data.result && data.result.status === 'cancelled'
 
 	if (isErrorStatus) {
 		statusText.textContent = getStatusText(data.result.status)
@@ -261,7 +323,10 @@ function updateStatus(data) {
 		showStatusError(
 			data.result.message || 'An error occurred during processing',
 		)
-		clearInterval(statusInterval)
+		stopStatusUpdates()
+	} else if (isCancelled) {
+		statusText.textContent = getStatusText('CANCELLED')
+		updateStatusIcon('CANCELLED')
 	} else {
 		statusText.textContent = getStatusText(data.state)
 		updateStatusIcon(data.state)
@@ -276,7 +341,7 @@ function updateStatus(data) {
 	if (data.total !== undefined) totalSpan.textContent = data.total
 
 	if (data.state === 'SUCCESS' || data.state === 'FAILURE' || isErrorStatus) {
-		clearInterval(statusInterval)
+		stopStatusUpdates()
 	}
 }
 
@@ -290,12 +355,16 @@ function getStatusText(state) {
 			return 'Completed'
 		case 'FAILURE':
 			return 'Failed'
+		case 'CANCELLED':
+			return 'Cancelled'
 		case 'captcha required':
 			return 'Captcha Required'
 		case 'invalid credentials':
 			return 'Invalid Credentials'
 		case 'error':
 			return 'Error'
+		case 'stalled':
+			return 'Browser Stalled'
 		default:
 			return state
 	}
@@ -316,10 +385,15 @@ function updateStatusIcon(state) {
 			statusIcon.classList.add('fa-check-circle')
 			statusIcon.style.color = '#27ae60'
 			break
+		case 'CANCELLED':
+			statusIcon.classList.add('fa-ban')
+			statusIcon.style.color = '#95a5a6'
+			break
 		case 'FAILURE':
 		case 'captcha required':
 		case 'invalid credentials':
 		case 'error':
+		case 'stalled':
 			statusIcon.classList.add('fa-times-circle')
 			statusIcon.style.color = '#e74c3c'
 			break
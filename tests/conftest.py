@@ -0,0 +1,78 @@
+import sys
+from typing import AsyncIterator, Iterator
+
+import fakeredis
+import pytest
+from playwright.async_api import Browser, Page, async_playwright
+
+from app.core import Config, load
+from app.models import EmailAuth
+
+from .stand_in import EMAIL, PASSWORD, StandInSite
+
+
+@pytest.fixture(scope="session")
+def site() -> Iterator[StandInSite]:
+    """Stand-in hh.ru server shared by the tests"""
+    site = StandInSite()
+    site.start()
+    yield site
+    site.stop()
+
+
+@pytest.fixture
+def config(site: StandInSite) -> Config:
+    """Configuration pointing at the stand-in site, with short timeouts"""
+    config = site.configure(load())
+    config.timeouts.element_timeout = 3
+    config.timeouts.connection_timeout = 10
+    return config
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> fakeredis.FakeAsyncRedis:
+    """In-memory Redis returned by get_redis() in every service"""
+    server = fakeredis.FakeAsyncRedis()
+    for name, module in list(sys.modules.items()):
+        if name.startswith("app.") and hasattr(module, "get_redis"):
+            monkeypatch.setattr(module, "get_redis", lambda url: server)
+    return server
+
+
+@pytest.fixture
+def credentials() -> EmailAuth:
+    return EmailAuth(
+        email=EMAIL,
+        password=PASSWORD,
+        answer_req="Hello, I'm a python developer",
+    )
+
+
+@pytest.fixture
+async def browser() -> AsyncIterator[Browser]:
+    async with async_playwright() as playwright:
+        try:
+            browser = await playwright.chromium.launch()
+        except Exception as exc:
+            pytest.skip(f"Chromium is not available: {exc}")
+        yield browser
+        await browser.close()
+
+
+@pytest.fixture
+async def page(browser: Browser, site: StandInSite) -> AsyncIterator[Page]:
+    """Page of a context logged in to the stand-in site"""
+    context = await browser.new_context()
+    await context.add_cookies(site.cookies())  # type: ignore
+    page = await context.new_page()
+    yield page
+    await context.close()
+
+
+@pytest.fixture
+async def guest_page(browser: Browser) -> AsyncIterator[Page]:
+    """Page of a context without a session"""
+    context = await browser.new_context()
+    page = await context.new_page()
+    yield page
+    await context.close()
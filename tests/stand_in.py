@@ -0,0 +1,398 @@
+import itertools
+import json
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from app.core import Config
+
+RESUME_HASH = "0123456789abcdef0123456789abcdef"
+EMAIL = "user@example.com"
+PASSWORD = "password"
+XSRF_TOKEN = "stand-in-xsrf"
+SESSION_TOKEN = "stand-in-session"
+
+# Vacancy kinds and the reply of the response endpoint to a first response
+KINDS = (
+    "apply",
+    "letter",
+    "questions",
+    "additional_info",
+    "archived",
+    "captcha",
+)
+
+# Weight of the scripts a vacancy page loads before it is interactive
+_BUNDLE = b"/* stand-in bundle */\n" + b"var x = 0;\n" * 30_000
+
+_VACANCY_PAGE = """<!doctype html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title>Vacancy {vacancy_id}</title>
+  <script src="/static/bundle.js"></script>
+</head>
+<body>
+  <h1>Vacancy {vacancy_id}</h1>
+  <a data-qa="vacancy-response-link-top" href="#">Откликнуться</a>
+  <div id="result"></div>
+  <script>
+    const result = document.getElementById('result');
+    const respond = async (letter) => {{
+      const xsrf = (document.cookie.match(/_xsrf=([^;]+)/) || [])[1] || '';
+      const reply = await fetch('/applicant/vacancy_response/popup', {{
+        method: 'POST',
+        headers: {{
+          'X-Requested-With': 'XMLHttpRequest',
+          'X-Xsrftoken': xsrf,
+        }},
+        body: new URLSearchParams({{
+          vacancy_id: '{vacancy_id}',
+          resume_hash: '{resume_hash}',
+          letter: letter || '',
+        }}),
+      }});
+      render(await reply.json());
+    }};
+    const applied = () => {{
+      result.innerHTML = '<p>Вы откликнулись</p>';
+    }};
+    const render = (reply) => {{
+      if (reply.success === 'true' && reply.additional_info) {{
+        result.innerHTML =
+          '<div role="dialog">' +
+          '<h2 data-qa="additional-data-collector__popup-title">' +
+          'Расскажите о себе</h2>' +
+          '<button data-qa="additional-data-collector__popup-close">' +
+          'Закрыть</button></div>';
+        result.querySelector('button').onclick = applied;
+      }} else if (reply.success === 'true') {{
+        applied();
+      }} else if (reply.error === 'already-applied') {{
+        applied();
+      }} else if (reply.error === 'letter-required') {{
+        result.innerHTML =
+          '<div role="dialog">' +
+          '<p>Сопроводительное письмо обязательное для этой вакансии</p>' +
+          '<textarea data-qa="vacancy-response-letter-input"></textarea>' +
+          '<button data-qa="vacancy-response-submit-popup">' +
+          'Откликнуться</button></div>';
+        const dialog = result.querySelector('[role="dialog"]');
+        dialog.querySelector('button').onclick = () =>
+          respond(dialog.querySelector('textarea').value);
+      }} else if (reply.error === 'test-required') {{
+        result.innerHTML =
+          '<p>Для отклика необходимо ответить на несколько вопросов ' +
+          'работодателя</p>';
+      }} else if (reply.error === 'captcha') {{
+        result.innerHTML =
+          '<div role="dialog"><img alt="Captcha image" ' +
+          'style="width: 120px; height: 40px; display: block"></div>';
+      }} else {{
+        result.innerHTML = '<p>Ошибка отклика</p>';
+      }}
+    }};
+    document
+      .querySelector('[data-qa="vacancy-response-link-top"]')
+      .addEventListener('click', (event) => {{
+        event.preventDefault();
+        respond('');
+      }});
+  </script>
+</body>
+</html>
+"""
+
+# Analytics beacons keep the network of every page busy, like on hh.ru
+_TRACKER = """<script>
+  setInterval(() => fetch('/analytics', { method: 'POST' }), 250);
+</script>"""
+
+_LOGIN_PAGE = """<!doctype html>
+<html>
+<head><meta charset="utf-8"><title>Login</title></head>
+<body>
+  <form id="login" method="post" action="/account/login">
+    <div id="options" hidden><button type="button">Почта</button></div>
+    <input data-qa="applicant-login-input-email" name="username" hidden>
+    <button type="button" data-qa="expand-login-by-password" hidden>
+      Войти с паролем
+    </button>
+    <input data-qa="applicant-login-input-password" name="password"
+      type="password" hidden>
+    <button type="button" data-qa="submit-button">Войти</button>
+    {error}
+  </form>
+  <script>
+    const form = document.getElementById('login');
+    const field = (qa) => form.querySelector(`[data-qa="${{qa}}"]`);
+    const show = (element) => setTimeout(() => element.hidden = false, 100);
+    field('submit-button').onclick = () => {{
+      if (field('applicant-login-input-password').hidden) {{
+        show(document.getElementById('options'));
+      }} else {{
+        form.submit();
+      }}
+    }};
+    document.querySelector('#options button').onclick = () =>
+      show(field('applicant-login-input-email'));
+    field('applicant-login-input-email').oninput = () =>
+      show(field('expand-login-by-password'));
+    field('expand-login-by-password').onclick = () =>
+      show(field('applicant-login-input-password'));
+  </script>
+  {tracker}
+</body>
+</html>
+"""
+
+_LOGIN_ERROR = (
+    "<p>Неправильные данные для входа. Пожалуйста, попробуйте снова.</p>"
+)
+
+_MAIN_PAGE = """<!doctype html>
+<html>
+<head><meta charset="utf-8"><title>Main</title></head>
+<body>
+  <form method="get" action="/search/vacancy">
+    <button type="button" data-qa="searchVacancy-button">Найти</button>
+    <input data-qa="search-input" name="text" hidden>
+  </form>
+  <script>
+    document.querySelector('[data-qa="searchVacancy-button"]').onclick =
+      () => document.querySelector('[data-qa="search-input"]').hidden = false;
+  </script>
+  {tracker}
+</body>
+</html>
+"""
+
+_SEARCH_PAGE = """<!doctype html>
+<html>
+<head><meta charset="utf-8"><title>Search</title></head>
+<body>
+  <h1 data-qa="vacancies-search-header">Найдено {total} вакансий</h1>
+  <div data-qa="vacancy-serp__results">{cards}</div>
+  {tracker}
+</body>
+</html>
+"""
+
+_SEARCH_CARD = """<div data-qa="vacancy-serp__vacancy">
+  <a data-qa="serp-item__title" href="{url}">Python developer {index}</a>
+</div>"""
+
+_RESUMES_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"></head>
+<body><a href="/resume/{resume_hash}">Python developer</a></body>
+</html>
+"""
+
+
+class StandInSite:
+    """Local stand-in of the hh.ru pages and endpoints used by the parser.
+
+    The login form, the main page and the search results show their
+    controls with a short delay and send analytics beacons the whole
+    time, so the network of a page never goes idle. Vacancies are added with a kind that decides how the response
+    endpoint replies to them. The vacancy page responds through the same
+    endpoint, so the browser and the HTTP apply backends are served by
+    one implementation. Every request is delayed by latency to mimic
+    the round trip to hh.ru.
+    """
+
+    def __init__(self, latency: float = 0.02) -> None:
+        self.latency = latency
+        self.responses: list[dict[str, str]] = []
+        self._kinds: dict[str, str] = {}
+        self._applied: set[str] = set()
+        self._ids = itertools.count(1000)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def add_vacancy(self, kind: str = "apply") -> str:
+        """Add a vacancy and get its URL.
+        Args:
+            kind (str): One of KINDS.
+        Returns:
+            str: URL of the vacancy page.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown vacancy kind: {kind}")
+        vacancy_id = str(next(self._ids))
+        self._kinds[vacancy_id] = kind
+        return f"{self.url}/vacancy/{vacancy_id}"
+
+    def cookies(self) -> list[dict]:
+        """Cookies of a logged in session, for add_cookies()."""
+        return [
+            {"name": "_xsrf", "value": XSRF_TOKEN, "url": self.url},
+            {"name": "hhtoken", "value": SESSION_TOKEN, "url": self.url},
+        ]
+
+    def configure(self, config: Config) -> Config:
+        """Copy the configuration with the hh.ru URLs pointing here.
+        Args:
+            config (Config): The application configuration.
+        Returns:
+            Config: The copy.
+        """
+        config = config.model_copy(deep=True)
+        parsing = config.parsing
+        parsing.hh_base_url = f"{self.url}/"
+        parsing.hh_login_url = f"{self.url}/account/login"
+        parsing.hh_session_check_url = f"{self.url}/applicant/resumes"
+        parsing.hh_resumes_url = f"{self.url}/applicant/resumes"
+        parsing.hh_response_url = (
+            f"{self.url}/applicant/vacancy_response/popup"
+        )
+        return config
+
+    def login(self, form: dict[str, str]) -> bool:
+        """Check the credentials submitted to the login form"""
+        return (
+            form.get("username") == EMAIL and form.get("password") == PASSWORD
+        )
+
+    def respond(self, form: dict[str, str]) -> tuple[int, dict]:
+        """Reply of the response endpoint to a submitted form"""
+        vacancy_id = form.get("vacancy_id", "")
+        kind = self._kinds.get(vacancy_id)
+        with self._lock:
+            self.responses.append(form)
+            if kind is None or form.get("resume_hash") != RESUME_HASH:
+                return 400, {"error": "bad-request"}
+            if vacancy_id in self._applied:
+                return 200, {"error": "already-applied"}
+            if kind == "letter" and not form.get("letter"):
+                return 200, {"error": "letter-required"}
+            if kind == "questions":
+                return 200, {"error": "test-required"}
+            if kind == "archived":
+                return 200, {"error": "vacancy-archived"}
+            if kind == "captcha":
+                return 403, {"error": "captcha"}
+            self._applied.add(vacancy_id)
+        reply: dict = {"success": "true"}
+        if kind == "additional_info":
+            reply["additional_info"] = True
+        return 200, reply
+
+
+def _handler(site: StandInSite) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            time.sleep(site.latency)
+            path = urlsplit(self.path).path
+            if path == "/":
+                html = _MAIN_PAGE.format(tracker=_TRACKER)
+                self._send(200, html.encode(), "text/html; charset=utf-8")
+            elif path == "/account/login":
+                html = _LOGIN_PAGE.format(error="", tracker=_TRACKER)
+                self._send(200, html.encode(), "text/html; charset=utf-8")
+            elif path == "/search/vacancy":
+                cards = "".join(
+                    _SEARCH_CARD.format(url=f"/vacancy/{vacancy_id}", index=i)
+                    for i, vacancy_id in enumerate(site._kinds)
+                )
+                html = _SEARCH_PAGE.format(
+                    total=len(site._kinds), cards=cards, tracker=_TRACKER
+                )
+                self._send(200, html.encode(), "text/html; charset=utf-8")
+            elif path == "/static/bundle.js":
+                self._send(200, _BUNDLE, "application/javascript")
+            elif path.startswith("/vacancy/"):
+                vacancy_id = path.rsplit("/", 1)[-1]
+                if vacancy_id not in site._kinds:
+                    self._send(404, b"Not found", "text/plain")
+                    return
+                html = _VACANCY_PAGE.format(
+                    vacancy_id=vacancy_id, resume_hash=RESUME_HASH
+                )
+                self._send(200, html.encode(), "text/html; charset=utf-8")
+            elif path == "/applicant/resumes":
+                if not self._logged_in():
+                    self._redirect("/account/login")
+                    return
+                html = _RESUMES_PAGE.format(resume_hash=RESUME_HASH)
+                self._send(200, html.encode(), "text/html; charset=utf-8")
+            else:
+                self._send(404, b"Not found", "text/plain")
+
+        def do_POST(self) -> None:
+            time.sleep(site.latency)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode()
+            form = {key: values[0] for key, values in parse_qs(body).items()}
+            path = urlsplit(self.path).path
+            if path == "/analytics":
+                self._send(204, b"", "text/plain")
+                return
+            if path == "/account/login":
+                self._login(form)
+                return
+            if path != "/applicant/vacancy_response/popup":
+                self._send(404, b"Not found", "text/plain")
+                return
+            if self.headers.get("X-Xsrftoken") != self._cookie("_xsrf"):
+                status, reply = 403, {"error": "xsrf"}
+            else:
+                status, reply = site.respond(form)
+            self._send(status, json.dumps(reply).encode(), "application/json")
+
+        def _login(self, form: dict[str, str]) -> None:
+            if not site.login(form):
+                html = _LOGIN_PAGE.format(error=_LOGIN_ERROR, tracker=_TRACKER)
+                self._send(200, html.encode(), "text/html; charset=utf-8")
+                return
+            self.send_response(302)
+            self.send_header("Location", "/")
+            self.send_header("Set-Cookie", f"_xsrf={XSRF_TOKEN}; Path=/")
+            self.send_header("Set-Cookie", f"hhtoken={SESSION_TOKEN}; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def _cookie(self, name: str) -> str | None:
+            cookie = SimpleCookie(self.headers.get("Cookie") or "")
+            return cookie[name].value if name in cookie else None
+
+        def _logged_in(self) -> bool:
+            return self._cookie("hhtoken") == SESSION_TOKEN
+
+        def _redirect(self, location: str) -> None:
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
@@ -0,0 +1,87 @@
+import pytest
+
+from app.custom_types import ApplyOutcome
+from app.exceptions import CaptchaError
+from app.parser import apply_to_vacancy, apply_via_http, fetch_resume_hash
+from app.parser.apply_http import parse_response_reply
+
+from .stand_in import RESUME_HASH
+
+
+@pytest.mark.parametrize(
+    ("status", "reply", "outcome"),
+    [
+        (200, {"success": "true"}, ApplyOutcome.APPLIED),
+        (200, {"success": True}, ApplyOutcome.APPLIED),
+        (200, {"error": "letter-required"}, ApplyOutcome.LETTER_REQUIRED),
+        (200, {"error": "test-required"}, ApplyOutcome.QUESTIONS_REQUIRED),
+        (200, {"error": "already-applied"}, ApplyOutcome.ALREADY_APPLIED),
+        (200, {"error": {"type": "vacancy-archived"}}, ApplyOutcome.FAILED),
+        (403, {"error": "captcha"}, None),
+        (200, {}, None),
+    ],
+)
+def test_parse_response_reply(config, status, reply, outcome):
+    assert parse_response_reply(status, reply, config) == outcome
+
+
+async def test_fetch_resume_hash(page, config):
+    assert await fetch_resume_hash(page, config) == RESUME_HASH
+
+
+@pytest.mark.parametrize(
+    ("kind", "outcome"),
+    [
+        ("apply", ApplyOutcome.APPLIED),
+        ("letter", ApplyOutcome.APPLIED),
+        ("questions", ApplyOutcome.QUESTIONS_REQUIRED),
+        ("additional_info", ApplyOutcome.APPLIED),
+        ("archived", ApplyOutcome.FAILED),
+        ("captcha", None),
+    ],
+)
+async def test_http_backend(page, site, config, credentials, kind, outcome):
+    vacancy_url = site.add_vacancy(kind)
+    result = await apply_via_http(
+        page, vacancy_url, config, credentials, RESUME_HASH
+    )
+    assert result == outcome
+
+
+async def test_http_backend_without_letter(page, site, config, credentials):
+    vacancy_url = site.add_vacancy("letter")
+    credentials.answer_req = None
+    result = await apply_via_http(
+        page, vacancy_url, config, credentials, RESUME_HASH
+    )
+    assert result == ApplyOutcome.LETTER_REQUIRED
+
+
+async def test_http_backend_already_applied(page, site, config, credentials):
+    vacancy_url = site.add_vacancy("apply")
+    await apply_via_http(page, vacancy_url, config, credentials, RESUME_HASH)
+    result = await apply_via_http(
+        page, vacancy_url, config, credentials, RESUME_HASH
+    )
+    assert result == ApplyOutcome.ALREADY_APPLIED
+
+
+@pytest.mark.parametrize(
+    ("kind", "outcome"),
+    [
+        ("apply", ApplyOutcome.APPLIED),
+        ("letter", ApplyOutcome.APPLIED),
+        ("questions", ApplyOutcome.QUESTIONS_REQUIRED),
+        ("additional_info", ApplyOutcome.APPLIED),
+    ],
+)
+async def test_browser_backend(page, site, config, credentials, kind, outcome):
+    vacancy_url = site.add_vacancy(kind)
+    result = await apply_to_vacancy(page, vacancy_url, config, credentials)
+    assert result == outcome
+
+
+async def test_browser_backend_captcha(page, site, config, credentials):
+    vacancy_url = site.add_vacancy("captcha")
+    with pytest.raises(CaptchaError):
+        await apply_to_vacancy(page, vacancy_url, config, credentials)
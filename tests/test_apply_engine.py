@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.custom_types import ApplyOutcome, PacingSignal
+from app.exceptions import CaptchaError
+from app.services import apply_engine
+from app.services.apply_engine import ApplyEngine
+
+CAPTCHA_URL = "https://hh.ru/vacancy/captcha"
+
+
+class FakeTab:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.tabs: list[FakeTab] = []
+
+    async def new_page(self) -> FakeTab:
+        tab = FakeTab()
+        self.tabs.append(tab)
+        return tab
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.context = FakeContext()
+
+
+class FakePacing:
+    def __init__(self) -> None:
+        self.signals: list[PacingSignal] = []
+
+    async def next_delay(self) -> float:
+        return 0.0
+
+    async def record(self, signal: PacingSignal, latency=None) -> None:
+        self.signals.append(signal)
+
+
+@pytest.fixture
+def applies(config, monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    """Outcome of each applied URL, cancelled ones are marked"""
+    config.parsing.apply_backend = "browser"
+    config.parsing.apply_tabs = 3
+    config.network.sleep_between_requests_min = 0
+    config.network.sleep_between_requests_max = 0
+    done: dict[str, str] = {}
+
+    async def apply_to_vacancy(tab, url, config, credentials):
+        try:
+            if url == CAPTCHA_URL:
+                await asyncio.sleep(0.05)
+                raise CaptchaError("Captcha on the vacancy page")
+            if url.endswith("timeout"):
+                raise PlaywrightTimeoutError("Timeout 3000ms exceeded")
+            if url.endswith("broken"):
+                raise RuntimeError("Response button not found")
+            await asyncio.sleep(1 if url.endswith("slow") else 0.01)
+            done[url] = "applied"
+            return (
+                ApplyOutcome.FAILED
+                if url.endswith("failed")
+                else ApplyOutcome.APPLIED
+            )
+        except asyncio.CancelledError:
+            done[url] = "cancelled"
+            raise
+
+    monkeypatch.setattr(apply_engine, "apply_to_vacancy", apply_to_vacancy)
+    return done
+
+
+def _queue(urls: list[str]) -> asyncio.Queue:
+    queue: asyncio.Queue = asyncio.Queue()
+    for url in [*urls, None]:
+        queue.put_nowait(url)
+    return queue
+
+
+async def test_outcomes_and_pacing_signals(applies, config, credentials):
+    results = []
+    pacing = FakePacing()
+    page = FakePage()
+
+    async def on_result(result):
+        results.append(result)
+
+    engine = ApplyEngine(
+        page, config, credentials, on_result, pacing  # type: ignore
+    )
+    urls = [f"https://hh.ru/vacancy/{name}" for name in ("1", "failed")]
+    urls += ["https://hh.ru/vacancy/timeout", "https://hh.ru/vacancy/broken"]
+    await engine.run(_queue(urls))
+
+    outcomes = {result.url: result.outcome for result in results}
+    assert outcomes == {
+        urls[0]: ApplyOutcome.APPLIED,
+        urls[1]: ApplyOutcome.FAILED,
+        urls[2]: ApplyOutcome.FAILED,
+        urls[3]: ApplyOutcome.FAILED,
+    }
+    assert sorted(pacing.signals) == sorted(
+        [
+            PacingSignal.SUCCESS,
+            PacingSignal.ERROR,
+            PacingSignal.TIMEOUT,
+            PacingSignal.ERROR,
+        ]
+    )
+    # The extra tabs are closed, the page of the task is kept
+    assert page.context.tabs
+    assert all(tab.closed for tab in page.context.tabs)
+
+
+async def test_captcha_cancels_other_tabs(applies, config, credentials):
+    results = []
+    page = FakePage()
+
+    async def on_result(result):
+        results.append(result)
+
+    engine = ApplyEngine(page, config, credentials, on_result)  # type: ignore
+    slow = [f"https://hh.ru/vacancy/{i}/slow" for i in range(2)]
+    queue = _queue([*slow, CAPTCHA_URL, "https://hh.ru/vacancy/3"])
+
+    with pytest.raises(CaptchaError):
+        await asyncio.wait_for(engine.run(queue), 0.5)
+
+    assert applies == {url: "cancelled" for url in slow}
+    assert results == []
+    assert all(tab.closed for tab in page.context.tabs)
@@ -0,0 +1,23 @@
+import pytest
+
+from app.exceptions import AuthCredentialsError
+from app.parser import login, search_vacancies
+
+
+async def test_login(guest_page, site, config, credentials):
+    await login(guest_page, credentials, config)
+    cookies = await guest_page.context.cookies(site.url)
+    assert "hhtoken" in {cookie["name"] for cookie in cookies}
+
+
+async def test_login_invalid_credentials(guest_page, config, credentials):
+    credentials.password = "wrong password"
+    with pytest.raises(AuthCredentialsError):
+        await login(guest_page, credentials, config)
+
+
+async def test_search_after_login(guest_page, site, config, credentials):
+    site.add_vacancy("apply")
+    await login(guest_page, credentials, config)
+    await search_vacancies(guest_page, "python", config)
+    assert "/search/vacancy" in guest_page.url
@@ -0,0 +1,122 @@
+import asyncio
+import statistics
+import time
+
+import pytest
+
+from app.parser import (
+    apply_to_vacancy,
+    apply_via_http,
+    auth,
+    login,
+    search,
+    search_vacancies,
+)
+
+from .stand_in import RESUME_HASH
+
+pytestmark = pytest.mark.benchmark
+
+ROUNDS = 10
+LOGIN_ROUNDS = 3
+
+# The fixed pause each readiness wait replaced, sleep_between_actions
+FIXED_SLEEP = 2
+
+
+def _report(title: str, timings: dict[str, list[float]]) -> None:
+    print(f"\n{title}")
+    for name, values in timings.items():
+        print(
+            f"  {name:<10} mean {statistics.mean(values) * 1000:8.1f} ms"
+            f"  median {statistics.median(values) * 1000:8.1f} ms"
+            f"  total {sum(values):6.2f} s"
+        )
+
+
+async def test_apply_backends(page, site, config, credentials):
+    """Time one application with the browser and the http backends"""
+    timings: dict[str, list[float]] = {"browser": [], "http": []}
+    for _ in range(ROUNDS):
+        vacancy_url = site.add_vacancy("apply")
+        started = time.perf_counter()
+        await apply_to_vacancy(page, vacancy_url, config, credentials)
+        timings["browser"].append(time.perf_counter() - started)
+
+        vacancy_url = site.add_vacancy("apply")
+        started = time.perf_counter()
+        await apply_via_http(
+            page, vacancy_url, config, credentials, RESUME_HASH
+        )
+        timings["http"].append(time.perf_counter() - started)
+
+    _report(
+        f"Apply backends, {ROUNDS} vacancies, "
+        f"{site.latency * 1000:.0f} ms server latency",
+        timings,
+    )
+    assert statistics.median(timings["http"]) < statistics.median(
+        timings["browser"]
+    )
+
+
+async def _fixed_sleep(settings, *conditions) -> None:
+    for condition in conditions:
+        condition.close()
+    await asyncio.sleep(FIXED_SLEEP)
+
+
+async def _network_idle(page, config) -> None:
+    await page.wait_for_load_state("networkidle", timeout=5000)
+
+
+async def test_login_and_search_waits(
+    browser, site, config, credentials, monkeypatch
+):
+    """Time the login and the search of a task with each kind of wait.
+
+    fixed sleeps is the pause before every step the parser used to take,
+    network idle waits for the submitted login form the way it was first
+    replaced, readiness waits are the current ones.
+    """
+    site.add_vacancy("apply")
+
+    async def run() -> float:
+        context = await browser.new_context()
+        page = await context.new_page()
+        started = time.perf_counter()
+        await login(page, credentials, config)
+        await search_vacancies(page, "python", config)
+        elapsed = time.perf_counter() - started
+        await context.close()
+        return elapsed
+
+    timings: dict[str, list[float]] = {
+        "fixed": [],
+        "idle": [],
+        "ready": [],
+    }
+    for _ in range(LOGIN_ROUNDS):
+        with monkeypatch.context() as patch:
+            patch.setattr(auth, "wait_ready", _fixed_sleep)
+            patch.setattr(search, "wait_ready", _fixed_sleep)
+            timings["fixed"].append(await run())
+        with monkeypatch.context() as patch:
+            patch.setattr(auth, "_login_answered", _network_idle)
+            timings["idle"].append(await run())
+        timings["ready"].append(await run())
+
+    saved = statistics.mean(timings["fixed"]) - statistics.mean(
+        timings["ready"]
+    )
+    _report(
+        f"Login and search, {LOGIN_ROUNDS} tasks, "
+        f"{saved:.2f} s saved per task against fixed sleeps",
+        timings,
+    )
+    assert statistics.median(timings["ready"]) < statistics.median(
+        timings["idle"]
+    )
+    assert statistics.median(timings["ready"]) < statistics.median(
+        timings["fixed"]
+    )
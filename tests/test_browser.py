@@ -0,0 +1,65 @@
+from typing import AsyncIterator
+
+import pytest
+
+from app.exceptions import BrowserStalledError
+from app.services.browser import BrowserManager, _restore_origins
+
+
+async def test_restore_origins(page, site):
+    origins = [
+        {
+            "origin": site.url,
+            "localStorage": [{"name": "hh-theme", "value": "dark"}],
+        }
+    ]
+    await _restore_origins(page, origins)
+    assert page.url == "about:blank"
+
+    await page.goto(site.add_vacancy("apply"))
+    value = await page.evaluate("localStorage.getItem('hh-theme')")
+    assert value == "dark"
+
+
+@pytest.fixture
+async def manager(config) -> AsyncIterator[BrowserManager]:
+    """Browser manager with a quick watchdog"""
+    config.watchdog.check_interval = 0.2
+    config.watchdog.idle_timeout = 1
+    config.watchdog.probe_timeout = 1
+    config.watchdog.close_timeout = 5
+    manager = BrowserManager(config)
+    try:
+        await manager.start()
+    except Exception as exc:
+        if manager._playwright:
+            await manager._playwright.stop()
+        pytest.skip(f"Chromium is not available: {exc}")
+    yield manager
+    await manager.close()
+
+
+async def test_browser_recycled_after_max_tasks(manager, config, site):
+    config.watchdog.max_tasks = 1
+    async with manager.context() as page:
+        await page.goto(site.add_vacancy("apply"))
+    browser = manager._browser
+
+    async with manager.context() as page:
+        await page.goto(site.add_vacancy("apply"))
+    assert manager._browser is not browser
+    assert manager._browser.is_connected()
+
+
+async def test_stalled_task_is_aborted(manager, site):
+    browser = manager._browser
+    with pytest.raises(BrowserStalledError):
+        async with manager.context() as page:
+            await page.goto(site.add_vacancy("apply"))
+            await page.evaluate("() => { while (true) {} }")
+    assert manager.watchdog.restart_reason(browser) == "stall"
+
+    # The next task gets a fresh browser
+    async with manager.context() as page:
+        await page.goto(site.add_vacancy("apply"))
+    assert manager._browser is not browser
@@ -0,0 +1,137 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import Watchdog
+from app.services import browser_watchdog
+from app.services.browser_watchdog import BrowserWatchdog
+
+MB = 1024 * 1024
+
+
+class FakePage:
+    url = "https://hh.ru/vacancy/1"
+
+    def __init__(self, hangs: bool = False) -> None:
+        self.hangs = hangs
+        self.probes = 0
+
+    async def evaluate(self, expression: str) -> int:
+        self.probes += 1
+        if self.hangs:
+            await asyncio.Event().wait()
+        return 1
+
+
+class FakeContext:
+    def __init__(self, close_hangs: bool = False) -> None:
+        self.close_hangs = close_hangs
+        self.listeners: dict[str, list] = {}
+        self.closed = False
+
+    def on(self, event: str, handler) -> None:
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event: str, handler) -> None:
+        self.listeners[event].remove(handler)
+
+    def emit(self, event: str) -> None:
+        for handler in self.listeners.get(event, []):
+            handler()
+
+    async def close(self) -> None:
+        if self.close_hangs:
+            await asyncio.Event().wait()
+        self.closed = True
+
+
+@pytest.fixture
+async def watchdog():
+    settings = Watchdog(
+        check_interval=0.02,
+        idle_timeout=0.1,
+        probe_timeout=0.05,
+        close_timeout=0.05,
+        max_tasks=3,
+        max_contexts=2,
+        max_rss_mb=128,
+    )
+    watchdog = BrowserWatchdog(settings)
+    watchdog.start()
+    yield watchdog
+    await watchdog.stop()
+
+
+async def _run_task(
+    watchdog: BrowserWatchdog,
+    page: FakePage,
+    context: FakeContext,
+    active: bool = False,
+) -> bool:
+    """Run a task on the page for 0.4s, return whether it was stalled"""
+    watch = watchdog.watch(context, page)  # type: ignore
+    try:
+        for _ in range(20):
+            if active:
+                context.emit("requestfinished")
+            await asyncio.sleep(0.02)
+        return watch.stalled
+    finally:
+        watchdog.unwatch(watch)
+
+
+async def test_active_task_is_not_probed(watchdog):
+    page, context = FakePage(), FakeContext()
+    assert not await _run_task(watchdog, page, context, active=True)
+    assert page.probes == 0
+    assert context.listeners["requestfinished"] == []
+
+
+async def test_idle_page_is_probed(watchdog):
+    page, context = FakePage(), FakeContext()
+    assert not await _run_task(watchdog, page, context)
+    assert page.probes >= 1
+    assert not context.closed
+
+
+async def test_hung_page_is_aborted(watchdog):
+    page, context = FakePage(hangs=True), FakeContext()
+    assert await _run_task(watchdog, page, context)
+    # The context is closed once, the hung call of the task fails
+    assert page.probes == 1
+    assert context.closed
+    assert watchdog.restart_reason(_browser()) == "stall"
+
+
+async def test_hung_context_cancels_the_task(watchdog):
+    page, context = FakePage(hangs=True), FakeContext(close_hangs=True)
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.create_task(_run_task(watchdog, page, context))
+    assert not context.closed
+
+
+def _browser(connected: bool = True, contexts: int = 0) -> SimpleNamespace:
+    return SimpleNamespace(
+        is_connected=lambda: connected, contexts=[object()] * contexts
+    )
+
+
+@pytest.mark.parametrize(
+    ("browser", "tasks", "rss_mb", "reason"),
+    [
+        (_browser(), 0, 100, None),
+        (_browser(connected=False), 0, 100, "disconnected"),
+        (_browser(), 3, 100, "tasks"),
+        (_browser(contexts=3), 0, 100, "contexts"),
+        (_browser(), 0, 200, "memory"),
+    ],
+)
+async def test_restart_reason(
+    watchdog, monkeypatch, browser, tasks, rss_mb, reason
+):
+    monkeypatch.setattr(
+        browser_watchdog, "browser_rss", lambda pid: rss_mb * MB
+    )
+    watchdog.tasks = tasks
+    assert watchdog.restart_reason(browser) == reason
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from app.api.jobs import router
+from app.services.cancellation import CancelFlags
+
+TASK_ID = "task-1"
+
+
+@pytest.fixture
+def flags(config, redis) -> CancelFlags:
+    config.cancellation.poll_interval = 0.01
+    config.cancellation.grace_period = 0  # type: ignore
+    return CancelFlags(config)
+
+
+async def test_cancel_stops_the_bound_task(flags, redis):
+    async def task() -> str:
+        async with flags.watch(TASK_ID) as cancellation:
+            cancellation.bind()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                asyncio.current_task().uncancel()
+                return "partial"
+        return "complete"
+
+    running = asyncio.create_task(task())
+    await asyncio.sleep(0.05)
+    assert await flags.request(TASK_ID)
+    assert await asyncio.wait_for(running, 1) == "partial"
+    assert not await redis.exists(f"hh:cancel:{TASK_ID}")
+
+
+async def test_cancel_waits_for_the_task_to_bind(flags):
+    async def task() -> bool:
+        async with flags.watch(TASK_ID) as cancellation:
+            # The workflow is not bound while it opens its context
+            await asyncio.sleep(0.1)
+            return cancellation.requested
+
+    running = asyncio.create_task(task())
+    await flags.request(TASK_ID)
+    assert await asyncio.wait_for(running, 1)
+
+
+async def test_terminate_cancels_the_unbound_task(flags):
+    async def task() -> None:
+        async with flags.watch(TASK_ID) as cancellation:
+            try:
+                await asyncio.sleep(5)
+            finally:
+                assert cancellation.terminated
+
+    running = asyncio.create_task(task())
+    await asyncio.sleep(0.05)
+    assert await flags.request(TASK_ID, terminate=True)
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(running, 1)
+
+
+@pytest.mark.parametrize(
+    ("state", "flag"), [("PROGRESS", b"terminate"), ("SUCCESS", None)]
+)
+async def test_terminate_if_running(
+    flags, redis, monkeypatch: pytest.MonkeyPatch, state, flag
+):
+    result = type("Result", (), {"state": state})
+    monkeypatch.setattr(router, "AsyncResult", lambda *args, **kw: result)
+    await router._terminate_if_running(None, flags, TASK_ID)  # type: ignore
+    assert await redis.get(f"hh:cancel:{TASK_ID}") == flag
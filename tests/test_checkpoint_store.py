@@ -0,0 +1,63 @@
+from app.custom_types import ApplyOutcome, JobParserStage
+from app.models import JobCheckpoint, VacancyApplication
+from app.services.checkpoint_store import CheckpointStore
+
+
+def _checkpoint(credentials) -> JobCheckpoint:
+    return JobCheckpoint(
+        task_id="task-1",
+        credentials=credentials,
+        search_query="python",
+        max_applications=10,
+        stage=JobParserStage.APPLY,
+        collected=["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2"],
+        vacancies=[
+            VacancyApplication(
+                url="https://hh.ru/vacancy/1",
+                applied=True,
+                outcome=ApplyOutcome.APPLIED,
+            )
+        ],
+    )
+
+
+async def test_save_and_load(config, redis, credentials):
+    store = CheckpointStore(config)
+    assert await store.save(_checkpoint(credentials))
+
+    token = await redis.get("hh:checkpoint:task-1")
+    assert credentials.password.encode() not in token
+    assert await redis.ttl("hh:checkpoint:task-1") > 0
+
+    checkpoint = await store.load("task-1")
+    assert checkpoint.credentials == credentials
+    assert checkpoint.pending == ["https://hh.ru/vacancy/2"]
+    assert checkpoint.updated_at > 0
+    assert await store.exists("task-1")
+
+
+async def test_load_missing(config, redis):
+    assert await CheckpointStore(config).load("task-1") is None
+
+
+async def test_load_with_another_key(config, redis, credentials):
+    await CheckpointStore(config).save(_checkpoint(credentials))
+    config.environment.session_encryption_key = "another key"
+    store = CheckpointStore(config)
+    assert await store.load("task-1") is None
+    assert not await redis.exists("hh:checkpoint:task-1")
+
+
+async def test_disabled_without_key(config, redis, credentials):
+    config.environment.session_encryption_key = None
+    store = CheckpointStore(config)
+    assert not store.enabled
+    assert not await store.save(_checkpoint(credentials))
+    assert await redis.keys("*") == []
+
+
+async def test_delete(config, redis, credentials):
+    store = CheckpointStore(config)
+    await store.save(_checkpoint(credentials))
+    await store.delete("task-1")
+    assert not await store.exists("task-1")
@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+
+from app.core import Pool
+from app.services.context_pool import ContextPool
+
+
+class FakePage:
+    def __init__(self, context: "FakeContext") -> None:
+        self.context = context
+        self.closed = False
+
+    def on(self, event: str, handler) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class FakeCDPSession:
+    def __init__(self, context: "FakeContext") -> None:
+        self.context = context
+
+    async def send(self, method: str, params: dict) -> None:
+        if self.context.fail_reset:
+            raise RuntimeError("Target closed")
+        self.context.cleared.append(params["origin"])
+
+    async def detach(self) -> None:
+        pass
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.pages: list[FakePage] = []
+        self.cleared: list[str] = []
+        self.cookies_cleared = 0
+        self.closed = False
+        self.fail_reset = False
+
+    def on(self, event: str, handler) -> None:
+        pass
+
+    async def new_page(self) -> FakePage:
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def new_cdp_session(self, page: FakePage) -> FakeCDPSession:
+        return FakeCDPSession(self)
+
+    async def clear_cookies(self) -> None:
+        self.cookies_cleared += 1
+
+    async def clear_permissions(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _pool(**settings) -> tuple[ContextPool, list[FakeContext]]:
+    created: list[FakeContext] = []
+
+    async def factory() -> FakeContext:
+        context = FakeContext()
+        created.append(context)
+        return context
+
+    settings = {"size": 2, "acquire_timeout": 1, **settings}
+    return ContextPool(factory, Pool(**settings)), created
+
+
+async def _refilled(pool: ContextPool) -> None:
+    await asyncio.gather(*pool._refills)
+
+
+async def test_acquire_accounting():
+    pool, created = _pool()
+    first = await pool.acquire()
+    second = await pool.acquire()
+    assert (pool.stats.misses, pool.stats.hits) == (2, 0)
+
+    waiting = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    await pool.release(first)
+    assert await waiting is first
+    assert (pool.stats.hits, pool.stats.waits) == (1, 1)
+
+    await pool.release(second)
+    assert await pool.acquire() is second
+    assert (pool.stats.hits, pool.stats.waits) == (2, 1)
+    assert len(created) == 2 and pool.in_use == 2
+
+
+async def test_acquire_timeout():
+    pool, _ = _pool(size=1)
+    await pool.acquire()
+    with pytest.raises(TimeoutError):
+        await pool.acquire()
+
+
+async def test_fill():
+    pool, created = _pool()
+    await pool.fill()
+    assert pool.size == 2 and len(created) == 2
+    await pool.acquire()
+    assert pool.stats.hits == 1
+
+
+async def test_evict_after_max_uses():
+    pool, created = _pool(size=1, max_uses=2)
+    for _ in range(2):
+        item = await pool.acquire()
+        await pool.release(item)
+    assert pool.stats.evictions == 1
+    assert created[0].closed
+
+    await _refilled(pool)
+    assert pool.size == 1 and len(created) == 2
+    assert (await pool.acquire()).context is created[1]
+
+
+async def test_evict_unhealthy():
+    pool, created = _pool(size=1)
+    item = await pool.acquire()
+    pool.mark_unhealthy(item.page)
+    await pool.release(item)
+    assert pool.stats.evictions == 1 and created[0].closed
+    await _refilled(pool)
+    assert pool.size == 1
+
+
+async def test_evict_on_reset_failure():
+    pool, created = _pool(size=1)
+    item = await pool.acquire()
+    item.origins.add("https://hh.ru")
+    created[0].fail_reset = True
+    await pool.release(item)
+    assert pool.stats.evictions == 1 and created[0].closed
+
+
+async def test_reset_replaces_pages_and_clears_origins():
+    pool, created = _pool(size=1)
+    item = await pool.acquire()
+    old_page = item.page
+    item.origins.update({"https://hh.ru", "https://spb.hh.ru"})
+    await pool.release(item)
+
+    context = created[0]
+    assert old_page.closed and context.pages == [item.page]
+    assert sorted(context.cleared) == ["https://hh.ru", "https://spb.hh.ru"]
+    assert context.cookies_cleared == 1 and not item.origins
+    assert await pool.acquire() is item
+
+
+async def test_reset_clears_browser_state(browser, site):
+    pool = ContextPool(browser.new_context, Pool(size=1, acquire_timeout=1))
+    item = await pool.acquire()
+    await item.context.add_cookies(site.cookies())
+    await item.page.goto(site.add_vacancy("apply"))
+    await item.page.evaluate("localStorage.setItem('hh-account', 'first')")
+    assert site.url in item.origins
+    await pool.release(item)
+
+    item = await pool.acquire()
+    assert pool.stats.hits == 1
+    assert await item.context.cookies() == []
+    await item.page.goto(site.add_vacancy("apply"))
+    value = await item.page.evaluate("localStorage.getItem('hh-account')")
+    assert value is None
+    await pool.close()
+    await pool.release(item)
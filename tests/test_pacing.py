@@ -0,0 +1,76 @@
+import pytest
+
+from app.custom_types import PacingSignal
+from app.services.pacing import PacingController
+
+
+@pytest.fixture
+def pacing(config, redis, credentials):
+    settings = config.pacing
+    settings.initial_delay = 2.0
+    settings.min_delay = 0.5
+    settings.max_delay = 10.0
+    settings.rate_step = 0.25
+    settings.captcha_factor = 3.0
+    settings.timeout_factor = 1.5
+    settings.error_factor = 1.2
+    settings.latency_limit = 5
+    settings.window_size = 5
+    settings.jitter = 0
+    return PacingController(config).bind(credentials)
+
+
+async def _delay(pacing) -> float:
+    return await pacing.next_delay()
+
+
+async def test_success_adds_rate(pacing):
+    await pacing.record(PacingSignal.SUCCESS, latency=1.0)
+    # 1 / (1 / 2 + 0.25)
+    assert await _delay(pacing) == pytest.approx(4 / 3)
+
+
+@pytest.mark.parametrize(
+    ("signal", "delay"),
+    [
+        (PacingSignal.CAPTCHA, 6.0),
+        (PacingSignal.TIMEOUT, 3.0),
+        (PacingSignal.ERROR, 2.4),
+    ],
+)
+async def test_failure_multiplies_delay(pacing, signal, delay):
+    await pacing.record(signal)
+    assert await _delay(pacing) == pytest.approx(delay)
+
+
+async def test_failure_in_window_blocks_decrease(pacing):
+    await pacing.record(PacingSignal.ERROR)
+    await pacing.record(PacingSignal.SUCCESS, latency=1.0)
+    assert await _delay(pacing) == pytest.approx(2.4)
+
+
+async def test_slow_window_blocks_decrease(pacing):
+    await pacing.record(PacingSignal.SUCCESS, latency=9.0)
+    assert await _delay(pacing) == pytest.approx(2.0)
+
+
+async def test_delay_is_bounded(pacing):
+    for _ in range(3):
+        await pacing.record(PacingSignal.CAPTCHA)
+    assert await _delay(pacing) == pytest.approx(10.0)
+
+    # Successes decrease the delay once the captchas leave the window
+    for _ in range(20):
+        await pacing.record(PacingSignal.SUCCESS, latency=1.0)
+    assert await _delay(pacing) == pytest.approx(0.5)
+
+
+async def test_states(config, pacing):
+    await pacing.record(PacingSignal.SUCCESS, latency=1.0)
+    await pacing.record(PacingSignal.ERROR)
+
+    states = await PacingController(config).states()
+    assert [state.scope for state in states] == ["account", "egress"]
+    assert states[0].successes == 1
+    assert states[0].errors == 1
+    assert states[0].mean_latency == 1.0
@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.celery_app.tasks import parsing_tasks
+from app.celery_app.worker_context import WorkerContext
+from app.custom_types import ApplyOutcome, JobSearchStatus
+from app.exceptions import BrowserStalledError
+from app.models import JobCheckpoint, VacancyApplication
+from app.services.cancellation import CancelFlags
+from app.services.checkpoint_store import CheckpointStore
+
+
+class StalledBrowser:
+    """Browser manager whose watchdog cancels the task it runs"""
+
+    def __init__(self) -> None:
+        self.failed = []
+
+    @asynccontextmanager
+    async def context(self, **kwargs):
+        try:
+            yield object()
+        except asyncio.CancelledError as exc:
+            raise BrowserStalledError("Browser stopped responding") from exc
+
+    def stalled(self, page) -> bool:
+        return False
+
+    def mark_failed(self, page) -> None:
+        self.failed.append(page)
+
+
+@pytest.fixture
+def worker(config, redis) -> WorkerContext:
+    context = WorkerContext()
+    context.config = config
+    context.browser_manager = StalledBrowser()  # type: ignore
+    context.checkpoint_store = CheckpointStore(config)
+    return context
+
+
+@pytest.fixture
+def checkpoint(credentials) -> JobCheckpoint:
+    return JobCheckpoint(
+        task_id="task-1",
+        credentials=credentials,
+        search_query="python",
+        max_applications=10,
+    )
+
+
+async def test_stalled_result_keeps_progress(
+    worker, checkpoint, monkeypatch: pytest.MonkeyPatch
+):
+    async def stalled_search(checkpoint: JobCheckpoint, **kwargs):
+        # The workflow saved its progress when the watchdog cancelled it
+        checkpoint.collected = [f"https://hh.ru/vacancy/{i}" for i in "123"]
+        checkpoint.vacancies = [
+            VacancyApplication(
+                url=checkpoint.collected[0],
+                applied=True,
+                outcome=ApplyOutcome.APPLIED,
+            )
+        ]
+        await worker.checkpoint_store.save(checkpoint)
+        raise asyncio.CancelledError()
+
+    monkeypatch.setattr(parsing_tasks, "process_job_search", stalled_search)
+    result = await parsing_tasks._run_in_browser(
+        worker, checkpoint, None, lambda **kwargs: None
+    )
+    assert result.status == JobSearchStatus.STALLED
+    assert (result.applied, result.total) == (1, 3)
+    assert len(result.vacancies) == 1
+    assert result.resumable
+
+
+class HungBrowser(StalledBrowser):
+    """Browser manager whose context never closes"""
+
+    @asynccontextmanager
+    async def context(self, **kwargs):
+        try:
+            yield object()
+        finally:
+            await asyncio.Event().wait()
+
+
+async def test_terminated_task_returns_checkpoint(
+    worker, checkpoint, monkeypatch: pytest.MonkeyPatch
+):
+    worker.config.cancellation.poll_interval = 0.01
+    worker.cancel_flags = CancelFlags(worker.config)
+    worker.browser_manager = HungBrowser()
+
+    async def cancelled_search(checkpoint: JobCheckpoint, **kwargs):
+        checkpoint.collected = ["https://hh.ru/vacancy/1"]
+        await worker.checkpoint_store.save(checkpoint)
+        # The task stops, but its context does not close in time
+        await worker.cancel_flags.request(checkpoint.task_id, terminate=True)
+        return checkpoint.partial_result(JobSearchStatus.CANCELLED)
+
+    monkeypatch.setattr(parsing_tasks, "process_job_search", cancelled_search)
+    result = await asyncio.wait_for(
+        parsing_tasks._run_in_browser(
+            worker, checkpoint, None, lambda **kwargs: None
+        ),
+        1,
+    )
+    assert result.status == JobSearchStatus.CANCELLED
+    assert result.total == 1
+    assert result.resumable
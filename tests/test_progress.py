@@ -0,0 +1,204 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.api.jobs import router
+from app.api.jobs.exceptions import TaskNotFoundException
+from app.custom_types import ApplyOutcome, JobParserStage, JobSearchStatus
+from app.models import VacancyApplication
+from app.services.progress import ProgressReporter
+
+TASK_ID = "task-1"
+
+
+class FakeTask:
+    """Celery task recording the states it writes"""
+
+    def __init__(self) -> None:
+        self.states: list[dict] = []
+        self.lock = threading.Lock()
+
+    def update_state(self, task_id: str, state: str, meta: dict) -> None:
+        with self.lock:
+            self.states.append(meta)
+
+
+@pytest.fixture
+def reporter(config, redis) -> ProgressReporter:
+    config.progress.interval = 0.2
+    config.progress.keepalive = 0.05
+    return ProgressReporter(config)
+
+
+async def _history(redis) -> list[dict]:
+    history = await redis.lrange(f"hh:progress:{TASK_ID}:history", 0, -1)
+    return [json.loads(data) for data in history]
+
+
+async def test_updates_are_coalesced(reporter, redis):
+    task = FakeTask()
+    async with reporter.report(task, TASK_ID) as progress:
+        progress.update(JobParserStage.SEARCH, 10)
+        await asyncio.sleep(0.05)
+        # The stage was written at once, these wait for the interval
+        progress.update(JobParserStage.SEARCH, 20, total=5)
+        progress.update(JobParserStage.SEARCH, 30, total=5)
+        await asyncio.sleep(0.05)
+        assert len(task.states) == 1
+
+        await asyncio.sleep(0.3)
+        assert task.states[-1] == {
+            "stage": JobParserStage.SEARCH,
+            "progress": 30,
+            "total": 5,
+        }
+        progress.update(JobParserStage.APPLY, 40, total=5)
+        progress.finish(status=JobSearchStatus.SUCCESS)
+
+    assert [state["progress"] for state in task.states] == [10, 30, 40]
+    assert await _history(redis) == [
+        {"seq": 1, "stage": "search", "progress": 10},
+        {"seq": 2, "progress": 30, "total": 5},
+        {"seq": 3, "stage": "apply", "progress": 40},
+        {"seq": 4, "status": "success", "done": True},
+    ]
+
+
+async def test_vacancies_are_only_published(reporter, redis):
+    task = FakeTask()
+    vacancy = VacancyApplication(
+        url="https://hh.ru/vacancy/1",
+        applied=True,
+        outcome=ApplyOutcome.APPLIED,
+    )
+    async with reporter.report(task, TASK_ID) as progress:
+        progress.update(JobParserStage.APPLY, 50, vacancy=vacancy)
+
+    assert "vacancies" not in task.states[0]
+    history = await _history(redis)
+    assert history[0]["vacancies"][0]["url"] == vacancy.url
+
+
+async def test_error_finishes_the_events(reporter, redis):
+    with pytest.raises(RuntimeError):
+        async with reporter.report(FakeTask(), TASK_ID):
+            raise RuntimeError("Browser crashed")
+
+    history = await _history(redis)
+    assert history[-1]["status"] == JobSearchStatus.ERROR
+    assert history[-1]["done"] is True
+
+
+async def _follow(reporter, last_id: int = 0) -> list[dict]:
+    deltas = []
+    async for delta in reporter.events(TASK_ID, last_id):
+        if delta is not None:
+            deltas.append(delta)
+    return deltas
+
+
+async def test_events_replay_after_last_id(reporter):
+    async with reporter.report(FakeTask(), TASK_ID) as progress:
+        progress.update(JobParserStage.SEARCH, 10)
+        await asyncio.sleep(0.05)
+        progress.update(JobParserStage.APPLY, 50)
+        progress.finish(status=JobSearchStatus.SUCCESS)
+
+    deltas = await asyncio.wait_for(_follow(reporter, last_id=1), 5)
+    assert [delta["seq"] for delta in deltas] == [2, 3]
+    assert deltas[-1]["done"] is True
+
+
+async def test_events_follow_a_running_task(reporter):
+    async with reporter.report(FakeTask(), TASK_ID) as progress:
+        progress.update(JobParserStage.SEARCH, 10)
+        await asyncio.sleep(0.05)
+
+        follower = asyncio.create_task(_follow(reporter))
+        await asyncio.sleep(0.1)
+        progress.update(JobParserStage.APPLY, 50)
+        progress.finish(status=JobSearchStatus.SUCCESS)
+
+    deltas = await asyncio.wait_for(follower, 5)
+    assert [delta["seq"] for delta in deltas] == [1, 2, 3]
+    assert deltas[1]["stage"] == "apply"
+
+
+async def test_events_keepalive(reporter):
+    events = reporter.events(TASK_ID)
+    assert await asyncio.wait_for(anext(events), 5) is None
+    await events.aclose()
+
+
+class FakeResult:
+    """AsyncResult of a task in the state set by the test"""
+
+    state = "PENDING"
+    info: dict | None = None
+    result: dict | None = None
+
+    def __init__(self, task_id: str, app=None) -> None:
+        pass
+
+
+@pytest.fixture
+def backend(monkeypatch: pytest.MonkeyPatch) -> type[FakeResult]:
+    # A class per test, its state is set on the class
+    result = type("Result", (FakeResult,), {})
+    monkeypatch.setattr(router, "AsyncResult", result)
+    return result
+
+
+async def _stream(reporter, last_id: int = 0) -> list[str]:
+    response = await router.stream_job_events(
+        TASK_ID, None, reporter, last_id  # type: ignore
+    )
+    return [chunk async for chunk in response.body_iterator]
+
+
+async def test_stream_unknown_task(reporter, backend):
+    with pytest.raises(TaskNotFoundException):
+        await _stream(reporter)
+
+
+async def test_stream_finished_task(reporter, backend):
+    backend.state = "SUCCESS"
+    backend.result = {"status": "success", "applied": 2, "total": 3}
+    (event,) = await _stream(reporter)
+    assert event.startswith("event: done\n")
+    assert '"applied": 2' in event
+
+
+async def test_stream_replays_missed_events(reporter, backend):
+    backend.state = "PROGRESS"
+    backend.info = {}
+    async with reporter.report(FakeTask(), TASK_ID) as progress:
+        progress.update(JobParserStage.SEARCH, 10)
+        await asyncio.sleep(0.05)
+        progress.update(JobParserStage.APPLY, 50)
+        progress.finish(status=JobSearchStatus.SUCCESS)
+
+    events = await asyncio.wait_for(_stream(reporter, last_id=1), 5)
+    assert [event.split("\n", 2)[:2] for event in events] == [
+        ["id: 2", "event: progress"],
+        ["id: 3", "event: done"],
+    ]
+
+
+async def test_stream_ends_for_a_killed_task(reporter, backend):
+    backend.state = "PROGRESS"
+    backend.info = {}
+    response = await router.stream_job_events(
+        TASK_ID, None, reporter  # type: ignore
+    )
+    events = response.body_iterator
+    assert await asyncio.wait_for(anext(events), 5) == ": keepalive\n\n"
+
+    # The task published no final event before it was killed
+    backend.state = "FAILURE"
+    backend.info = RuntimeError("Worker lost")  # type: ignore
+    event = await asyncio.wait_for(anext(events), 5)
+    assert event.startswith("event: done\n")
+    assert "Worker lost" in event
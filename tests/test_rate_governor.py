@@ -0,0 +1,79 @@
+import hashlib
+
+import pytest
+
+from app.services.rate_governor import (
+    _ACQUIRE_SCRIPT,
+    RateGovernor,
+    egress_name,
+)
+from app.services.session_cache import account_key
+
+PROXY = {"server": "http://proxy.example.com:3128"}
+
+
+@pytest.fixture
+def governor(config) -> RateGovernor:
+    network = config.network
+    network.global_rate = 0
+    network.account_rate = 20
+    network.account_burst = 2
+    network.egress_rate = 0
+    return RateGovernor(config)
+
+
+async def _tokens(redis, key: str) -> float:
+    return float(await redis.hget(key, "tokens"))
+
+
+async def test_bucket_burst_then_wait(governor, redis):
+    buckets = [("hh:rate:account:a", 20.0, 2)]
+    await governor.acquire(buckets, "request")
+    await governor.acquire(buckets, "request")
+    assert await _tokens(redis, "hh:rate:account:a") < 1
+    # The bucket is empty, a token comes back after 1 / rate seconds
+    assert await governor.acquire(buckets, "request") >= 0.04
+    assert governor.stats.acquired == 3
+    assert governor.stats.waited >= 1
+    assert await redis.ttl("hh:rate:account:a") > 0
+
+
+async def test_script_takes_all_tokens_or_none(redis):
+    keys = ["hh:rate:a", "hh:rate:b"]
+    assert await redis.eval(_ACQUIRE_SCRIPT, 2, *keys, 1, 1, 1, 5) == b"0"
+    assert await _tokens(redis, "hh:rate:b") == pytest.approx(4, abs=0.01)
+
+    wait = float(await redis.eval(_ACQUIRE_SCRIPT, 2, *keys, 1, 1, 1, 5))
+    assert 0 < wait <= 1
+    # The full bucket keeps its token while the empty one refills
+    assert await _tokens(redis, "hh:rate:b") == pytest.approx(4, abs=0.01)
+
+
+async def test_bind_limits_the_proxy(config, redis, credentials):
+    config.network.global_rate = 0
+    config.network.account_rate = 0
+    config.network.egress_burst = 1
+    governor = RateGovernor(config)
+
+    await governor.bind(credentials, PROXY)("request")
+    await governor.bind(credentials)("request")
+
+    proxy_key = hashlib.sha256(PROXY["server"].encode()).hexdigest()
+    host = egress_name(config.network)
+    host_key = hashlib.sha256(host.encode()).hexdigest()
+    assert await redis.exists(f"hh:rate:egress:{proxy_key}")
+    assert await redis.exists(f"hh:rate:egress:{host_key}")
+    assert not await redis.exists(
+        f"hh:rate:account:{account_key(credentials)}"
+    )
+
+
+def test_egress_name(config):
+    config.network.egress_id = "worker-1"
+    assert egress_name(config.network, PROXY) == PROXY["server"]
+    assert egress_name(config.network) == "worker-1"
+
+
+def test_bind_disabled(config, credentials):
+    config.network.rate_limit_enabled = False
+    assert RateGovernor(config).bind(credentials, PROXY) is None
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app.models import VacancyCard
+from app.parser import search
+from app.parser.search import build_page_url, stream_vacancies
+
+SEARCH_URL = "https://hh.ru/search/vacancy?text=python"
+PAGE_SIZE = 20
+
+
+def _cards(page_number: int) -> list[VacancyCard]:
+    first = (page_number - 1) * PAGE_SIZE
+    return [
+        VacancyCard(url=f"https://hh.ru/vacancy/{first + i}")
+        for i in range(PAGE_SIZE)
+    ]
+
+
+@pytest.fixture
+def results(monkeypatch):
+    """Search results of 10 full pages, the first one opened on the page"""
+    total = 10 * PAGE_SIZE
+
+    async def parse_first_page(page, config):
+        return _cards(1)
+
+    async def parse_total(page, config):
+        return total
+
+    monkeypatch.setattr(search, "parse_vacancy_cards", parse_first_page)
+    monkeypatch.setattr(search, "parse_total_vacancies", parse_total)
+    loaded: list[int] = []
+
+    async def cached(url, loader):
+        page_number = int(parse_qs(urlsplit(url).query)["page"][0]) + 1
+        loaded.append(page_number)
+        await asyncio.sleep(0.01)
+        return _cards(page_number)
+
+    page = SimpleNamespace(url=SEARCH_URL)
+    return SimpleNamespace(page=page, cached=cached, loaded=loaded)
+
+
+async def _stream(results, config, max_count, select=None) -> list[str]:
+    streamed: list[str] = []
+
+    async def on_vacancy(card: VacancyCard) -> None:
+        streamed.append(card.url)
+
+    await stream_vacancies(
+        results.page,
+        config,
+        max_count,
+        on_vacancy,
+        select=select,
+        cached=results.cached,
+    )
+    return streamed
+
+
+def test_build_page_url():
+    url = build_page_url(SEARCH_URL, 3)
+    assert parse_qs(urlsplit(url).query) == {"text": ["python"], "page": ["2"]}
+
+
+async def test_loads_only_needed_pages(results, config):
+    streamed = await _stream(results, config, 50)
+    assert len(streamed) == 50
+    assert sorted(results.loaded) == [2, 3]
+
+
+async def test_select_loads_pages_while_short(results, config):
+    async def select(cards: list[VacancyCard]) -> list[VacancyCard]:
+        # A quarter of the vacancies can be applied to
+        return cards[::4]
+
+    streamed = await _stream(results, config, 12, select)
+    assert len(streamed) == 12
+    # 5 cards are selected per page
+    assert sorted(results.loaded) == [2, 3]
+
+
+async def test_select_stops_at_last_page(results, config):
+    async def select(cards: list[VacancyCard]) -> list[VacancyCard]:
+        return cards[:1]
+
+    streamed = await _stream(results, config, 50, select)
+    assert len(streamed) == 10
+    assert sorted(results.loaded) == list(range(2, 11))
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from app.custom_types import SkipReason
+from app.exceptions import NoVacanciesFoundError
+from app.parser.search_http import parse_vacancy_html
+from app.services.vacancy_filter import VacancyFilter
+
+BASE_URL = "https://hh.ru/search/vacancy?text=python"
+
+_PAGE = """<!doctype html>
+<html>
+<head><script>window.initialState = {state};</script></head>
+<body>{body}</body>
+</html>
+"""
+
+_RESULTS = """<div data-qa="vacancy-serp__results">
+  <div data-qa="vacancy-serp__vacancy">
+    <a data-qa="serp-item__title" href="/vacancy/1000">Python developer</a>
+    <span data-qa="vacancy-serp__vacancy-employer">Example</span>
+  </div>
+</div>"""
+
+
+def _page(config, body: str) -> str:
+    # The initial state carries the i18n messages of every search page
+    state = json.dumps(
+        {"noResults": config.selectors.vacancy_not_found}, ensure_ascii=False
+    )
+    return _PAGE.format(state=state, body=body)
+
+
+def test_parse_vacancy_html(config):
+    cards = parse_vacancy_html(_page(config, _RESULTS), BASE_URL, config)
+    assert [card.title for card in cards] == ["Python developer"]
+    assert cards[0].vacancy_id == "1000"
+
+
+def test_parse_vacancy_html_not_found(config):
+    body = f"<p>\n  {config.selectors.vacancy_not_found}\n</p>"
+    with pytest.raises(NoVacanciesFoundError):
+        parse_vacancy_html(_page(config, body), BASE_URL, config)
+
+
+def test_parse_vacancy_html_captcha(config):
+    body = '<div role="dialog"><img alt="Captcha image"></div>'
+    assert parse_vacancy_html(_page(config, body), BASE_URL, config) is None
+
+
+def _card(vacancy_id: int, response_button: bool) -> str:
+    button = (
+        '<a data-qa="vacancy-serp__vacancy_response">Откликнуться</a>'
+        if response_button
+        else ""
+    )
+    return (
+        '<div data-qa="vacancy-serp__vacancy">'
+        f'<a data-qa="serp-item__title" href="/vacancy/{vacancy_id}">'
+        f"Vacancy {vacancy_id}</a>{button}</div>"
+    )
+
+
+def _results(*cards: str) -> str:
+    return f'<div data-qa="vacancy-serp__results">{"".join(cards)}</div>'
+
+
+def test_parse_vacancy_html_response_button(config):
+    body = _results(_card(1, True), _card(2, False))
+    cards = parse_vacancy_html(_page(config, body), BASE_URL, config)
+    assert [card.has_response_button for card in cards] == [True, False]
+    reasons = [VacancyFilter(config).skip_reason(card) for card in cards]
+    assert reasons == [None, SkipReason.NO_RESPONSE_BUTTON]
+
+
+def test_parse_vacancy_html_stale_response_selector(config):
+    body = _results(_card(1, False), _card(2, False))
+    cards = parse_vacancy_html(_page(config, body), BASE_URL, config)
+    assert [card.has_response_button for card in cards] == [None, None]
+    assert all(
+        VacancyFilter(config).skip_reason(card) is None for card in cards
+    )
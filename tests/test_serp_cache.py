@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.models import VacancyCard
+from app.services.serp_cache import SerpCache
+
+URL = "https://hh.ru/search/vacancy?text=Python&area=1"
+
+
+@pytest.fixture
+def cache(config, redis) -> SerpCache:
+    return SerpCache(config)
+
+
+def _loader(cards: list[VacancyCard] | None):
+    calls = []
+
+    async def load() -> list[VacancyCard] | None:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return cards
+
+    return load, calls
+
+
+def _card() -> VacancyCard:
+    return VacancyCard(
+        url="https://hh.ru/vacancy/1",
+        vacancy_id="1",
+        has_response_button=False,
+        responded=True,
+    )
+
+
+def test_key_normalizes_search_params(cache):
+    key = cache._key(URL)
+    assert (
+        cache._key(
+            "https://hh.ru/search/vacancy?area=1&text=%20python%20&page=0"
+            "&hhtmFrom=main&search_session_id=abc"
+        )
+        == key
+    )
+    assert cache._key(f"{URL}&page=1") != key
+    assert cache._key("https://hh.ru/search/vacancy?text=Java&area=1") != key
+
+
+async def test_hit_strips_account_fields(cache, redis):
+    load, calls = _loader([_card()])
+    cards = await cache.get(URL, load)
+    # The loading task keeps its own view of the page
+    assert cards[0].responded is True
+
+    cards = await cache.get(f"{URL}&hhtmFrom=main", load)
+    assert len(calls) == 1
+    assert cards[0].vacancy_id == "1"
+    assert cards[0].has_response_button is None
+    assert cards[0].responded is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert await redis.hgetall("hh:serp:stats") == {
+        b"hits": b"1",
+        b"misses": b"1",
+    }
+
+
+async def test_concurrent_gets_load_once(cache):
+    load, calls = _loader([_card()])
+    first, second = await asyncio.gather(
+        cache.get(URL, load), cache.get(URL, load)
+    )
+    assert len(calls) == 1
+    assert first[0].responded is True
+    assert second[0].responded is None
+    assert cache.stats.coalesced == 1
+
+
+async def test_unparsed_page_is_not_cached(cache, redis):
+    load, calls = _loader(None)
+    assert await cache.get(URL, load) is None
+    assert await cache.get(URL, load) is None
+    assert len(calls) == 2
+    assert not await redis.exists(f"hh:serp:{cache._key(URL)}:lock")
+
+
+async def test_disabled(config):
+    config.search_cache.enabled = False
+    load, calls = _loader([_card()])
+    await SerpCache(config).get(URL, load)
+    await SerpCache(config).get(URL, load)
+    assert len(calls) == 2
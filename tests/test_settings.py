@@ -0,0 +1,17 @@
+from app.core import Network
+
+
+def test_sleep_between_actions_sets_delay_bounds():
+    network = Network(sleep_between_actions=2)
+    assert (network.action_delay_min, network.action_delay_max) == (2, 2)
+
+
+def test_delay_bounds_win_over_sleep_between_actions():
+    network = Network(sleep_between_actions=2, action_delay_max=3)
+    assert (network.action_delay_min, network.action_delay_max) == (2, 3)
+
+
+def test_delay_bounds_default():
+    network = Network()
+    assert network.sleep_between_actions is None
+    assert network.action_delay_min < network.action_delay_max
@@ -0,0 +1,81 @@
+import signal
+import threading
+from types import SimpleNamespace
+
+import psutil
+import pytest
+
+from app.celery_app import supervisor
+from app.celery_app.supervisor import MemoryGuard, plan_slots
+from app.core import Worker
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def host(monkeypatch: pytest.MonkeyPatch):
+    """Host with 8 CPUs and the available memory set by the test"""
+    memory = SimpleNamespace(available=0)
+    monkeypatch.setattr(supervisor, "_allowed_cpus", lambda: list(range(8)))
+    monkeypatch.setattr(supervisor.psutil, "virtual_memory", lambda: memory)
+    return memory
+
+
+@pytest.mark.parametrize(
+    ("available_mb", "max_processes", "expected"),
+    [
+        # (8192 - 1024) // 1536
+        (8192, None, [[0, 1], [2, 3], [4, 5], [6, 7]]),
+        (64 * 1024, None, [[cpu] for cpu in range(8)]),
+        (64 * 1024, 3, [[0, 1, 2], [3, 4, 5], [6, 7]]),
+        # At least one worker runs on a small host
+        (512, None, [list(range(8))]),
+    ],
+)
+def test_plan_slots(host, available_mb, max_processes, expected):
+    host.available = available_mb * MB
+    settings = Worker(
+        browser_memory_mb=1536,
+        reserved_memory_mb=1024,
+        max_processes=max_processes,
+    )
+    assert plan_slots(settings) == expected
+
+
+def _guard(monkeypatch, readings: list[int | Exception]) -> list[int]:
+    """Run a guard on the RSS readings and return the signals it sent"""
+    readings = list(readings)
+    sent: list[int] = []
+    done = threading.Event()
+
+    def rss(pid: int) -> int:
+        if not readings:
+            done.set()
+            return 0
+        reading = readings.pop(0)
+        if isinstance(reading, Exception):
+            raise reading
+        return reading
+
+    def kill(pid: int, signum: int) -> None:
+        sent.append(signum)
+        done.set()
+
+    monkeypatch.setattr(supervisor, "browser_rss", rss)
+    monkeypatch.setattr(supervisor.os, "kill", kill)
+    settings = Worker(browser_memory_mb=256)
+    settings.memory_check_interval = 0.01  # type: ignore
+    guard = MemoryGuard(settings, "0")
+    guard.start()
+    assert done.wait(5)
+    guard.stop()
+    return sent
+
+
+def test_memory_guard_under_budget(monkeypatch):
+    assert _guard(monkeypatch, [100 * MB, 256 * MB]) == []
+
+
+def test_memory_guard_stops_worker(monkeypatch):
+    readings = [psutil.NoSuchProcess(1), 100 * MB, 257 * MB]
+    assert _guard(monkeypatch, readings) == [signal.SIGTERM]
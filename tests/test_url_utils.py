@@ -0,0 +1,36 @@
+import pytest
+
+from app.utils.url_utils import normalize_vacancy_url, vacancy_id
+
+BASE_URL = "https://hh.ru/"
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://hh.ru/vacancy/123", "123"),
+        ("/vacancy/123?query=python", "123"),
+        ("https://spb.hh.ru/vacancy/123#top", "123"),
+        ("https://hh.ru/employer/123", None),
+        ("https://adsrv.hh.ru/click?b=1", None),
+    ],
+)
+def test_vacancy_id(url, expected):
+    assert vacancy_id(url) == expected
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("/vacancy/123", "https://hh.ru/vacancy/123"),
+        (
+            "https://spb.hh.ru/vacancy/123?from=vacancy_search_list"
+            "&hhtmFrom=vacancy_search_list",
+            "https://hh.ru/vacancy/123",
+        ),
+        ("/click?b=1", "https://hh.ru/click?b=1"),
+        ("https://adsrv.hh.ru/click?b=1", "https://adsrv.hh.ru/click?b=1"),
+    ],
+)
+def test_normalize_vacancy_url(url, expected):
+    assert normalize_vacancy_url(url, BASE_URL) == expected